@@ -0,0 +1,63 @@
+"""Benchmark `~gammapy.stats.excess_matching_significance_on_off`.
+
+The Li & Ma excess is computed for random ``n_off``, ``alpha`` and
+``significance`` arrays with 10^6 elements. For a subset, the result is
+compared to ``n_on`` found separately for each element with
+`scipy.optimize.brentq`.
+
+Usage: python excess_matching_significance.py [n_elements]
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import sys
+from time import time
+import numpy as np
+from scipy.optimize import brentq
+from gammapy.stats import (
+    background,
+    significance_on_off,
+    excess_matching_significance,
+    excess_matching_significance_on_off,
+)
+
+N_CHECK = 10000
+
+
+def reference_excess(n_off, alpha, significance):
+    def target_function(n_on):
+        return significance_on_off(n_on, n_off, alpha) - significance
+
+    bkg = background(n_off, alpha)
+    n_on_max = max(bkg, 1)
+    while target_function(n_on_max) < 0:
+        n_on_max *= 2
+
+    return brentq(target_function, 1e-5, n_on_max, xtol=1e-12, rtol=1e-14) - bkg
+
+
+def main(n_elements=1000000):
+    rng = np.random.RandomState(0)
+    n_off = 10 ** rng.uniform(-1, 5, n_elements)
+    alpha = 10 ** rng.uniform(-3, 0.5, n_elements)
+    significance = rng.uniform(0, 30, n_elements)
+
+    t = time()
+    excess = excess_matching_significance_on_off(n_off, alpha, significance)
+    print('excess_matching_significance_on_off: {} elements in {:.2f} s'.format(n_elements, time() - t))
+
+    t = time()
+    excess_matching_significance(background(n_off, alpha), significance)
+    print('excess_matching_significance: {} elements in {:.2f} s'.format(n_elements, time() - t))
+
+    idx = rng.choice(n_elements, min(N_CHECK, n_elements), replace=False)
+    t = time()
+    expected = [reference_excess(n_off[i], alpha[i], significance[i]) for i in idx]
+    print('brentq: {} elements in {:.2f} s'.format(len(idx), time() - t))
+
+    # Compare n_on, the excess of a weak source on a large background is
+    # limited by the precision of the Li & Ma formula
+    bkg = background(n_off[idx], alpha[idx])
+    np.testing.assert_allclose(excess[idx] + bkg, expected + bkg, rtol=1e-10)
+
+
+if __name__ == '__main__':
+    main(*[int(_) for _ in sys.argv[1:]])
@@ -0,0 +1,54 @@
+"""Benchmark the light curve estimation.
+
+A synthetic light curve with 1000 time bins is computed from four
+observations with on and off events, a flat effective area and a Gaussian
+energy dispersion, with 1, 2 and 4 processes. The first bins are checked
+against flux points computed one interval at a time.
+
+Usage: python light_curve.py [n_bins]
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import sys
+from time import time
+import numpy as np
+import astropy.units as u
+from gammapy.spectrum.models import PowerLaw
+from gammapy.time import LightCurveEstimator
+from gammapy.time.tests.test_lightcurve import make_onoff_extraction
+
+N_OBS = 4
+OBS_DURATION = 1800
+OBS_PARAMS = [(1e8 + idx * 5000, 5, 0.05) for idx in range(N_OBS)]
+
+
+def make_time_intervals(extraction, n_bins):
+    time_ref = extraction.obs_list[0].events.time_ref
+    intervals = []
+    for tstart, _, _ in OBS_PARAMS:
+        edges = time_ref + np.linspace(tstart, tstart + OBS_DURATION, n_bins // N_OBS + 1) * u.s
+        intervals.extend(zip(edges[:-1], edges[1:]))
+    return intervals
+
+
+def main(n_bins=1000):
+    extraction = make_onoff_extraction(OBS_PARAMS, n_events=(100, 50000, 150000),
+                                       duration=OBS_DURATION)
+    time_intervals = make_time_intervals(extraction, n_bins)
+    model = PowerLaw(index=2, amplitude=1e-11 * u.Unit('cm-2 s-1 TeV-1'), reference=1 * u.TeV)
+    energy_range = [1, 10] * u.TeV
+
+    estimator = LightCurveEstimator(extraction)
+    for n_jobs in [1, 2, 4]:
+        t = time()
+        lc = estimator.light_curve(time_intervals, model, energy_range, n_jobs=n_jobs)
+        print('light_curve n_jobs={}: {} points in {:.2f} s'.format(
+            n_jobs, len(lc.table), time() - t))
+
+    for row, time_interval in zip(lc.table, time_intervals[:10]):
+        _, point = estimator.compute_flux_point(time_interval, model, energy_range)
+        for name in ['flux', 'flux_err', 'flux_ul']:
+            np.testing.assert_allclose(point[name].value, row[name])
+
+
+if __name__ == '__main__':
+    main(*[int(_) for _ in sys.argv[1:]])
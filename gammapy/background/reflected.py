@@ -5,6 +5,7 @@ import numpy as np
 from astropy.coordinates import Angle
 from regions import PixCoord, CirclePixelRegion
 from ..image import SkyImage
+from ..utils.cache import LRUCache, array_key
 from .background_estimate import BackgroundEstimate
 
 __all__ = [
@@ -24,6 +25,11 @@ class ReflectedRegionsFinder(object):
     background estimate for an IACT observation using the reflected regions
     method, see also `~gammapy.background.ReflectedRegionsBackgroundEstimator`
 
+    All candidate positions between two placed regions are tested against the
+    exclusion mask at once, and the distance image of the exclusion mask is
+    cached, so that re-running the finder for many pointing positions with the
+    same exclusion mask (or cutout of it) only computes it once.
+
     Parameters
     ----------
     region : `~regions.CircleSkyRegion`
@@ -68,6 +74,7 @@ class ReflectedRegionsFinder(object):
         self.exclusion_mask = exclusion_mask
 
         self.reflected_regions = None
+        self._distance_image_cache = LRUCache()
 
     def run(self):
         """Run all steps.
@@ -129,26 +136,74 @@ class ReflectedRegionsFinder(object):
         self._max_angle = self._angle + Angle('360deg') - self._min_ang - self.min_distance_input
 
         # Distance image
-        self._distance_image = self.exclusion_mask.distance_image
+        self._distance_image = self._get_distance_image(self.exclusion_mask)
+
+    def _get_distance_image(self, exclusion_mask):
+        """Distance image of the exclusion mask, cached by mask content."""
+        key = array_key(exclusion_mask.data) + (exclusion_mask.wcs.to_header_string(),)
+
+        def compute():
+            log.debug('Computing distance image of exclusion mask')
+            return exclusion_mask.distance_image
+
+        return self._distance_image_cache.get(key, compute)
 
     def find_regions(self):
-        """Find reflected regions."""
-        curr_angle = self._angle + self._min_ang + self.min_distance_input
+        """Find reflected regions.
+
+        Starting from the input region, the first candidate angle that does not
+        overlap with the exclusion mask is chosen greedily. The next candidates
+        start at the minimal angle beyond the placed region. All candidate
+        angles for one step are evaluated at once.
+        """
+        angle_increment = self.angle_increment.rad
+        max_angle = self._max_angle.rad
+        min_ang = self._min_ang.rad
+
+        curr_angle = (self._angle + self._min_ang + self.min_distance_input).rad
+        angles = []
+        while curr_angle < max_angle:
+            n_candidates = int(np.ceil((max_angle - curr_angle) / angle_increment))
+            candidates = curr_angle + angle_increment * np.arange(max(n_candidates, 1))
+            candidates = candidates[candidates < max_angle]
+
+            is_free = ~self._is_inside_exclusion_array(candidates)
+            if not is_free.any():
+                break
+
+            curr_angle = candidates[np.argmax(is_free)]
+            angles.append(curr_angle)
+            curr_angle = curr_angle + min_ang
+
         reflected_regions = []
-        while curr_angle < self._max_angle:
-            test_pos = self._compute_xy(self._pix_center, self._offset, curr_angle)
-            test_reg = CirclePixelRegion(test_pos, self._pix_region.radius)
-            if not self._is_inside_exclusion(test_reg, self._distance_image):
-                refl_region = test_reg.to_sky(self.exclusion_mask.wcs)
-                log.debug('Placing reflected region\n{}'.format(refl_region))
-                reflected_regions.append(refl_region)
-                curr_angle = curr_angle + self._min_ang
-            else:
-                curr_angle = curr_angle + self.angle_increment
+        for angle in angles:
+            test_pos = self._compute_xy(self._pix_center, self._offset, angle)
+            refl_region = CirclePixelRegion(test_pos, self._pix_region.radius).to_sky(
+                self.exclusion_mask.wcs
+            )
+            log.debug('Placing reflected region\n{}'.format(refl_region))
+            reflected_regions.append(refl_region)
 
         log.debug('Found {} reflected regions'.format(len(reflected_regions)))
         self.reflected_regions = reflected_regions
 
+    def _is_inside_exclusion_array(self, angles):
+        """Test if regions at given position angles overlap with the exclusion mask.
+
+        Regions with centers outside the exclusion mask are never excluded.
+        """
+        pos = self._compute_xy(self._pix_center, self._offset, angles)
+        x = np.round(pos.x).astype(int)
+        y = np.round(pos.y).astype(int)
+
+        data = self._distance_image.data
+        ny, nx = data.shape
+        inside_image = (x >= 0) & (x < nx) & (y >= 0) & (y < ny)
+
+        val = np.full(len(angles), np.inf)
+        val[inside_image] = data[y[inside_image], x[inside_image]]
+        return val < self._pix_region.radius
+
     def plot(self, fig=None, ax=None):
         """Standard debug plot.
 
@@ -171,21 +226,6 @@ class ReflectedRegionsFinder(object):
 
         return fig, ax
 
-    @staticmethod
-    def _is_inside_exclusion(pixreg, distance_image):
-        """Test if a `~regions.PixRegion` overlaps with an exclusion mask.
-
-        If the regions is outside the exclusion mask, return 'False'
-        """
-        x, y = pixreg.center.x, pixreg.center.y
-        try:
-            val = distance_image.data[np.round(y).astype(int),
-                                      np.round(x).astype(int)]
-        except IndexError:
-            return False
-        else:
-            return val < pixreg.radius
-
     @staticmethod
     def _compute_xy(pix_center, offset, angle):
         """Compute x, y position for a given position angle and offset.
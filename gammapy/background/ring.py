@@ -7,7 +7,7 @@ import numpy as np
 from astropy.convolution import Ring2DKernel, Tophat2DKernel
 from astropy.convolution import convolve_fft, convolve
 from astropy.coordinates import Angle
-from ..image.utils import scale_cube
+from ..image.utils import scale_cube, FFTConvolver
 
 __all__ = [
     'AdaptiveRingBackgroundEstimator',
@@ -65,6 +65,10 @@ class AdaptiveRingBackgroundEstimator(object):
         Integration radius used for alpha computation.
     method : {'fixed_width', 'fixed_r_in'}
         Adaptive ring method.
+    convolver : `~gammapy.image.FFTConvolver`, optional
+        Convolution executor. Pass a shared instance to re-use the worker pool
+        and the cached ring kernel FFTs between calls to `run`. By default a
+        new convolver is created for each call to `run`.
 
     Examples
     --------
@@ -94,7 +98,8 @@ class AdaptiveRingBackgroundEstimator(object):
     """
 
     def __init__(self, r_in, r_out_max, width, stepsize='0.02 deg',
-                 threshold_alpha=0.1, theta='0.22 deg', method='fixed_width'):
+                 threshold_alpha=0.1, theta='0.22 deg', method='fixed_width',
+                 convolver=None):
 
         stepsize = Angle(stepsize)
         theta = Angle(theta)
@@ -111,6 +116,7 @@ class AdaptiveRingBackgroundEstimator(object):
             theta=Angle(theta),
             method=method,
         )
+        self.convolver = convolver
 
     @property
     def parameters(self):
@@ -167,7 +173,7 @@ class AdaptiveRingBackgroundEstimator(object):
         return alpha_approx
 
     @staticmethod
-    def _exposure_off_cube(exposure_on, exclusion, kernels):
+    def _exposure_off_cube(exposure_on, exclusion, kernels, convolver=None):
         """Compute off exposure cube.
 
         The on exposure is convolved with different
@@ -175,7 +181,7 @@ class AdaptiveRingBackgroundEstimator(object):
         """
         exposure = exposure_on.data
         exclusion = exclusion.data
-        return scale_cube(exposure * exclusion, kernels)
+        return scale_cube(exposure * exclusion, kernels, convolver=convolver)
 
     def _exposure_on_cube(self, exposure_on, kernels):
         """Compute on exposure cube.
@@ -195,13 +201,13 @@ class AdaptiveRingBackgroundEstimator(object):
         return exposure_on_cube
 
     @staticmethod
-    def _off_cube(counts, exclusion, kernels):
+    def _off_cube(counts, exclusion, kernels, convolver=None):
         """Compute off cube.
 
         Calculated by convolving the raw counts with different ring kernels
         and stacking the data along the third dimension.
         """
-        return scale_cube(counts.data * exclusion.data, kernels)
+        return scale_cube(counts.data * exclusion.data, kernels, convolver=convolver)
 
     def _reduce_cubes(self, cubes):
         """Compute off and off exposure map.
@@ -249,6 +255,8 @@ class AdaptiveRingBackgroundEstimator(object):
         result['alpha'] = exposure_on_map.copy(unit='')
         result['background'] = exposure_on_map.copy(unit='')
 
+        convolver = self.convolver or FFTConvolver()
+
         for img, idx in counts_map.iter_by_image():
             counts = counts_map.get_image_by_idx(idx, copy=False)
             exposure_on = exposure_on_map.get_image_by_idx(idx, copy=False)
@@ -259,9 +267,11 @@ class AdaptiveRingBackgroundEstimator(object):
             kernels = self.kernels(counts)
 
             cubes['exposure_on'] = self._exposure_on_cube(exposure_on, kernels)
-            cubes['exposure_off'] = self._exposure_off_cube(exposure_on, exclusion, kernels)
+            cubes['exposure_off'] = self._exposure_off_cube(
+                exposure_on, exclusion, kernels, convolver=convolver,
+            )
 
-            cubes['off'] = self._off_cube(counts, exclusion, kernels)
+            cubes['off'] = self._off_cube(counts, exclusion, kernels, convolver=convolver)
             cubes['alpha_approx'] = self._alpha_approx_cube(cubes)
 
             exposure_off, off = self._reduce_cubes(cubes)
@@ -279,6 +289,9 @@ class AdaptiveRingBackgroundEstimator(object):
             result['alpha'].data[idx] = alpha
             result['background'].data[idx] = background
 
+        if convolver is not self.convolver:
+            convolver.close()
+
         return result
 
 
@@ -1,6 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import pytest
+import numpy as np
 from astropy.coordinates import SkyCoord, Angle
 from regions import CircleSkyRegion
 from ...utils.testing import requires_data, requires_dependency, assert_quantity_allclose
@@ -62,6 +63,31 @@ def test_find_reflected_regions(mask, on_region):
     assert_quantity_allclose(regions[3].center.icrs.ra, Angle('83.674 deg'), rtol=1e-2)
 
 
+@requires_dependency('scipy')
+def test_find_reflected_regions_synthetic_mask(on_region):
+    mask = SkyImage.empty(nxpix=200, nypix=200, binsz=0.02, xref=83.6, yref=22.0,
+                          coordsys='CEL', proj='TAN', fill=1)
+    mask.data[60:90, 100:140] = 0
+    pointing = SkyCoord(83.2, 22.5, unit='deg')
+
+    finder = ReflectedRegionsFinder(center=pointing, region=on_region,
+                                    exclusion_mask=mask, min_distance_input='0 deg')
+    finder.run()
+    regions = finder.reflected_regions
+    assert len(regions) == 15
+
+    distance = mask.distance_image
+    for region in regions:
+        pix_region = region.to_pixel(mask.wcs)
+        x, y = int(np.round(pix_region.center.x)), int(np.round(pix_region.center.y))
+        assert distance.data[y, x] >= pix_region.radius
+
+    # distance image is cached for the same mask
+    finder.center = SkyCoord(84.0, 22.3, unit='deg')
+    finder.run()
+    assert len(finder._distance_image_cache) == 1
+
+
 @pytest.fixture
 def bkg_estimator():
     """Example background estimator for testing."""
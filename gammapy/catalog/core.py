@@ -3,14 +3,24 @@
 """
 from __future__ import absolute_import, division, print_function, unicode_literals
 from collections import OrderedDict
+import hashlib
+import logging
+import os
 import sys
+import tempfile
 from copy import deepcopy
 from pprint import pprint
 import numpy as np
 from ..extern import six
+from ..extern.six.moves import cPickle as pickle
 from astropy.utils import lazyproperty
+from astropy.units import Quantity
+from astropy.table import Table, MaskedColumn
+from astropy.coordinates import Angle, UnitSphericalRepresentation
 from ..utils.array import _is_int
-from ..utils.table import table_row_to_dict
+from ..utils.scripts import make_path
+from ..utils.cache import replace_file
+from ..cube.models import SkyModel, SumSkyModel, PopulationSkyModel
 from .utils import skycoord_from_table
 
 __all__ = [
@@ -18,6 +28,8 @@ __all__ = [
     'SourceCatalogObject',
 ]
 
+log = logging.getLogger(__name__)
+
 
 class SourceCatalogObject(object):
     """Source catalog object.
@@ -112,6 +124,13 @@ class SourceCatalog(object):
     source_name_alias : tuple of str
         Columns with source name aliases. This will allow accessing the source
         row by alias names as well.
+
+    Notes
+    -----
+    Parsing the compressed catalog FITS files is slow, so the catalog
+    subclasses take a ``cache_dir`` option. The parsed catalog is then pickled
+    to ``cache_dir`` and loaded from there as long as the catalog file is
+    unchanged, i.e. has the same path, size and modification time.
     """
     source_object_class = SourceCatalogObject
 
@@ -119,6 +138,12 @@ class SourceCatalog(object):
     # Should we share them somehow?
     _source_index_key = 'catalog_row_index'
 
+    # Spatial and spectral model classes by model type, see `sky_model_parameters`
+    _spatial_model_classes = OrderedDict()
+    _spectral_model_classes = OrderedDict()
+    # Spatial model types of the sources that are left out of `sky_model_parameters`
+    _skipped_spatial_types = ()
+
     def __init__(self, table, source_name_key='Source_Name', source_name_alias=()):
         self.table = table
         self._source_name_key = source_name_key
@@ -227,19 +252,31 @@ class SourceCatalog(object):
         source : `SourceCatalogObject`
             Source object
         """
-        data = table_row_to_dict(self.table[index])
+        if not _row_columns_match(self._row_columns, self.table):
+            # The table columns were changed after the first source access
+            del self._row_columns
+
+        data = _row_data(self._row_columns, index)
         data[self._source_index_key] = index
 
         try:
             name_extended = data['Extended_Source_Name'].strip()
             idx = self._lookup_extended_source_idx[name_extended]
-            data_extended = table_row_to_dict(self.extended_sources_table[idx])
+            data_extended = _row_data(self._extended_row_columns, idx)
         except KeyError:
             data_extended = None
 
         source = self.source_object_class(data, data_extended)
         return source
 
+    @lazyproperty
+    def _row_columns(self):
+        return _make_row_columns(self.table)
+
+    @lazyproperty
+    def _extended_row_columns(self):
+        return _make_row_columns(self.extended_sources_table)
+
     @lazyproperty
     def _lookup_extended_source_idx(self):
         names = [_.strip() for _ in self.extended_sources_table['Source_Name']]
@@ -262,6 +299,385 @@ class SourceCatalog(object):
         """Source positions (`~astropy.coordinates.SkyCoord`)."""
         return skycoord_from_table(self.table)
 
+    @property
+    def _spatial_index(self):
+        """KD-tree of source positions, see `_make_spatial_index`.
+
+        The tree is cached and rebuilt if ``table`` is replaced.
+        """
+        cache = self.__dict__.get('_spatial_index_cache')
+        if cache is None or cache[0] is not self.table or cache[1].n != len(self.table):
+            cache = (self.table, _make_spatial_index(self.positions))
+            self.__dict__['_spatial_index_cache'] = cache
+        return cache[1]
+
+    def match_positions(self, positions, radius=None, nearest=True):
+        """Match sky positions to catalog sources.
+
+        A KD-tree of the catalog source positions is built on first use and
+        cached, so that matching ``N`` positions scales as ``N log N``.
+
+        Parameters
+        ----------
+        positions : `~astropy.coordinates.SkyCoord`
+            Sky positions, in any frame
+        radius : `~astropy.coordinates.Angle`, optional
+            Maximum separation of a match
+        nearest : bool
+            Only match the nearest catalog source to each position. If False,
+            all catalog sources within ``radius`` are matched.
+
+        Returns
+        -------
+        idx_positions, idx_catalog : `~numpy.ndarray`
+            Indices of the matched positions and catalog rows
+        separation : `~astropy.coordinates.Angle`
+            Angular separation of the matches
+
+        Examples
+        --------
+        Find all 3FGL sources within 0.1 deg of the HGPS sources::
+
+            >>> from astropy.coordinates import Angle
+            >>> from gammapy.catalog import source_catalogs
+            >>> hgps, fermi = source_catalogs['hgps'], source_catalogs['3fgl']
+            >>> idx_hgps, idx_3fgl, sep = fermi.match_positions(
+            ...     hgps.positions, radius=Angle(0.1, 'deg'), nearest=False)
+        """
+        if not nearest and radius is None:
+            raise ValueError('Matching without nearest=True requires a radius.')
+
+        positions = _skycoord_unit_vectors(positions).reshape(-1, 3)
+        if len(positions) == 0 or len(self.table) == 0:
+            empty = np.array([], dtype=int)
+            return empty, empty, Angle([], 'deg')
+
+        tree = self._spatial_index
+        max_distance = np.inf if radius is None else _chord_length(radius)
+
+        if nearest:
+            distance, idx_catalog = tree.query(positions, distance_upper_bound=max_distance)
+            idx_positions = np.flatnonzero(np.isfinite(distance))
+            idx_catalog, distance = idx_catalog[idx_positions], distance[idx_positions]
+        else:
+            matches = tree.query_ball_point(positions, r=max_distance)
+            n_matches = [len(_) for _ in matches]
+            idx_positions = np.repeat(np.arange(len(positions)), n_matches)
+            idx_catalog = np.array([_ for match in matches for _ in match], dtype=int)
+            distance = np.sqrt(np.sum((positions[idx_positions] - tree.data[idx_catalog]) ** 2, axis=1))
+
+            # Sort by position and separation
+            order = np.lexsort((distance, idx_positions))
+            idx_positions, idx_catalog, distance = idx_positions[order], idx_catalog[order], distance[order]
+
+        separation = Angle(2 * np.arcsin(np.clip(distance / 2, 0, 1)), 'rad').to('deg')
+        return idx_positions, idx_catalog, separation
+
+    def match_catalog(self, catalog, radius=None, nearest=True):
+        """Match the sources of this catalog to another catalog.
+
+        The cached KD-tree of ``catalog`` is used, see `match_positions`.
+
+        Parameters
+        ----------
+        catalog : `SourceCatalog`
+            Catalog to match to
+        radius : `~astropy.coordinates.Angle`, optional
+            Maximum separation of a match
+        nearest : bool
+            Only match the nearest source in ``catalog`` to each source. If
+            False, all sources within ``radius`` are matched.
+
+        Returns
+        -------
+        idx, idx_catalog : `~numpy.ndarray`
+            Row indices of the matched sources in this catalog and ``catalog``
+        separation : `~astropy.coordinates.Angle`
+            Angular separation of the matches
+        """
+        return catalog.match_positions(self.positions, radius=radius, nearest=nearest)
+
+    def sky_model_parameters(self):
+        """Sky model parameters of all sources, grouped by model type.
+
+        This is a vectorised version of ``source.sky_model``, the parameters
+        are computed for all sources at once from the table columns. It is
+        implemented for the catalogs that have sky models, which provide the
+        model types and parameter arrays of all sources, see
+        `_sky_model_types`, `_spatial_model_parameters` and
+        `_spectral_model_parameters`.
+
+        Returns
+        -------
+        parameters : `~collections.OrderedDict`
+            Dict with ``(spatial_model_class, spectral_model_class)`` keys and
+            `~astropy.table.Table` values. Each table has the source row index
+            ``catalog_row_index``, the ``source_name``, one column per model
+            parameter and ``<name>_err`` columns for the parameter errors.
+            The parameter names are listed in the ``spatial_parameters`` and
+            ``spectral_parameters`` table meta keys.
+        """
+        if not self._spatial_model_classes:
+            raise NotImplementedError(
+                'Sky model parameters not available for {}'.format(type(self).__name__)
+            )
+
+        spatial_type, spectral_type = self._sky_model_types()
+        is_spatial = OrderedDict([(key, np.asarray(spatial_type == key))
+                                  for key in self._spatial_model_classes])
+        is_spectral = OrderedDict([(key, np.asarray(spectral_type == key))
+                                   for key in self._spectral_model_classes])
+        skipped = np.zeros(len(self.table), dtype=bool)
+        for key in self._skipped_spatial_types:
+            skipped |= np.asarray(spatial_type == key)
+
+        # Raise the same error as ``source.sky_model`` for the first invalid source
+        known_spatial = np.any(list(is_spatial.values()), axis=0)
+        known_spectral = np.any(list(is_spectral.values()), axis=0)
+        invalid = np.flatnonzero(~skipped & ~(known_spatial & known_spectral))
+        if len(invalid) > 0:
+            idx = invalid[0]
+            if not known_spatial[idx]:
+                raise self._spatial_type_error(spatial_type[idx])
+            raise self._spectral_type_error(spectral_type[idx])
+
+        spatial_pars = self._spatial_model_parameters()
+        spectral_pars, spectral_errs = self._spectral_model_parameters()
+
+        parameters = OrderedDict()
+        for spatial_key, spatial_model_class in self._spatial_model_classes.items():
+            for spectral_key, spectral_model_class in self._spectral_model_classes.items():
+                rows = np.flatnonzero(is_spatial[spatial_key] & is_spectral[spectral_key])
+                if len(rows) == 0:
+                    continue
+
+                source_name = [self.source_name(idx) for idx in rows]
+                parameters[spatial_model_class, spectral_model_class] = _make_model_parameters(
+                    rows, source_name, spatial_pars[spatial_key],
+                    spectral_pars[spectral_key], spectral_errs[spectral_key],
+                )
+
+        return parameters
+
+    def _sky_model_types(self):
+        """Spatial and spectral model type of all sources, see `sky_model_parameters`.
+
+        Returns two arrays, with the keys of ``_spatial_model_classes`` and
+        ``_spectral_model_classes`` for the sources with a sky model.
+        """
+        raise NotImplementedError
+
+    def _spatial_model_parameters(self):
+        """Spatial model parameter arrays by spatial model type, see `sky_model_parameters`."""
+        raise NotImplementedError
+
+    def _spectral_model_parameters(self):
+        """Spectral model parameter and error arrays by spectral model type, see `sky_model_parameters`."""
+        raise NotImplementedError
+
+    def _spatial_type_error(self, spatial_type):
+        """Error for a source with unknown spatial model type, see `sky_model_parameters`."""
+        return ValueError('Invalid spatial model: {}'.format(spatial_type))
+
+    def _spectral_type_error(self, spectral_type):
+        """Error for a source with unknown spectral model type, see `sky_model_parameters`."""
+        return ValueError('Invalid spectral model: {}'.format(spectral_type))
+
+    def to_sum_model(self):
+        """Sum of the sky models of all sources (`~gammapy.cube.models.SumSkyModel`).
+
+        The sources with point or Gaussian spatial model are combined into one
+        `~gammapy.cube.models.PopulationSkyModel` per model type, which is much
+        faster to evaluate than one `~gammapy.cube.models.SkyModel` per source.
+        The other sources are added as one ``SkyModel`` each. The parameters
+        are taken from `sky_model_parameters`.
+        """
+        components = []
+        for (spatial_model_class, spectral_model_class), pars in self.sky_model_parameters().items():
+            if (spatial_model_class in PopulationSkyModel.spatial_parameters and
+                    spectral_model_class._numeric_evaluate):
+                name = '{} {}'.format(spatial_model_class.__name__, spectral_model_class.__name__)
+                model = PopulationSkyModel(pars, spatial_model_class, spectral_model_class, name=name)
+                components.append(model)
+            else:
+                components.extend(_make_sky_models(pars, spatial_model_class, spectral_model_class))
+
+        return SumSkyModel(components)
+
     def copy(self):
         """Copy catalog"""
         return deepcopy(self)
+
+    def _read_cache(self, filename, cache_dir, *args):
+        """Load the catalog from ``cache_dir``, see `_cache_filename`.
+
+        Returns True if a cache file for ``filename`` was found and could be
+        read. A cache file that can't be unpickled, e.g. because it was written
+        by a different Gammapy or Python version, is ignored, so that the
+        catalog file is parsed again and the cache file replaced.
+        """
+        if cache_dir is None:
+            return False
+
+        path = self._cache_filename(filename, cache_dir, *args)
+        if not path.exists():
+            return False
+
+        log.debug('Reading catalog cache {}'.format(path))
+        try:
+            with path.open('rb') as fh:
+                state = pickle.load(fh)
+        except (pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError, IndexError, TypeError, ValueError) as exc:
+            log.warning('Ignoring invalid catalog cache {}: {!r}'.format(path, exc))
+            return False
+
+        self.__dict__.update(state)
+        return True
+
+    def _write_cache(self, filename, cache_dir, *args):
+        """Store the catalog in ``cache_dir``, see `_cache_filename`."""
+        if cache_dir is None:
+            return
+
+        path = self._cache_filename(filename, cache_dir, *args)
+        if not path.parent.exists():
+            path.parent.mkdir(parents=True)
+
+        # Write to a temporary file first and move it into place, so that a
+        # concurrent or interrupted write never leaves a partial cache file
+        log.debug('Writing catalog cache {}'.format(path))
+        fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump(self.__dict__, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            replace_file(tmp_name, str(path))
+        except BaseException:
+            os.remove(tmp_name)
+            raise
+
+    def _cache_filename(self, filename, cache_dir, *args):
+        """Cache file of the parsed catalog.
+
+        The file is keyed on the catalog class, the absolute path, size and
+        modification time of ``filename`` and the extra read options ``args``,
+        so that a changed catalog file is parsed again.
+        """
+        filename = os.path.abspath(str(make_path(filename)))
+        stat = os.stat(filename)
+        key = [type(self).__name__, filename, stat.st_size, stat.st_mtime] + list(args)
+        key = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return make_path(cache_dir) / '{}_{}.pickle'.format(type(self).__name__, key)
+
+
+def _make_row_columns(table):
+    """Columns of ``table`` as ``(name, column, unit, values)`` tuples.
+
+    ``values`` is a `~astropy.units.Quantity` view of unmasked float columns
+    with a unit, which is faster to index than making a quantity from the
+    column item, and None otherwise.
+    """
+    columns = []
+    for name, column in table.columns.items():
+        unit, values = column.unit, None
+        if unit and column.dtype.kind == 'f' and not isinstance(column, MaskedColumn):
+            values = column.quantity
+        columns.append((name, column, unit, values))
+    return columns
+
+
+def _row_columns_match(columns, table):
+    """Whether ``columns`` from `_make_row_columns` are the columns of ``table``."""
+    if len(columns) != len(table.columns):
+        return False
+    return all(_[1] is column for _, column in zip(columns, table.columns.values()))
+
+
+def _row_data(columns, index):
+    """Data dict for one table row, see `_make_row_columns`.
+
+    Same as `~gammapy.utils.table.table_row_to_dict`.
+    """
+    data = OrderedDict()
+    for name, column, unit, values in columns:
+        if values is not None:
+            value = values[index]
+        elif unit:
+            value = Quantity(column[index], unit=unit)
+        else:
+            value = column[index]
+        data[name] = value
+    return data
+
+
+def _make_model_parameters(rows, source_name, spatial, spectral, errors, catalog_row_index=None):
+    """Model parameter table, see `SourceCatalog.sky_model_parameters`.
+
+    ``spatial``, ``spectral`` and ``errors`` are dicts of parameter arrays,
+    from which the sources at index ``rows`` are selected. The catalog row
+    index defaults to ``rows``.
+    """
+    pars = Table()
+    pars['catalog_row_index'] = rows if catalog_row_index is None else catalog_row_index
+    pars['source_name'] = source_name
+    for name, values in list(spatial.items()) + list(spectral.items()):
+        pars[name] = values[rows]
+    for name, values in errors.items():
+        pars[name + '_err'] = values[rows]
+
+    pars.meta['spatial_parameters'] = list(spatial)
+    pars.meta['spectral_parameters'] = list(spectral)
+    return pars
+
+
+def _make_sky_models(pars, spatial_model_class, spectral_model_class):
+    """Make one `~gammapy.cube.models.SkyModel` per row of a parameter table.
+
+    See `SourceCatalog.sky_model_parameters`.
+    """
+    spatial = [(name, pars[name].quantity) for name in pars.meta['spatial_parameters']]
+    spectral = [(name, pars[name].quantity) for name in pars.meta['spectral_parameters']]
+
+    # Errors in the parameter units, as in ``ParameterList.set_parameter_errors``
+    errors = {}
+    for name, values in spatial + spectral:
+        if name + '_err' in pars.colnames:
+            errors[name] = pars[name + '_err'].quantity.to(values.unit).value.astype(float)
+
+    has_spatial_errors = any(name in errors for name, _ in spatial)
+
+    sky_models = []
+    for idx, name in enumerate(pars['source_name']):
+        spatial_model = spatial_model_class(**{key: val[idx] for key, val in spatial})
+        spectral_model = spectral_model_class(**{key: val[idx] for key, val in spectral})
+        models = [spatial_model, spectral_model] if has_spatial_errors else [spectral_model]
+        for model in models:
+            parameters = model.parameters
+            diag = [errors[par.name][idx] if par.name in errors else 0.
+                    for par in parameters.parameters]
+            parameters.covariance = np.diag(diag) ** 2
+        sky_models.append(SkyModel(spatial_model, spectral_model, name=name))
+
+    return sky_models
+
+
+def _chord_length(separation):
+    """Chord length on the unit sphere for an angular separation."""
+    separation = Angle(separation).to('rad').value
+    return 2 * np.sin(np.clip(separation, 0, np.pi) / 2)
+
+
+def _make_spatial_index(positions):
+    """KD-tree of ICRS unit vectors of sky positions (`~scipy.spatial.cKDTree`)."""
+    from scipy.spatial import cKDTree
+    return cKDTree(_skycoord_unit_vectors(positions).reshape(-1, 3))
+
+
+def _skycoord_unit_vectors(positions):
+    """ICRS unit vectors of sky positions, shape ``positions.shape + (3,)``.
+
+    Uses the unit spherical representation, so that positions with a
+    distance give the same vectors as without.
+    """
+    cartesian = positions.icrs.represent_as(UnitSphericalRepresentation).to_cartesian()
+    return np.moveaxis(cartesian.xyz.to('').value, 0, -1)
@@ -2,6 +2,8 @@
 """Fermi catalog and source classes.
 """
 from __future__ import absolute_import, division, print_function, unicode_literals
+from collections import OrderedDict
+import logging
 import warnings
 import numpy as np
 import astropy.units as u
@@ -35,6 +37,8 @@ __all__ = [
     'SourceCatalog3FHL',
 ]
 
+log = logging.getLogger(__name__)
+
 
 def compute_flux_points_ul(quantity, quantity_errp):
     """Compute UL value for fermi flux points.
@@ -921,6 +925,13 @@ class SourceCatalog3FGL(SourceCatalog):
     """Fermi-LAT 3FGL source catalog.
 
     One source is represented by `~gammapy.catalog.SourceCatalogObject3FGL`.
+
+    Parameters
+    ----------
+    filename : str
+        Catalog FITS file name
+    cache_dir : str or `~pathlib.Path`, optional
+        Directory of the parsed catalog cache, see `~gammapy.catalog.SourceCatalog`
     """
     name = '3fgl'
     description = 'LAT 4-year point source catalog'
@@ -935,8 +946,10 @@ class SourceCatalog3FGL(SourceCatalog):
         'unassociated': [''],
     }
 
-    def __init__(self, filename='$GAMMAPY_EXTRA/datasets/catalogs/fermi/gll_psc_v16.fit.gz'):
+    def __init__(self, filename='$GAMMAPY_EXTRA/datasets/catalogs/fermi/gll_psc_v16.fit.gz', cache_dir=None):
         filename = str(make_path(filename))
+        if self._read_cache(filename, cache_dir):
+            return
 
         with warnings.catch_warnings():  # ignore FITS units warnings
             warnings.simplefilter("ignore", u.UnitsWarning)
@@ -955,6 +968,7 @@ class SourceCatalog3FGL(SourceCatalog):
         )
 
         self.extended_sources_table = Table.read(filename, hdu='ExtendedSources')
+        self._write_cache(filename, cache_dir)
 
     def is_source_class(self, source_class):
         """
@@ -1027,13 +1041,22 @@ class SourceCatalog1FHL(SourceCatalog):
     """Fermi-LAT 1FHL source catalog.
 
     One source is represented by `~gammapy.catalog.SourceCatalogObject1FHL`.
+
+    Parameters
+    ----------
+    filename : str
+        Catalog FITS file name
+    cache_dir : str or `~pathlib.Path`, optional
+        Directory of the parsed catalog cache, see `~gammapy.catalog.SourceCatalog`
     """
     name = '1fhl'
     description = 'First Fermi-LAT Catalog of Sources above 10 GeV'
     source_object_class = SourceCatalogObject1FHL
 
-    def __init__(self, filename='$GAMMAPY_EXTRA/datasets/catalogs/fermi/gll_psch_v07.fit.gz'):
+    def __init__(self, filename='$GAMMAPY_EXTRA/datasets/catalogs/fermi/gll_psch_v07.fit.gz', cache_dir=None):
         filename = str(make_path(filename))
+        if self._read_cache(filename, cache_dir):
+            return
 
         with warnings.catch_warnings():  # ignore FITS units warnings
             warnings.simplefilter("ignore", u.UnitsWarning)
@@ -1050,19 +1073,29 @@ class SourceCatalog1FHL(SourceCatalog):
         )
 
         self.extended_sources_table = Table.read(filename, hdu='ExtendedSources')
+        self._write_cache(filename, cache_dir)
 
 
 class SourceCatalog2FHL(SourceCatalog):
     """Fermi-LAT 2FHL source catalog.
 
     One source is represented by `~gammapy.catalog.SourceCatalogObject2FHL`.
+
+    Parameters
+    ----------
+    filename : str
+        Catalog FITS file name
+    cache_dir : str or `~pathlib.Path`, optional
+        Directory of the parsed catalog cache, see `~gammapy.catalog.SourceCatalog`
     """
     name = '2fhl'
     description = 'LAT second high-energy source catalog'
     source_object_class = SourceCatalogObject2FHL
 
-    def __init__(self, filename='$GAMMAPY_EXTRA/datasets/catalogs/fermi/gll_psch_v08.fit.gz'):
+    def __init__(self, filename='$GAMMAPY_EXTRA/datasets/catalogs/fermi/gll_psch_v08.fit.gz', cache_dir=None):
         filename = str(make_path(filename))
+        if self._read_cache(filename, cache_dir):
+            return
 
         with warnings.catch_warnings():  # ignore FITS units warnings
             warnings.simplefilter("ignore", u.UnitsWarning)
@@ -1081,16 +1114,29 @@ class SourceCatalog2FHL(SourceCatalog):
         self.counts_image = Map.read(filename, hdu='Count Map')
         self.extended_sources_table = Table.read(filename, hdu='Extended Sources')
         self.rois = Table.read(filename, hdu='ROIs')
+        self._write_cache(filename, cache_dir)
 
 
 class SourceCatalog3FHL(SourceCatalog):
     """Fermi-LAT 3FHL source catalog.
 
     One source is represented by `~gammapy.catalog.SourceCatalogObject3FHL`.
+
+    Parameters
+    ----------
+    filename : str
+        Catalog FITS file name
+    cache_dir : str or `~pathlib.Path`, optional
+        Directory of the parsed catalog cache, see `~gammapy.catalog.SourceCatalog`
     """
     name = '3fhl'
     description = 'LAT third high-energy source catalog'
     source_object_class = SourceCatalogObject3FHL
+    _spatial_model_classes = OrderedDict([
+        ('Point', SkyPointSource), ('RadialGauss', SkyGaussian), ('RadialDisk', SkyDisk),
+    ])
+    _spectral_model_classes = OrderedDict([('PowerLaw', PowerLaw), ('LogParabola', LogParabola)])
+    _skipped_spatial_types = ('SpatialMap',)
     source_categories = {
         'galactic': ['glc', 'hmb', 'psr', 'pwn', 'sfr', 'snr', 'spp'],
         'extra-galactic': ['agn', 'bcu', 'bll', 'fsrq', 'rdg', 'sbg'],
@@ -1099,8 +1145,10 @@ class SourceCatalog3FHL(SourceCatalog):
         'unassociated': [''],
     }
 
-    def __init__(self, filename='$GAMMAPY_EXTRA/datasets/catalogs/fermi/gll_psch_v13.fit.gz'):
+    def __init__(self, filename='$GAMMAPY_EXTRA/datasets/catalogs/fermi/gll_psch_v13.fit.gz', cache_dir=None):
         filename = str(make_path(filename))
+        if self._read_cache(filename, cache_dir):
+            return
 
         with warnings.catch_warnings():  # ignore FITS units warnings
             warnings.simplefilter("ignore", u.UnitsWarning)
@@ -1119,6 +1167,79 @@ class SourceCatalog3FHL(SourceCatalog):
         self.extended_sources_table = Table.read(filename, hdu='ExtendedSources')
         self.rois = Table.read(filename, hdu='ROIs')
         self.energy_bounds_table = Table.read(filename, hdu='EnergyBounds')
+        self._write_cache(filename, cache_dir)
+
+    def _extended_source_models(self):
+        """Spatial model type and size of all sources, from the extended source table."""
+        table, extended = self.table, self.extended_sources_table
+        spatial_type = np.array(['Point'] * len(table), dtype=object)
+        size = np.zeros(len(table)) * u.deg
+        for idx, name in enumerate(table['Extended_Source_Name']):
+            if name.strip() != '':
+                idx_extended = self._lookup_extended_source_idx[name.strip()]
+                spatial_type[idx] = extended['Spatial_Function'][idx_extended].strip()
+                size[idx] = extended['Model_SemiMajor'].quantity[idx_extended]
+        return spatial_type, size
+
+    def _sky_model_types(self):
+        """Model types by ``Spatial_Function`` and ``SpectrumType``, see `sky_model_parameters`.
+
+        Extended sources with a ``SpatialMap`` template are left out, with a warning.
+        """
+        spatial_type, _ = self._extended_source_models()
+        spectral_type = np.array([_.strip() for _ in self.table['SpectrumType']])
+
+        is_map = spatial_type == 'SpatialMap'
+        if is_map.any():
+            names = [self.source_name(idx) for idx in np.flatnonzero(is_map)]
+            log.warning('Sources with SpatialMap model are left out: {}'.format(', '.join(names)))
+
+        return spatial_type, spectral_type
+
+    def _spatial_type_error(self, spatial_type):
+        return ValueError('Not a valid spatial model{}'.format(spatial_type))
+
+    def _spectral_type_error(self, spectral_type):
+        return ValueError('No spec_type: {}. Please report this issue.'.format(spectral_type))
+
+    def _spatial_model_parameters(self):
+        """Spatial model parameter arrays by ``Spatial_Function``, see `sky_model_parameters`."""
+        table = self.table
+        _, size = self._extended_source_models()
+        glon, glat = table['GLON'].quantity, table['GLAT'].quantity
+        return {
+            'Point': OrderedDict([('lon_0', glon), ('lat_0', glat)]),
+            'RadialGauss': OrderedDict([('lon_0', glon), ('lat_0', glat), ('sigma', size)]),
+            'RadialDisk': OrderedDict([('lon_0', glon), ('lat_0', glat), ('r_0', size)]),
+        }
+
+    def _spectral_model_parameters(self):
+        """Spectral model parameter and error arrays by ``SpectrumType``, see `sky_model_parameters`."""
+        table = self.table
+        amplitude, reference = table['Flux_Density'].quantity, table['Pivot_Energy'].quantity
+        pars = {
+            'PowerLaw': OrderedDict([
+                ('amplitude', amplitude), ('reference', reference),
+                ('index', table['PowerLaw_Index'].quantity * u.Unit('')),
+            ]),
+            'LogParabola': OrderedDict([
+                ('amplitude', amplitude), ('reference', reference),
+                ('alpha', table['Spectral_Index'].quantity * u.Unit('')),
+                ('beta', table['beta'].quantity * u.Unit('')),
+            ]),
+        }
+        errs = {
+            'PowerLaw': OrderedDict([
+                ('amplitude', table['Unc_Flux_Density'].quantity),
+                ('index', table['Unc_PowerLaw_Index'].quantity * u.Unit('')),
+            ]),
+            'LogParabola': OrderedDict([
+                ('amplitude', table['Unc_Flux_Density'].quantity),
+                ('alpha', table['Unc_Spectral_Index'].quantity * u.Unit('')),
+                ('beta', table['Unc_beta'].quantity * u.Unit('')),
+            ]),
+        }
+        return pars, errs
 
     def is_source_class(self, source_class):
         """
@@ -18,7 +18,7 @@ from ..spectrum import FluxPoints
 from ..spectrum.models import PowerLaw, PowerLaw2, ExponentialCutoffPowerLaw
 from ..image.models import SkyPointSource, SkyGaussian, SkyShell
 from ..cube.models import SkyModel, SourceLibrary
-from .core import SourceCatalog, SourceCatalogObject
+from .core import SourceCatalog, SourceCatalogObject, _make_sky_models
 
 __all__ = [
     'SourceCatalogGammaCat',
@@ -410,6 +410,8 @@ class SourceCatalogGammaCat(SourceCatalog):
     ----------
     filename : str
         Path to the gamma-cat fits file.
+    cache_dir : str or `~pathlib.Path`, optional
+        Directory of the parsed catalog cache, see `~gammapy.catalog.SourceCatalog`
 
     Examples
     --------
@@ -431,9 +433,19 @@ class SourceCatalogGammaCat(SourceCatalog):
     name = 'gamma-cat'
     description = 'An open catalog of gamma-ray sources'
     source_object_class = SourceCatalogObjectGammaCat
-
-    def __init__(self, filename='$GAMMA_CAT/output/gammacat.fits.gz'):
+    _spatial_model_classes = OrderedDict([
+        ('point', SkyPointSource), ('gauss', SkyGaussian), ('shell', SkyShell),
+    ])
+    _spectral_model_classes = OrderedDict([
+        ('pl', PowerLaw), ('pl2', PowerLaw2), ('ecpl', ExponentialCutoffPowerLaw),
+    ])
+    _skipped_spatial_types = ('none',)
+
+    def __init__(self, filename='$GAMMA_CAT/output/gammacat.fits.gz', cache_dir=None):
         filename = str(make_path(filename))
+        if self._read_cache(filename, cache_dir):
+            return
+
         table = Table.read(filename, hdu=1)
         self.filename = filename
 
@@ -444,21 +456,98 @@ class SourceCatalogGammaCat(SourceCatalog):
             source_name_key=source_name_key,
             source_name_alias=source_name_alias,
         )
+        self._write_cache(filename, cache_dir)
+
+    def _sky_model_types(self):
+        """Model types by ``morph_type`` and ``spec_type``, see `sky_model_parameters`.
+
+        Sources without spatial model (``morph_type='none'``) are left out.
+        """
+        return self.table['morph_type'], self.table['spec_type']
+
+    def _spatial_type_error(self, spatial_type):
+        return NotImplementedError('Unknown spatial model: {!r}'.format(spatial_type))
+
+    def _spectral_type_error(self, spectral_type):
+        return ValueError('Invalid spec_type: {}'.format(spectral_type))
+
+    def _spatial_model_parameters(self):
+        """Spatial model parameter arrays by ``morph_type``, see `sky_model_parameters`."""
+        table = self.table
+        glon, glat = table['glon'].quantity, table['glat'].quantity
+        sigma = table['morph_sigma'].quantity
+
+        return {
+            'point': OrderedDict([('lon_0', glon), ('lat_0', glat)]),
+            'gauss': OrderedDict([('lon_0', glon), ('lat_0', glat), ('sigma', sigma)]),
+            # TODO: probably we shouldn't guess a shell width here!
+            'shell': OrderedDict([('lon_0', glon), ('lat_0', glat),
+                                  ('radius', 0.8 * sigma), ('width', 0.2 * sigma)]),
+        }
+
+    def _spectral_model_parameters(self):
+        """Spectral model parameter and error arrays by ``spec_type``, see `sky_model_parameters`."""
+        table = self.table
+        pars, errs = {}, {}
+
+        pars['pl'] = OrderedDict([
+            ('amplitude', table['spec_pl_norm'].quantity),
+            ('index', table['spec_pl_index'].quantity * u.Unit('')),
+            ('reference', table['spec_pl_e_ref'].quantity),
+        ])
+        errs['pl'] = OrderedDict([
+            ('amplitude', table['spec_pl_norm_err'].quantity),
+            ('index', table['spec_pl_index_err'].quantity * u.Unit('')),
+        ])
+
+        e_max = table['spec_pl2_e_max'].quantity.copy()
+        e_max[np.isnan(e_max.value)] = u.Quantity(1e5, 'TeV')
+        pars['pl2'] = OrderedDict([
+            ('amplitude', table['spec_pl2_flux'].quantity),
+            ('index', table['spec_pl2_index'].quantity * u.Unit('')),
+            ('emin', table['spec_pl2_e_min'].quantity),
+            ('emax', e_max),
+        ])
+        errs['pl2'] = OrderedDict([
+            ('amplitude', table['spec_pl2_flux_err'].quantity),
+            ('index', table['spec_pl2_index_err'].quantity * u.Unit('')),
+        ])
+
+        e_cut = table['spec_ecpl_e_cut'].quantity
+        pars['ecpl'] = OrderedDict([
+            ('amplitude', table['spec_ecpl_norm'].quantity),
+            ('index', table['spec_ecpl_index'].quantity * u.Unit('')),
+            ('lambda_', 1. / e_cut),
+            ('reference', table['spec_ecpl_e_ref'].quantity),
+        ])
+        errs['ecpl'] = OrderedDict([
+            ('amplitude', table['spec_ecpl_norm_err'].quantity),
+            ('index', table['spec_ecpl_index_err'].quantity * u.Unit('')),
+            ('lambda_', table['spec_ecpl_e_cut_err'].quantity / e_cut ** 2),
+        ])
+
+        return pars, errs
 
     def to_source_library(self):
         """Convert to a `~gammapy.utils.modeling.SourceLibrary`.
 
+        The models are made from `sky_model_parameters`, without making
+        a source object for each source.
+
         TODO: add an option whether to skip or raise on missing models or data.
         """
-        source_list = []
+        models = {}
+        for (spatial_model_class, spectral_model_class), pars in self.sky_model_parameters().items():
+            sky_models = _make_sky_models(pars, spatial_model_class, spectral_model_class)
+            models.update(zip(pars['catalog_row_index'], sky_models))
 
+        source_list = []
         for source_idx in range(len(self.table)):
-            source = self[source_idx]
-            try:
-                source_list.append(source.sky_model)
-            except NoDataAvailableError:
-                log.warning('Skipping source {} (missing data in gamma-cat)'.format(source.name))
-                continue
+            if source_idx in models:
+                source_list.append(models[source_idx])
+            else:
+                name = self.source_name(source_idx)
+                log.warning('Skipping source {} (missing data in gamma-cat)'.format(name))
 
         return SourceLibrary(source_list)
 
@@ -7,16 +7,17 @@ from collections import OrderedDict
 import numpy as np
 import astropy.units as u
 from astropy.table import Table
+from astropy.utils import lazyproperty
 from astropy.coordinates import Angle
 from astropy.modeling.models import Gaussian1D
 from ..extern.pathlib import Path
 from ..utils.scripts import make_path
-from ..utils.table import table_row_to_dict
 from ..spectrum import FluxPoints
 from ..spectrum.models import PowerLaw, PowerLaw2, ExponentialCutoffPowerLaw
 from ..image.models import SkyPointSource, SkyGaussian, SkyShell
 from ..cube.models import SkyModel, SumSkyModel
-from .core import SourceCatalog, SourceCatalogObject
+from .core import (SourceCatalog, SourceCatalogObject, _make_model_parameters,
+                   _make_row_columns, _row_data)
 
 __all__ = [
     'SourceCatalogHGPS',
@@ -599,6 +600,15 @@ class SourceCatalogHGPS(SourceCatalog):
     >>> cat.gaussian_component(83)
 
     More examples here: :gp-extra-notebook:`hgps`
+
+    Parameters
+    ----------
+    filename : str
+        Catalog FITS file name
+    hdu : str
+        Name of the source table HDU
+    cache_dir : str or `~pathlib.Path`, optional
+        Directory of the parsed catalog cache, see `~gammapy.catalog.SourceCatalog`
     """
     name = 'hgps'
     """Source catalog name (str)."""
@@ -607,12 +617,20 @@ class SourceCatalogHGPS(SourceCatalog):
     """Source catalog description (str)."""
 
     source_object_class = SourceCatalogObjectHGPS
+    _spatial_model_classes = OrderedDict([
+        ('point-like', SkyPointSource), ('gaussian', SkyGaussian), ('shell', SkyShell),
+    ])
+    _spectral_model_classes = OrderedDict([('pl', PowerLaw), ('ecpl', ExponentialCutoffPowerLaw)])
+    _skipped_spatial_types = ('2-gaussian', '3-gaussian')
 
-    def __init__(self, filename=None, hdu='HGPS_SOURCES'):
+    def __init__(self, filename=None, hdu='HGPS_SOURCES', cache_dir=None):
         if not filename:
             filename = Path(os.environ['HGPS_ANALYSIS']) / 'data/catalogs/HGPS3/release/HGPS_v0.4.fits'
 
         filename = str(make_path(filename))
+        if self._read_cache(filename, cache_dir, hdu):
+            return
+
         table = Table.read(filename, hdu=hdu)
 
         source_name_alias = ('Identified_Object',)
@@ -625,6 +643,7 @@ class SourceCatalogHGPS(SourceCatalog):
         self._table_associations = Table.read(filename, hdu='HGPS_ASSOCIATIONS')
         self._table_identifications = Table.read(filename, hdu='HGPS_IDENTIFICATIONS')
         self._table_large_scale_component = Table.read(filename, hdu='HGPS_LARGE_SCALE_COMPONENT')
+        self._write_cache(filename, cache_dir, hdu)
 
     @property
     def table_components(self):
@@ -669,11 +688,23 @@ class SourceCatalogHGPS(SourceCatalog):
 
     def _attach_component_info(self, source):
         source.components = []
-        lookup = SourceCatalog(self.table_components, source_name_key='Component_ID')
+        lookup = self._component_catalog
         for name in source.data['Components'].split(', '):
             component = SourceCatalogObjectHGPSComponent(data=lookup[name].data)
             source.components.append(component)
 
+    @lazyproperty
+    def _component_row_columns(self):
+        return _make_row_columns(self.table_components)
+
+    @lazyproperty
+    def _identification_row_columns(self):
+        return _make_row_columns(self._table_identifications)
+
+    @lazyproperty
+    def _component_catalog(self):
+        return SourceCatalog(self.table_components, source_name_key='Component_ID')
+
     def _attach_association_info(self, source):
         t = self.table_associations
         mask = source.data['Source_Name'] == t['Source_Name']
@@ -682,11 +713,125 @@ class SourceCatalogHGPS(SourceCatalog):
     def _attach_identification_info(self, source):
         t = self._table_identifications
         idx = np.nonzero(source.name == t['Source_Name'])[0][0]
-        source.identification_info = table_row_to_dict(t[idx])
+        source.identification_info = _row_data(self._identification_row_columns, idx)
+
+    def sky_model_parameters(self):
+        """Sky model parameters of all sources, grouped by model type.
+
+        See `~gammapy.catalog.SourceCatalog.sky_model_parameters`. The
+        parameters are the same as for `SourceCatalogObjectHGPS.sky_model`.
+        Multi-Gaussian sources are given as one row per Gaussian component,
+        with the ``Component_ID`` as ``source_name``.
+        """
+        parameters = super(SourceCatalogHGPS, self).sky_model_parameters()
+
+        rows, source_rows = [], []
+        for idx in np.flatnonzero(self._is_multi_gaussian):
+            for name in self.table['Components'][idx].split(', '):
+                rows.append(self._component_catalog.row_index(name))
+                source_rows.append(idx)
+
+        if rows:
+            parameters[SkyGaussian, PowerLaw2] = self._component_model_parameters(rows, source_rows)
+
+        return parameters
+
+    @property
+    def _is_multi_gaussian(self):
+        spatial_type = np.array([_.strip().lower() for _ in self.table['Spatial_Model']])
+        return np.in1d(spatial_type, self._skipped_spatial_types)
+
+    def _sky_model_types(self):
+        """Model types by ``Spatial_Model`` and ``Spectral_Model``, see `sky_model_parameters`.
+
+        Multi-Gaussian sources are left out, their components are added by
+        `sky_model_parameters`.
+        """
+        table = self.table
+        spatial_type = np.array([_.strip().lower() for _ in table['Spatial_Model']])
+        spectral_type = np.array([_.strip().lower() for _ in table['Spectral_Model']])
+
+        is_multi = self._is_multi_gaussian
+        is_pointlike = np.asarray(table['Spatial_Model'] == 'Point-Like') | np.isfinite(table['Size_UL'])
+        spatial_type[is_pointlike & ~is_multi] = 'point-like'
+        return spatial_type, spectral_type
+
+    def _spatial_type_error(self, spatial_type):
+        return ValueError('Not a valid spatial model: {}'.format(spatial_type))
+
+    def _spatial_model_parameters(self):
+        """Spatial model parameter arrays by ``Spatial_Model``, see `sky_model_parameters`."""
+        # HGPS contains no information on shell width, see ``spatial_model``.
+        # The shell radius is computed in double precision, as for one source.
+        table = self.table
+        glon, glat, size = table['GLON'].quantity, table['GLAT'].quantity, table['Size'].quantity
+        r_out = size.astype('float64')
+        return {
+            'point-like': OrderedDict([('lon_0', glon), ('lat_0', glat)]),
+            'gaussian': OrderedDict([('lon_0', glon), ('lat_0', glat), ('sigma', size)]),
+            'shell': OrderedDict([('lon_0', glon), ('lat_0', glat),
+                                  ('radius', 0.95 * r_out), ('width', r_out - 0.95 * r_out)]),
+        }
+
+    def _spectral_model_parameters(self):
+        """Spectral model parameter and error arrays by ``Spectral_Model``, see `sky_model_parameters`."""
+        table = self.table
+        pars = {
+            'pl': OrderedDict([
+                ('index', table['Index_Spec_PL'].quantity * u.Unit('')),
+                ('amplitude', table['Flux_Spec_PL_Diff_Pivot'].quantity),
+                ('reference', table['Energy_Spec_PL_Pivot'].quantity),
+            ]),
+            'ecpl': OrderedDict([
+                ('index', table['Index_Spec_ECPL'].quantity * u.Unit('')),
+                ('amplitude', table['Flux_Spec_ECPL_Diff_Pivot'].quantity),
+                ('reference', table['Energy_Spec_ECPL_Pivot'].quantity),
+                ('lambda_', table['Lambda_Spec_ECPL'].quantity),
+            ]),
+        }
+        errs = {
+            'pl': OrderedDict([
+                ('amplitude', table['Flux_Spec_PL_Diff_Pivot_Err'].quantity),
+                ('index', table['Index_Spec_PL_Err'].quantity * u.Unit('')),
+            ]),
+            'ecpl': OrderedDict([
+                ('index', table['Index_Spec_ECPL_Err'].quantity * u.Unit('')),
+                ('amplitude', table['Flux_Spec_ECPL_Diff_Pivot_Err'].quantity),
+                ('lambda_', table['Lambda_Spec_ECPL_Err'].quantity),
+            ]),
+        }
+        return pars, errs
+
+    def _component_model_parameters(self, rows, source_rows):
+        """Gaussian component parameters, see `SourceCatalogObjectHGPSComponent.sky_model`."""
+        table = self.table_components
+        ones = np.ones(len(table))
+        spatial_pars = OrderedDict([
+            ('lon_0', table['GLON'].quantity),
+            ('lat_0', table['GLAT'].quantity),
+            ('sigma', table['Size'].quantity),
+        ])
+        spectral_pars = OrderedDict([
+            ('amplitude', table['Flux_Map'].quantity),
+            ('index', 2.3 * ones * u.Unit('')),
+            ('emin', ones * u.TeV),
+            ('emax', 1e5 * ones * u.TeV),
+        ])
+        errs = OrderedDict([
+            ('lon_0', table['GLON_Err'].quantity),
+            ('lat_0', table['GLAT_Err'].quantity),
+            ('sigma', table['Size_Err'].quantity),
+            ('amplitude', table['Flux_Map_Err'].quantity),
+        ])
+        source_name = [table['Component_ID'][idx].strip() for idx in rows]
+        return _make_model_parameters(
+            rows, source_name, spatial_pars, spectral_pars, errs,
+            catalog_row_index=source_rows,
+        )
 
     def gaussian_component(self, row_idx):
         """Gaussian component (`SourceCatalogObjectHGPSComponent`)."""
-        data = table_row_to_dict(self.table_components[row_idx])
+        data = _row_data(self._component_row_columns, row_idx)
         data['row_index'] = row_idx
         return SourceCatalogObjectHGPSComponent(data=data)
 
@@ -6,7 +6,9 @@ import numpy as np
 from numpy.testing import assert_allclose
 from astropy.table import Table, Column
 from astropy.units import Quantity
-from ...utils.testing import assert_quantity_allclose
+import astropy.units as u
+from astropy.coordinates import SkyCoord, Angle
+from ...utils.testing import assert_quantity_allclose, requires_dependency
 from ..core import SourceCatalog
 
 
@@ -67,10 +69,54 @@ class TestSourceCatalog:
         with pytest.raises(ValueError):
             self.cat[int]
 
+    def test_getitem_table_changed(self):
+        assert_quantity_allclose(self.cat['bb'].data['DEC'], Quantity(2, 'deg'))
+
+        self.cat.table['DEC'] = Column([4.5, 5.5, 6.5], unit='deg')
+        assert_quantity_allclose(self.cat['bb'].data['DEC'], Quantity(5.5, 'deg'))
+
     def test_positions(self):
         positions = self.cat.positions
         assert len(positions) == 3
 
+    @requires_dependency('scipy')
+    def test_match_positions(self):
+        positions = SkyCoord([42.25, 44.4, 100], [1, 3.1, 0], unit='deg')
+
+        idx, idx_cat, sep = self.cat.match_positions(positions)
+        assert_allclose(idx, [0, 1, 2])
+        assert_allclose(idx_cat, [0, 2, 2])
+        assert_quantity_allclose(sep[:2], Angle([0.049992, 0.1], 'deg'), rtol=1e-4)
+
+        idx, idx_cat, sep = self.cat.match_positions(positions.galactic, radius=Angle(0.2, 'deg'))
+        assert_allclose(idx, [0, 1])
+        assert_allclose(idx_cat, [0, 2])
+
+        idx, idx_cat, sep = self.cat.match_positions(positions[0], radius=Angle(2, 'deg'), nearest=False)
+        assert_allclose(idx, [0, 0])
+        assert_allclose(idx_cat, [0, 1])
+        assert_quantity_allclose(sep, positions[0].separation(self.cat.positions[:2]))
+
+        with pytest.raises(ValueError):
+            self.cat.match_positions(positions, nearest=False)
+
+        # Distances of the positions are ignored
+        positions = SkyCoord(positions.ra, positions.dec, distance=[1, 1e3, 10] * u.kpc)
+        idx, idx_cat, sep = self.cat.match_positions(positions.galactic, radius=Angle(0.2, 'deg'))
+        assert_allclose(idx, [0, 1])
+        assert_allclose(idx_cat, [0, 2])
+        assert_quantity_allclose(sep, Angle([0.049992, 0.1], 'deg'), rtol=1e-4)
+
+    @requires_dependency('scipy')
+    def test_match_catalog(self):
+        other = make_test_catalog()
+        other.table = other.table[::-1]
+
+        idx, idx_other, sep = self.cat.match_catalog(other, radius=Angle(1, 'arcsec'))
+        assert_allclose(idx, [0, 1, 2])
+        assert_allclose(idx_other, [2, 1, 0])
+        assert_quantity_allclose(sep, Angle([0, 0, 0], 'deg'), atol=Angle(1e-6, 'arcsec'))
+
 
 class TestSourceCatalogObject:
     def setup(self):
@@ -12,6 +12,8 @@ from ...spectrum.models import (
     ExponentialCutoffPowerLaw3FGL,
     PLSuperExpCutoff3FGL,
 )
+from ...image.models import SkyPointSource
+from ...cube.models import PopulationSkyModel
 from .. import SourceCatalog3FGL, SourceCatalog2FHL, SourceCatalog1FHL, SourceCatalog3FHL
 
 SOURCES_3FGL = [
@@ -374,6 +376,23 @@ class TestSourceCatalog3FHL:
         table = self.cat.extended_sources_table
         assert len(table) == 55
 
+    def test_sky_model_parameters(self, caplog):
+        parameters = self.cat.sky_model_parameters()
+        n_spatial_map = np.sum([_.strip() == 'SpatialMap' for _ in self.cat.extended_sources_table['Spatial_Function']])
+        assert sum(len(_) for _ in parameters.values()) == len(self.cat.table) - n_spatial_map
+        assert 'Sources with SpatialMap model are left out' in caplog.text
+
+        for pars in parameters.values():
+            row = pars[0]
+            expected = self.cat[row['catalog_row_index']].sky_model
+            for par in expected.parameters.parameters:
+                assert_allclose(row[par.name], par.value)
+
+    def test_to_sum_model(self):
+        model = self.cat.to_sum_model()
+        assert isinstance(model.components[0], PopulationSkyModel)
+        assert model.components[0].spatial_model_class is SkyPointSource
+
     def test_select_source_classes(self):
         selection = self.cat.select_source_class('galactic')
         assert len(selection.table) == 44
@@ -1,13 +1,19 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 from collections import OrderedDict
+import numpy as np
 from numpy.testing import assert_allclose
 import pytest
 from astropy import units as u
+from astropy.table import Table
 from ...utils.testing import requires_data, requires_dependency
 from ...utils.testing import assert_quantity_allclose
 from ..gammacat import SourceCatalogGammaCat
 from ..gammacat import GammaCatResource, GammaCatResourceIndex
+from ...spectrum.models import PowerLaw, PowerLaw2, ExponentialCutoffPowerLaw
+from ...image.models import SkyPointSource, SkyGaussian, SkyShell
+from ...cube.models import SkyModel, PopulationSkyModel, SumSkyModel
+from ...maps import WcsGeom
 
 SOURCES = [
     {
@@ -180,6 +186,112 @@ class TestSourceCatalogObjectGammaCat:
         # TODO: put asserts
 
 
+def make_test_gammacat(filename):
+    table = Table()
+    table['common_name'] = ['a', 'bb', 'ccc', 'dddd']
+    table['other_names'] = ['', '', '', '']
+    table['gamma_names'] = ['', '', '', '']
+    table['morph_type'] = ['point', 'none', 'gauss', 'shell']
+    table['spec_type'] = ['pl', 'pl', 'ecpl', 'pl2']
+    table['glon'] = [1, 2, 3, 4] * u.deg
+    table['glat'] = [-1, 0, 1, 2] * u.deg
+    table['morph_sigma'] = [np.nan, np.nan, 0.2, 0.5] * u.deg
+    for name in ['spec_pl_norm', 'spec_ecpl_norm']:
+        table[name] = [1e-12, 2e-12, 3e-12, 4e-12] * u.Unit('cm-2 s-1 TeV-1')
+        table[name + '_err'] = [1e-13, 2e-13, 3e-13, 4e-13] * u.Unit('cm-2 s-1 TeV-1')
+    for name in ['spec_pl_index', 'spec_ecpl_index', 'spec_pl2_index']:
+        table[name] = [2.1, 2.2, 2.3, 2.4]
+        table[name + '_err'] = [0.1, 0.2, 0.3, 0.4]
+    table['spec_pl_e_ref'] = [1, 1, 1, 1] * u.TeV
+    table['spec_ecpl_e_ref'] = [1, 1, 1, 1] * u.TeV
+    table['spec_ecpl_e_cut'] = [10, 10, 20, 10] * u.TeV
+    table['spec_ecpl_e_cut_err'] = [1, 1, 4, 1] * u.TeV
+    table['spec_pl2_flux'] = [1e-12, 2e-12, 3e-12, 4e-12] * u.Unit('cm-2 s-1')
+    table['spec_pl2_flux_err'] = [1e-13, 2e-13, 3e-13, 4e-13] * u.Unit('cm-2 s-1')
+    table['spec_pl2_e_min'] = [1, 1, 1, 1] * u.TeV
+    table['spec_pl2_e_max'] = [np.nan, np.nan, np.nan, np.nan] * u.TeV
+    table.write(filename)
+    return SourceCatalogGammaCat(filename)
+
+
+class TestSourceCatalogGammaCatModels:
+    @pytest.fixture(autouse=True)
+    def make_catalog(self, tmpdir):
+        self.tmpdir = tmpdir
+        self.cat = make_test_gammacat(str(tmpdir / 'gammacat.fits'))
+
+    def test_sky_model_parameters(self):
+        parameters = self.cat.sky_model_parameters()
+        assert list(parameters) == [
+            (SkyPointSource, PowerLaw),
+            (SkyGaussian, ExponentialCutoffPowerLaw),
+            (SkyShell, PowerLaw2),
+        ]
+
+        pars = parameters[SkyGaussian, ExponentialCutoffPowerLaw]
+        assert_allclose(pars['catalog_row_index'], [2])
+        assert pars['source_name'][0] == 'ccc'
+        assert pars.meta['spatial_parameters'] == ['lon_0', 'lat_0', 'sigma']
+        assert_quantity_allclose(pars['lambda_'].quantity, [0.05] * u.Unit('TeV-1'))
+        assert_quantity_allclose(pars['lambda__err'].quantity, [0.01] * u.Unit('TeV-1'))
+
+        pars = parameters[SkyShell, PowerLaw2]
+        assert_quantity_allclose(pars['radius'].quantity, [0.4] * u.deg)
+        assert_quantity_allclose(pars['emax'].quantity, [1e5] * u.TeV)
+
+    def test_to_source_library(self):
+        sources = self.cat.to_source_library()
+        assert [_.name for _ in sources.skymodels] == ['a', 'ccc', 'dddd']
+
+        for model in sources.skymodels:
+            source = self.cat[model.name]
+            expected = source.sky_model
+            assert model.parameters.names == expected.parameters.names
+            assert_allclose(model.parameters.parameters[2].value,
+                            expected.parameters.parameters[2].value)
+            assert_allclose(model.spectral_model.parameters.covariance,
+                            expected.spectral_model.parameters.covariance)
+
+    def test_to_sum_model(self):
+        model = self.cat.to_sum_model()
+        assert [type(_) for _ in model.components] == [PopulationSkyModel] * 2 + [SkyModel]
+        assert model.components[1].name == 'SkyGaussian ExponentialCutoffPowerLaw'
+        assert model.parameters.names == model.components[2].parameters.names
+
+        geom = WcsGeom.create(skydir=(2.5, 0.5), binsz=0.25, width=(6, 4), coordsys='GAL')
+        lon, lat = geom.get_coord()
+        lon, lat = lon * u.deg, lat * u.deg
+        emin, emax = [1, 3] * u.TeV, [3, 10] * u.TeV
+        actual = model.evaluate_integral(lon, lat, emin, emax)
+        expected = SumSkyModel(self.cat.to_source_library().skymodels).evaluate_integral(lon, lat, emin, emax)
+        assert actual.unit == 'cm-2 s-1 deg-2'
+        assert_allclose(actual.value, expected.value, rtol=1e-10)
+        assert_allclose(actual.value.sum(), 1.033286e-10, rtol=1e-5)
+
+    def test_sky_model_parameters_invalid(self):
+        self.cat.table['spec_type'][0] = 'none'
+        with pytest.raises(ValueError):
+            self.cat.sky_model_parameters()
+
+    def test_cache(self):
+        filename, cache_dir = str(self.tmpdir / 'gammacat.fits'), str(self.tmpdir / 'cache')
+        cat = SourceCatalogGammaCat(filename, cache_dir=cache_dir)
+        assert len(self.tmpdir.join('cache').listdir()) == 1
+
+        cached = SourceCatalogGammaCat(filename, cache_dir=cache_dir)
+        assert cached.filename == cat.filename
+        assert cached.table.colnames == cat.table.colnames
+        assert cached['ccc'].spatial_model.parameters['sigma'].value == 0.2
+
+        # A broken cache file is ignored and replaced
+        path = self.tmpdir.join('cache').listdir()[0]
+        path.write_binary(b'invalid')
+        cat = SourceCatalogGammaCat(filename, cache_dir=cache_dir)
+        assert cat['ccc'].spatial_model.parameters['sigma'].value == 0.2
+        assert self.tmpdir.join('cache').listdir() == [path]
+        assert path.read_binary() != b'invalid'
+
+
 class TestGammaCatResource:
     def setup(self):
         self.resource = GammaCatResource(source_id=42, reference_id='2010A&A...516A..62A', file_id=2)
@@ -9,7 +9,9 @@ from astropy.coordinates import SkyCoord, Angle
 from astropy.table import Table
 from ...utils.testing import assert_quantity_allclose
 from ...utils.testing import requires_data, requires_dependency
-from ...spectrum.models import PowerLaw, ExponentialCutoffPowerLaw
+from ...spectrum.models import PowerLaw, PowerLaw2, ExponentialCutoffPowerLaw
+from ...image.models import SkyPointSource, SkyGaussian
+from ...cube.models import PopulationSkyModel
 from ..hess import SourceCatalogHGPS, SourceCatalogLargeScaleHGPS
 
 
@@ -45,6 +47,27 @@ class TestSourceCatalogHGPS:
         c = cat.gaussian_component(83)
         assert c.name == 'HGPSC 084'
 
+    @staticmethod
+    def test_sky_model_parameters(cat):
+        parameters = cat.sky_model_parameters()
+        components = parameters[SkyGaussian, PowerLaw2]
+        is_multi = np.array([_.strip() in {'2-Gaussian', '3-Gaussian'} for _ in cat.table['Spatial_Model']])
+        n_sources = sum(len(_) for _ in parameters.values()) - len(components)
+        assert n_sources == len(cat.table) - is_multi.sum()
+        assert is_multi[components['catalog_row_index']].all()
+
+        row = components[0]
+        expected = cat.gaussian_component(cat._component_catalog.row_index(row['source_name'])).sky_model
+        for par in expected.parameters.parameters:
+            assert_allclose(row[par.name], par.value)
+        assert_allclose(row['sigma_err'], expected.spatial_model.parameters.error('sigma'))
+
+    @staticmethod
+    def test_to_sum_model(cat):
+        model = cat.to_sum_model()
+        assert isinstance(model.components[0], PopulationSkyModel)
+        assert model.components[0].spatial_model_class is SkyPointSource
+
 
 @requires_data('gammapy-extra')
 class TestSourceCatalogObjectHGPS:
@@ -3,7 +3,7 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import numpy as np
 from .models import MapEvaluator
 from ..stats import cash
-from ..utils.fitting import fit_iminuit
+from ..utils.fitting import fit_iminuit, likelihood_profile
 
 __all__ = [
     'MapFit',
@@ -52,6 +52,12 @@ class MapFit(object):
             edisp=self.edisp,
         )
 
+    def __getstate__(self):
+        # The Minuit object can't be pickled, e.g. for multiprocessing
+        state = self.__dict__.copy()
+        state['_minuit'] = None
+        return state
+
     @property
     def npred(self):
         """Predicted counts cube"""
@@ -98,3 +104,28 @@ class MapFit(object):
                                          opts_minuit=opts_minuit)
         self.model.parameters = parameters
         self._minuit = minuit
+
+    def likelihood_profile(self, values, reoptimize=False, n_jobs=1, opts_minuit=None):
+        """Likelihood profile or contour on a grid of one or two parameters.
+
+        Calls `~gammapy.utils.fitting.likelihood_profile`, see there for details.
+
+        Parameters
+        ----------
+        values : dict
+            Grid values for one or two model parameters, keyed by parameter name
+        reoptimize : bool
+            Re-optimise the other free parameters at each grid point
+        n_jobs : int
+            Number of processes
+        opts_minuit : dict (optional)
+            Options passed to `iminuit.Minuit` constructor
+
+        Returns
+        -------
+        result : `~collections.OrderedDict`
+            Statistic ``stat`` and values of all parameters on the grid
+        """
+        return likelihood_profile(self.total_stat, self.model.parameters, values,
+                                  reoptimize=reoptimize, n_jobs=n_jobs,
+                                  opts_minuit=opts_minuit)
@@ -8,16 +8,30 @@ from astropy.utils import lazyproperty
 from ..utils.modeling import ParameterList
 from ..utils.scripts import make_path
 from ..maps import Map
+from ..spectrum.utils import GaussLegendreIntegrator
+from ..spectrum.models import _numeric_scale
+from ..image.models import SkyPointSource, SkyGaussian
 
 __all__ = [
     'SourceLibrary',
     'SkyModel',
     'CompoundSkyModel',
     'SumSkyModel',
+    'PopulationSkyModel',
     'MapEvaluator',
 ]
 
 
+def _integrate_energy(model, lon, lat, emin, emax):
+    """Integrate sky model over energy bins with Gauss-Legendre quadrature."""
+    integrator = GaussLegendreIntegrator.cached(emin, emax)
+    flux = 0
+    for energy, weights in zip(integrator.nodes.T, integrator.weights.T):
+        dnde = model.evaluate(lon, lat, energy)
+        flux = flux + dnde * weights[:, np.newaxis, np.newaxis]
+    return flux.to('cm-2 s-1 deg-2')
+
+
 class SourceLibrary(object):
     """Collection of `~gammapy.cube.models.SkyModel`
 
@@ -107,6 +121,7 @@ class SkyModel(object):
             spatial_model.parameters.parameters +
             spectral_model.parameters.parameters
         )
+        self._spectral_unit_cache = None
 
     @property
     def spatial_model(self):
@@ -128,6 +143,20 @@ class SkyModel(object):
         idx = len(self.spatial_model.parameters.parameters)
         self._spatial_model.parameters.parameters = parameters.parameters[:idx]
         self._spectral_model.parameters.parameters = parameters.parameters[idx:]
+        self._spectral_unit_cache = None
+
+    def _spectral_is_dnde(self):
+        """Whether the spectral model unit is a differential flux unit.
+
+        The unit is computed from the spectral model value at 1 TeV once and
+        cached. It only depends on the parameter units, e.g. of the amplitude
+        or norm, so the cache is keyed on them.
+        """
+        key = tuple(par.unit for par in self.spectral_model.parameters.parameters)
+        if self._spectral_unit_cache is None or self._spectral_unit_cache[0] != key:
+            unit = self.spectral_model(1 * u.TeV).unit
+            self._spectral_unit_cache = key, unit.is_equivalent('cm-2 s-1 TeV-1')
+        return self._spectral_unit_cache[1]
 
     def __repr__(self):
         fmt = '{}(spatial_model={!r}, spectral_model={!r})'
@@ -159,13 +188,56 @@ class SkyModel(object):
             Model value at the given point.
         """
         val_spatial = self.spatial_model(lon, lat)
-        val_spectral = self.spectral_model(energy)
+
+        # The faster unit-free evaluation is only used for fluxes
+        if self._spectral_is_dnde():
+            val_spectral = self.spectral_model.evaluate_numeric(energy.to('TeV').value)
+            val_spectral = val_spectral * u.Unit('cm-2 s-1 TeV-1')
+        else:
+            val_spectral = self.spectral_model(energy)
         val_spectral = np.atleast_1d(val_spectral)[:, np.newaxis, np.newaxis]
 
         val = val_spatial * val_spectral
 
         return val.to('cm-2 s-1 TeV-1 deg-2')
 
+    def evaluate_integral(self, lon, lat, emin, emax):
+        """Evaluate the model integrated over energy bins.
+
+        The spectral model is integrated with
+        `~gammapy.spectrum.models.SpectralModel.integral_numeric`, i.e.
+        analytically where possible. Spectral models that are not in
+        differential flux units are integrated with
+        `~gammapy.spectrum.GaussLegendreIntegrator`.
+
+        Return surface brightness cube in units: ``cm-2 s-1 deg-2``
+
+        Parameters
+        ----------
+        lon, lat : `~astropy.units.Quantity`
+            Spatial coordinates
+        emin, emax : `~astropy.units.Quantity`
+            Energy bin edges
+
+        Returns
+        -------
+        value : `~astropy.units.Quantity`
+            Model value at the given point.
+        """
+        if not self._spectral_is_dnde():
+            return _integrate_energy(self, lon, lat, emin, emax)
+
+        val_spatial = self.spatial_model(lon, lat)
+        val_spectral = self.spectral_model.integral_numeric(
+            emin.to('TeV').value, emax.to('TeV').value, intervals=True,
+        )
+        val_spectral = np.atleast_1d(val_spectral)[:, np.newaxis, np.newaxis]
+        val_spectral = val_spectral * u.Unit('cm-2 s-1')
+
+        val = val_spatial * val_spectral
+
+        return val.to('cm-2 s-1 deg-2')
+
     def copy(self):
         """A deep copy"""
         return copy.deepcopy(self)
@@ -239,6 +311,21 @@ class CompoundSkyModel(object):
 
         return self.operator(val1, val2)
 
+    def evaluate_integral(self, lon, lat, emin, emax):
+        """Evaluate the compound model integrated over energy bins.
+
+        See `~gammapy.cube.models.SkyModel.evaluate_integral`. For operators
+        other than addition and subtraction the integral is computed using
+        `~gammapy.spectrum.GaussLegendreIntegrator`.
+        """
+        if self.operator not in [operator.add, operator.sub]:
+            return _integrate_energy(self, lon, lat, emin, emax)
+
+        val1 = self.model1.evaluate_integral(lon, lat, emin, emax)
+        val2 = self.model2.evaluate_integral(lon, lat, emin, emax)
+
+        return self.operator(val1, val2)
+
 
 class SumSkyModel(object):
     """Sum of independent `SkyModel` components.
@@ -283,6 +370,209 @@ class SumSkyModel(object):
             out += component.evaluate(lon, lat, energy)
         return out
 
+    def evaluate_integral(self, lon, lat, emin, emax):
+        """Evaluate the model integrated over energy bins.
+
+        See `~gammapy.cube.models.SkyModel.evaluate_integral`.
+        """
+        out = self.components[0].evaluate_integral(lon, lat, emin, emax)
+        for component in self.components[1:]:
+            out += component.evaluate_integral(lon, lat, emin, emax)
+        return out
+
+
+class PopulationSkyModel(object):
+    """Population of sources with the same spatial and spectral model type.
+
+    The parameters of all sources are held as table columns and all sources
+    are evaluated at once, which is much faster than a `SumSkyModel` with
+    one `SkyModel` per source. This is meant e.g. for background models of
+    all sources in a catalog, see `~gammapy.catalog.SourceCatalog.to_sum_model`.
+    The source parameters aren't fit parameters, ``parameters`` is empty.
+
+    The spatial model can be `~gammapy.image.models.SkyPointSource` or
+    `~gammapy.image.models.SkyGaussian`, the spectral model any model that
+    supports `~gammapy.spectrum.models.SpectralModel.evaluate_numeric` with
+    parameter arrays. The energy bin integrals are computed analytically where
+    possible, and with `~gammapy.spectrum.GaussLegendreIntegrator` otherwise.
+
+    Parameters
+    ----------
+    table : `~astropy.table.Table`
+        Model parameters, with one row per source and one column per spatial
+        and spectral model parameter
+    spatial_model_class : {`~gammapy.image.models.SkyPointSource`, `~gammapy.image.models.SkyGaussian`}
+        Spatial model type
+    spectral_model_class : `~gammapy.spectrum.models.SpectralModel` subclass
+        Spectral model type
+    name : str
+        Model identifier
+    """
+    spatial_parameters = {
+        SkyPointSource: ['lon_0', 'lat_0'],
+        SkyGaussian: ['lon_0', 'lat_0', 'sigma'],
+    }
+    """Parameter names of the supported spatial models (dict)."""
+
+    # Maximum number of values per source chunk in spatial model evaluation
+    _chunk_size = 2 ** 20
+
+    def __init__(self, table, spatial_model_class, spectral_model_class, name='PopulationSkyModel'):
+        if spatial_model_class not in self.spatial_parameters:
+            raise ValueError('Spatial model not supported: {}'.format(spatial_model_class.__name__))
+
+        if not spectral_model_class._numeric_evaluate:
+            raise ValueError('Spectral model not supported: {}'.format(spectral_model_class.__name__))
+
+        self.table = table
+        self.spatial_model_class = spatial_model_class
+        self.spectral_model_class = spectral_model_class
+        self.name = name
+
+    @property
+    def parameters(self):
+        """Parameters (`~gammapy.utils.modeling.ParameterList`, empty)"""
+        return ParameterList([])
+
+    def __len__(self):
+        return len(self.table)
+
+    def __repr__(self):
+        fmt = '{}(n_sources={}, spatial_model_class={}, spectral_model_class={})'
+        return fmt.format(self.__class__.__name__, len(self),
+                          self.spatial_model_class.__name__, self.spectral_model_class.__name__)
+
+    def evaluate(self, lon, lat, energy):
+        """Evaluate the model at given points.
+
+        See `~gammapy.cube.models.SkyModel.evaluate`.
+        """
+        energy = np.atleast_1d(energy.to('TeV').value)
+        dnde = self._evaluate_spectral(energy)
+        return self._evaluate_sum(lon, lat, dnde, 'cm-2 s-1 TeV-1 deg-2')
+
+    def evaluate_integral(self, lon, lat, emin, emax):
+        """Evaluate the model integrated over energy bins.
+
+        See `~gammapy.cube.models.SkyModel.evaluate_integral`.
+        """
+        emin = np.atleast_1d(emin.to('TeV').value)
+        emax = np.atleast_1d(emax.to('TeV').value)
+        flux = self._integrate_spectral(emin, emax)
+        return self._evaluate_sum(lon, lat, flux, 'cm-2 s-1 deg-2')
+
+    def _spectral_parameters(self):
+        """Spectral model parameter arrays in the canonical numeric units."""
+        pars = dict()
+        for name in self.spectral_model_class().parameters.names:
+            column = self.table[name]
+            unit = '' if column.unit is None else str(column.unit)
+            pars[name] = np.asarray(column, dtype=float) * _numeric_scale(unit)
+        return pars
+
+    def _evaluate_spectral(self, energy):
+        """Spectral model values, shape ``(len(energy), n_sources)``."""
+        pars = self._spectral_parameters()
+        return self.spectral_model_class.evaluate(energy[:, np.newaxis], **pars)
+
+    def _integrate_spectral(self, emin, emax):
+        """Spectral model bin integrals, shape ``(len(emin), n_sources)``.
+
+        The static ``evaluate_integral`` of the spectral model is used where
+        available, and Gauss-Legendre quadrature where it isn't or doesn't
+        give a finite value, e.g. for a cutoff ``lambda_ <= 0``.
+        """
+        flux = np.full((len(emin), len(self)), np.nan)
+        if hasattr(self.spectral_model_class, 'evaluate_integral'):
+            pars = self._spectral_parameters()
+            with np.errstate(all='ignore'):
+                flux[...] = self.spectral_model_class.evaluate_integral(
+                    emin[:, np.newaxis], emax[:, np.newaxis], **pars
+                )
+
+        invalid = ~np.isfinite(flux)
+        if invalid.any():
+            integrator = GaussLegendreIntegrator.cached(emin, emax)
+            nodes, weights = integrator.nodes, integrator.weights
+            dnde = self._evaluate_spectral(nodes.ravel()).reshape(nodes.shape + (-1,))
+            flux[invalid] = np.sum(dnde * weights[..., np.newaxis], axis=1)[invalid]
+
+        return flux
+
+    def _evaluate_sum(self, lon, lat, spectral, unit):
+        """Sum of spatial times spectral values, in chunks of sources."""
+        shape = lon.shape
+        lon, lat = lon.to('deg').value, lat.to('deg').value
+        pars = [np.asarray(self.table[name].quantity.to('deg').value, dtype=float)
+                for name in self.spatial_parameters[self.spatial_model_class]]
+
+        out = np.zeros((len(spectral), lon.size))
+        n_chunk = max(self._chunk_size // max(lon.size, 1), 1)
+        for start in range(0, len(self), n_chunk):
+            chunk = slice(start, start + n_chunk)
+            if self.spatial_model_class is SkyPointSource:
+                idx, pix, val = _evaluate_point_sources(lon, lat, *[_[chunk] for _ in pars])
+                weights = spectral[:, chunk][:, idx] * val
+                for out_row, weights_row in zip(out, weights):
+                    out_row += np.bincount(pix, weights_row, minlength=lon.size)
+            else:
+                spatial = _evaluate_gaussians(lon, lat, *[_[chunk] for _ in pars])
+                out += np.dot(spectral[:, chunk], spatial)
+
+        out *= u.Unit('sr-1').to('deg-2')
+        return u.Quantity(out.reshape((-1,) + shape), unit, copy=False)
+
+
+def _evaluate_point_sources(lon, lat, lon_0, lat_0):
+    """`~gammapy.image.models.SkyPointSource` values for many sources, in ``sr-1``.
+
+    ``lon`` and ``lat`` are 2-dim pixel coordinate grids, all angles in deg.
+    The values are only non-zero in the pixels next to each source, so they
+    are returned as source indices, flat pixel indices and values.
+    """
+    grad_lat = np.gradient(lat, axis=-2)
+    lat_diff = np.abs((lat - lat_0[:, np.newaxis, np.newaxis]) / grad_lat)
+    with np.errstate(invalid='ignore'):
+        idx, y, x = np.nonzero(lat_diff < 1)
+    lat_val = 1 - lat_diff[idx, y, x]
+
+    # Same as ``Angle(lon).wrap_at(lon_0 + 180 deg)``
+    wrap = lon_0[idx] + 180
+
+    def lon_wrapped(x):
+        return np.mod(lon[y, x] - wrap, 360) - (360 - wrap)
+
+    # Gradient along the lon axis, same as ``np.gradient``
+    nx = lon.shape[-1]
+    x_lo, x_hi = np.clip(x - 1, 0, nx - 1), np.clip(x + 1, 0, nx - 1)
+    grad_lon = (lon_wrapped(x_hi) - lon_wrapped(x_lo)) / np.where((x == 0) | (x == nx - 1), 1., 2.)
+
+    lon_diff = np.abs((lon_wrapped(x) - lon_0[idx]) / grad_lon)
+    with np.errstate(invalid='ignore'):
+        lon_val = np.where(lon_diff < 1, 1 - lon_diff, 0)
+
+    return idx, np.ravel_multi_index((y, x), lon.shape), lon_val * lat_val
+
+
+def _evaluate_gaussians(lon, lat, lon_0, lat_0, sigma):
+    """`~gammapy.image.models.SkyGaussian` values for many sources, in ``sr-1``.
+
+    All angles in deg, returns an array of shape ``(n_sources, lon.size)``.
+    """
+    # Separation from the chord length between the unit vectors
+    chord = 2 - 2 * np.dot(_unit_vectors(lon_0, lat_0), _unit_vectors(lon.ravel(), lat.ravel()).T)
+    sep = 2 * np.arcsin(0.5 * np.sqrt(np.clip(chord, 0, 4)))
+
+    sigma = np.radians(sigma)[:, np.newaxis]
+    norm = 1 / (2 * np.pi * sigma ** 2)
+    return norm * np.exp(-0.5 * (sep / sigma) ** 2)
+
+
+def _unit_vectors(lon, lat):
+    """Unit vectors for angles in deg, shape ``(n, 3)``."""
+    lon, lat = np.radians(lon), np.radians(lat)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
 
 class MapEvaluator(object):
     """Sky model evaluation on maps.
@@ -381,6 +671,11 @@ class MapEvaluator(object):
         de = de[:, np.newaxis, np.newaxis]
         return omega * de
 
+    @lazyproperty
+    def _solid_angle_numeric(self):
+        """Solid angle per pixel in ``deg2`` (`~numpy.ndarray`)."""
+        return self.solid_angle.to('deg2').value
+
     def compute_dnde(self):
         """Compute model differential flux at map pixel centers.
 
@@ -397,21 +692,23 @@ class MapEvaluator(object):
     def compute_flux(self):
         """Compute model integral flux over map pixel volumes.
 
-        For now, we simply multiply dnde with bin volume.
+        The model is integrated over the energy bins, see
+        `~gammapy.cube.models.SkyModel.evaluate_integral`, and multiplied
+        with the pixel solid angle.
         """
-        dnde = self.compute_dnde()
-        volume = self.bin_volume
-        flux = dnde * volume
-        return flux.to('cm-2 s-1')
+        emin, emax = self.energy_edges[:-1], self.energy_edges[1:]
+        flux = self.sky_model.evaluate_integral(self.lon, self.lat, emin, emax)
+        flux = flux.value * self._solid_angle_numeric
+        return u.Quantity(flux, 'cm-2 s-1', copy=False)
 
     def apply_exposure(self, flux):
         """Compute npred cube
 
         For now just divide flux cube by exposure
         """
-        npred_ = (flux * self.exposure.quantity).to('')
+        scale = (flux.unit * self.exposure.unit).to('')
         npred = Map.from_geom(self.geom, unit='')
-        npred.data = npred_.value
+        npred.data = flux.value * self.exposure.data * scale
         return npred
 
     def apply_psf(self, npred):
@@ -145,3 +145,34 @@ def test_cube_fit(sky_model, counts, exposure, psf, background, edisp):
     stat = np.sum(fit.stat, dtype='float64')
     stat_expected = 3840.0605649268496
     assert_allclose(stat, stat_expected, rtol=1e-2)
+
+
+def test_cube_fit_likelihood_profile(sky_model, geom, background):
+    exposure = Map.from_geom(geom, unit='m2 s')
+    exposure.data += 1e9
+    evaluator = MapEvaluator(sky_model=sky_model, exposure=exposure, background=background)
+    counts = WcsNDMap(geom, evaluator.compute_npred())
+
+    fit = MapFit(model=sky_model, counts=counts, exposure=exposure, background=background)
+    pars = sky_model.parameters
+    values = {
+        'index': np.linspace(2.8, 3.2, 11),
+        'amplitude': np.linspace(0.9, 1.1, 5) * 1e-11,
+    }
+    profile = fit.likelihood_profile(values)
+
+    # The counts are the predicted counts, so the minimum is at the true values
+    assert profile['stat'].shape == (11, 5)
+    idx = np.unravel_index(np.argmin(profile['stat']), (11, 5))
+    assert idx == (5, 2)
+    assert_allclose(profile['index'][:, 0], values['index'])
+    assert_allclose(profile['lon_0'], 0.2)
+
+    # The model parameters are restored
+    assert fit.model.parameters is pars
+    assert_allclose(pars['index'].value, 3)
+    assert_allclose(pars['amplitude'].value, 1e-11)
+    assert_allclose(fit.total_stat(pars), profile['stat'][idx])
+
+    profile_pool = fit.likelihood_profile(values, n_jobs=2)
+    assert_allclose(profile_pool['stat'], profile['stat'])
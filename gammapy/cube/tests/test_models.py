@@ -8,13 +8,15 @@ from ...utils.testing import requires_dependency
 from ...maps import MapAxis, WcsGeom, Map
 from ...irf.energy_dispersion import EnergyDispersion
 from ...cube.psf_kernel import PSFKernel
-from ...image.models import SkyGaussian
-from ...spectrum.models import PowerLaw
+from astropy.table import Table
+from ...image.models import SkyGaussian, SkyPointSource, SkyDisk, SkyDiffuseConstant
+from ...spectrum.models import PowerLaw, ExponentialCutoffPowerLaw
 from ..models import (
     SkyModel,
     SourceLibrary,
     CompoundSkyModel,
     SumSkyModel,
+    PopulationSkyModel,
     MapEvaluator,
 )
 
@@ -127,6 +129,49 @@ class TestSkyModel:
         assert_allclose(q.value, 1.76838826e-13)
 
 
+def test_sky_model_evaluate_units():
+    # Dimensionless spectral model with the flux unit in the spatial model
+    spatial_model = SkyDiffuseConstant(value='1e-11 cm-2 s-1 TeV-1 deg-2')
+    spectral_model = PowerLaw(index=2, amplitude='2', reference='1 TeV')
+    model = SkyModel(spatial_model, spectral_model)
+
+    q = model.evaluate(3 * u.deg, 4 * u.deg, [1, 2] * u.TeV)
+    assert q.unit == 'cm-2 s-1 TeV-1 deg-2'
+    assert_allclose(q.value.squeeze(), [2e-11, 5e-12])
+
+    # Spectral model in non-default flux units
+    spatial_model = SkyGaussian(lon_0='3 deg', lat_0='4 deg', sigma='3 deg')
+    spectral_model = PowerLaw(index=2, amplitude='1e-10 m-2 s-1 GeV-1', reference='1 TeV')
+    q = SkyModel(spatial_model, spectral_model).evaluate(3 * u.deg, 4 * u.deg, 1 * u.TeV)
+    assert_allclose(q.value, 1.76838826e-13)
+
+
+def test_sky_model_evaluate_integral_units():
+    # Dimensionless spectral model with the flux unit in the spatial model
+    spatial_model = SkyDiffuseConstant(value='1e-11 cm-2 s-1 TeV-1 deg-2')
+    spectral_model = PowerLaw(index=2, amplitude='2', reference='1 TeV')
+    model = SkyModel(spatial_model, spectral_model)
+
+    q = model.evaluate_integral(3 * u.deg, 4 * u.deg, [1, 2] * u.TeV, [2, 4] * u.TeV)
+    assert q.unit == 'cm-2 s-1 deg-2'
+    assert_allclose(q.value.squeeze(), [1e-11, 5e-12], rtol=1e-6)
+
+
+def test_sky_model_spectral_unit_cache():
+    spatial_model = SkyDiffuseConstant(value='1 deg-2')
+    spectral_model = PowerLaw(index=2, amplitude='2e-11 cm-2 s-1 TeV-1', reference='1 TeV')
+    model = SkyModel(spatial_model, spectral_model)
+    q = model.evaluate(3 * u.deg, 4 * u.deg, [1, 2] * u.TeV)
+    assert_allclose(q.value.squeeze(), [2e-11, 5e-12])
+
+    # The cached spectral unit is updated if the parameter units change
+    spatial_model.parameters['value'].quantity = '1e-11 cm-2 s-1 TeV-1 deg-2'
+    spectral_model.parameters['amplitude'].quantity = '2'
+    q = model.evaluate(3 * u.deg, 4 * u.deg, [1, 2] * u.TeV)
+    assert q.unit == 'cm-2 s-1 TeV-1 deg-2'
+    assert_allclose(q.value.squeeze(), [2e-11, 5e-12])
+
+
 class TestCompoundSkyModel:
 
     @staticmethod
@@ -193,6 +238,77 @@ class TestSumSkyModel:
         assert_allclose(q.value, 3.536776513153229e-13)
 
 
+def make_population_table(n_sources, sigma=None):
+    rng = np.random.RandomState(0)
+    table = Table()
+    table['lon_0'] = rng.uniform(-1, 1, n_sources) * u.deg
+    table['lat_0'] = rng.uniform(-1, 1, n_sources) * u.deg
+    if sigma is not None:
+        table['sigma'] = sigma
+    table['index'] = rng.uniform(2, 3, n_sources)
+    table['amplitude'] = rng.uniform(1, 10, n_sources) * u.Unit('1e-12 cm-2 s-1 TeV-1')
+    table['reference'] = 1 * u.TeV
+    table['lambda_'] = rng.uniform(0.1, 1, n_sources) * u.Unit('TeV-1')
+    return table
+
+
+class TestPopulationSkyModel:
+
+    @staticmethod
+    @pytest.mark.parametrize('spatial_model_class, sigma', [
+        (SkyPointSource, None),
+        (SkyGaussian, [0.1, 0.3, 0.2] * u.deg),
+    ])
+    def test_evaluate(spatial_model_class, sigma):
+        table = make_population_table(3, sigma)
+        model = PopulationSkyModel(table, spatial_model_class, ExponentialCutoffPowerLaw)
+        assert len(model) == 3
+        assert model.parameters.names == []
+
+        sky_models = []
+        for row in table:
+            pars = {name: row[name] * (table[name].unit or 1) for name in table.colnames}
+            spatial_pars = {name: pars.pop(name) for name in ['lon_0', 'lat_0', 'sigma'] if name in pars}
+            sky_models.append(SkyModel(spatial_model_class(**spatial_pars),
+                                       ExponentialCutoffPowerLaw(**pars)))
+        sum_model = SumSkyModel(sky_models)
+
+        geom = WcsGeom.create(skydir=(0, 0), binsz=0.1, width=3, coordsys='GAL')
+        lon, lat = geom.get_coord()
+        lon, lat = lon * u.deg, lat * u.deg
+
+        energy = [1, 3] * u.TeV
+        actual = model.evaluate(lon, lat, energy)
+        desired = sum_model.evaluate(lon, lat, energy)
+        assert actual.unit == 'cm-2 s-1 TeV-1 deg-2'
+        assert actual.shape == (2, 30, 30)
+        assert_allclose(actual.value, desired.value, rtol=1e-8, atol=1e-20)
+
+        emin, emax = [0.1, 1] * u.TeV, [1, 10] * u.TeV
+        actual = model.evaluate_integral(lon, lat, emin, emax)
+        desired = sum_model.evaluate_integral(lon, lat, emin, emax)
+        assert actual.unit == 'cm-2 s-1 deg-2'
+        assert_allclose(actual.value, desired.value, rtol=1e-8, atol=1e-20)
+
+    @staticmethod
+    def test_in_sum_model(sky_model):
+        table = make_population_table(2)
+        model = PopulationSkyModel(table, SkyPointSource, ExponentialCutoffPowerLaw)
+        sum_model = SumSkyModel([sky_model, model])
+        assert sum_model.parameters.names == sky_model.parameters.names
+
+        lon = np.zeros((3, 4)) * u.deg
+        lat = np.zeros((3, 4)) * u.deg
+        q = sum_model.evaluate(lon, lat, [1, 2] * u.TeV)
+        assert q.shape == (2, 3, 4)
+
+    @staticmethod
+    def test_invalid():
+        table = make_population_table(2)
+        with pytest.raises(ValueError):
+            PopulationSkyModel(table, SkyDisk, PowerLaw)
+
+
 @requires_dependency('scipy')
 class TestSkyModelMapEvaluator:
 
@@ -248,7 +364,7 @@ class TestSkyModelMapEvaluator:
         out = evaluator.compute_flux()
         assert out.shape == (2, 4, 5)
         assert out.unit == 'cm-2 s-1'
-        assert_allclose(out.value.mean(), 1.828206748668197e-14)
+        assert_allclose(out.value.mean(), 5.5303254147212984e-14)
 
     @staticmethod
     def test_apply_psf(evaluator):
@@ -256,17 +372,17 @@ class TestSkyModelMapEvaluator:
         npred = evaluator.apply_exposure(flux)
         out = evaluator.apply_psf(npred)
         assert out.data.shape == (2, 4, 5)
-        assert_allclose(out.data.mean(), 1.2574065e-08)
+        assert_allclose(out.data.mean(), 3.8036546e-08)
 
     @staticmethod
     def test_apply_edisp(evaluator):
         flux = evaluator.compute_flux()
         out = evaluator.apply_edisp(flux.value)
         assert out.shape == (2, 4, 5)
-        assert_allclose(out.mean(), 1.828206748668197e-14)
+        assert_allclose(out.mean(), 5.5303254147212984e-14)
 
     @staticmethod
     def test_compute_npred(evaluator):
         out = evaluator.compute_npred()
         assert out.shape == (2, 4, 5)
-        assert_allclose(out.sum(), 45.02963e-07)
+        assert_allclose(out.sum(), 5.521462e-06)
@@ -8,7 +8,9 @@ from astropy.io import fits
 from astropy.table import Table
 from astropy.convolution import Gaussian2DKernel, MexicanHat2DKernel
 from ..image import SkyImage
+from ..image.utils import FFTConvolver, centered_kernel_fft
 from ..cube import SkyCube
+from ..utils.cache import LRUCache
 
 __all__ = [
     'CWT',
@@ -76,6 +78,12 @@ class CWT(object):
         If ``True``, isolated pixels will be removed.
     keep_history : boolean, optional (default False)
         Save cwt data from all the iterations.
+    parallel : boolean, optional (default False)
+        If ``True``, process the scales in parallel on a thread pool.
+    convolver : `~gammapy.image.FFTConvolver`, optional
+        Convolution executor. By default a new one is created, with
+        ``parallel`` passed on, and its worker pool is shut down at the end
+        of `analyze`. A convolver that is passed in is left open.
 
     References
     ----------
@@ -88,7 +96,9 @@ class CWT(object):
                  significance_threshold=3.0,
                  significance_island_threshold=None,
                  remove_isolated=True,
-                 keep_history=False):
+                 keep_history=False,
+                 parallel=False,
+                 convolver=None):
         self.kernels = kernels
         self.max_iter = max_iter
         self.tol = tol
@@ -96,6 +106,8 @@ class CWT(object):
         self.significance_island_threshold = significance_island_threshold
         self.remove_isolated = remove_isolated
         self.history = [] if keep_history else None
+        self.convolver = convolver
+        self._convolver = convolver or FFTConvolver(parallel=parallel)
 
         # previous_variance is initialized on the first iteration
         self.previous_variance = None
@@ -115,7 +127,9 @@ class CWT(object):
     def _transform(self, data):
         """Do the transform itself.
 
-        The transform is made by using `scipy.signal.fftconvolve`.
+        The transform is made by FFT convolution, all scales are computed
+        from a single forward FFT of the excess and total background images,
+        using the kernel FFTs cached in `~gammapy.detect.CWTKernels`.
 
         TODO: document.
 
@@ -124,7 +138,8 @@ class CWT(object):
         data : `~gammapy.detect.CWTData`
             Images for transform.
         """
-        from scipy.signal import fftconvolve
+        shape = self.kernels.fft_shape(data._counts.shape)
+        kernel_ffts = self.kernels.kernel_ffts(shape)
 
         total_background = data._model + data._background + data._approx
         excess = data._counts - total_background
@@ -132,16 +147,19 @@ class CWT(object):
         log.debug('Excess max: {0:.4f}'.format(excess.max()))
 
         log.debug('Computing transform and error')
-        for idx_scale, kern in self.kernels.kern_base.items():
-            data._transform_3d[idx_scale] = fftconvolve(excess, kern, mode='same')
-            data._error[idx_scale] = np.sqrt(fftconvolve(total_background, kern ** 2, mode='same'))
+        self._convolver.convolve_ffts(excess, kernel_ffts['base'], shape,
+                                      out=data._transform_3d)
+        self._convolver.convolve_ffts(total_background, kernel_ffts['base_squared'], shape,
+                                      out=data._error)
+        np.sqrt(data._error, out=data._error)
         log.debug('Error sum: {0:.4f}'.format(data._error.sum()))
         log.debug('Error max: {0:.4f}'.format(data._error.max()))
 
         log.debug('Computing approx and approx_bkg')
-        data._approx = fftconvolve(data._counts - data._model - data._background,
-                                   self.kernels.kern_approx, mode='same')
-        data._approx_bkg = fftconvolve(data._background, self.kernels.kern_approx, mode='same')
+        approx = [data._counts - data._model - data._background, data._background]
+        data._approx, data._approx_bkg = [
+            self._convolver.convolve_ffts(_, kernel_ffts['approx'], shape)[0] for _ in approx
+        ]
         log.debug('Approximate sum: {0:.4f}'.format(data._approx.sum()))
         log.debug('Approximate background sum: {0:.4f}'.format(data._approx_bkg.sum()))
 
@@ -278,6 +296,9 @@ class CWT(object):
             if converge_answer:
                 break
 
+        if self._convolver is not self.convolver:
+            self._convolver.close()
+
         if converge_answer:
             log.info('Convergence reached at iteration {}'.format(n_iter + 1))
         else:
@@ -356,6 +377,54 @@ class CWTKernels(object):
         max_scale = min_scale * step_scale ** n_scale
         self.kern_approx = Gaussian2DKernel(max_scale).array
 
+        self._kernel_ffts = LRUCache()
+
+    def fft_shape(self, shape):
+        """FFT shape used to convolve an image with all kernels.
+
+        Parameters
+        ----------
+        shape : tuple
+            Image shape.
+
+        Returns
+        -------
+        fft_shape : tuple
+            Padded FFT shape.
+        """
+        kernel_shapes = [_.shape for _ in self.kern_base.values()]
+        kernel_shapes.append(self.kern_approx.shape)
+        return FFTConvolver.fft_shape(shape, kernel_shapes)
+
+    def kernel_ffts(self, shape):
+        """Centred FFTs of all kernels for a given FFT shape.
+
+        The FFTs are computed on the first call and cached, so that the
+        iterations of the CWT algorithm only need the FFTs of the images.
+
+        Parameters
+        ----------
+        shape : tuple
+            FFT shape, see `fft_shape`.
+
+        Returns
+        -------
+        kernel_ffts : dict
+            Dictionary with keys {'base', 'base_squared', 'approx'} and kernel
+            FFTs stacked along the first axis as values.
+        """
+        shape = tuple(shape)
+
+        def compute():
+            kern_base = [self.kern_base[_] for _ in range(self.n_scale)]
+            return dict(
+                base=np.array([centered_kernel_fft(_, shape) for _ in kern_base]),
+                base_squared=np.array([centered_kernel_fft(_ ** 2, shape) for _ in kern_base]),
+                approx=centered_kernel_fft(self.kern_approx, shape)[np.newaxis],
+            )
+
+        return self._kernel_ffts.get(shape, compute)
+
     def _info(self):
         """Return information about the object as a dict.
 
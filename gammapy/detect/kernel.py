@@ -30,6 +30,14 @@ class KernelBackgroundEstimator(object):
 
     For flexibility the algorithm takes arbitrary source and background kernels.
 
+    Usually only a small part of the exclusion mask changes between iterations.
+    With ``incremental=True`` the convolved (excluded) counts and exclusion
+    images used for the background estimate are kept between iterations and
+    only updated in the kernel footprint of the pixels whose exclusion status
+    changed. Because the convolution is linear, this gives the same result as
+    the full re-computation, which is used for the first iteration and as a
+    fallback if a large fraction of the image changes.
+
     Parameters
     ----------
     kernel_src : `numpy.ndarray`
@@ -42,6 +50,8 @@ class KernelBackgroundEstimator(object):
         Radius by which mask is dilated with each iteration.
     keep_record : bool
         Keep record of intermediate results while the algorithm runs?
+    incremental : bool
+        Update the background estimate incrementally between iterations?
 
     See Also
     --------
@@ -52,18 +62,23 @@ class KernelBackgroundEstimator(object):
     def __init__(self, kernel_src, kernel_bkg,
                  significance_threshold=5,
                  mask_dilation_radius='0.02 deg',
-                 keep_record=False):
+                 keep_record=False,
+                 incremental=False):
 
         self.parameters = {
             'significance_threshold': significance_threshold,
             'mask_dilation_radius': Angle(mask_dilation_radius),
             'keep_record': keep_record,
+            'incremental': incremental,
         }
 
         self.kernel_src = kernel_src
         self.kernel_bkg = kernel_bkg
         self.images_stack = []
 
+        # convolved images of the last background estimate, see `_estimate_background`
+        self._background_sums = None
+
     def run(self, images, niter_min=2, niter_max=10):
         """Run iterations until mask does not change (stopping condition).
 
@@ -84,6 +99,8 @@ class KernelBackgroundEstimator(object):
         images : dict
             Sky images: background, exclusion, significance
         """
+        self._background_sums = None
+
         # initial mask, if not present
         if 'exclusion' not in images:
             exclusion = Map.from_geom(images['counts'].geom)
@@ -160,12 +177,71 @@ class KernelBackgroundEstimator(object):
         the background kernel and renormalizing the image.
         """
         from scipy.ndimage import convolve
-        vals = convolve(counts.data * exclusion.data, self.kernel_bkg, mode='constant')
-        norm = convolve(exclusion.data, self.kernel_bkg, mode='constant')
+        exclusion_data = np.asarray(exclusion.data, dtype=float)
+
+        sums = None
+        if self.parameters['incremental']:
+            sums = self._update_background_sums(counts.data, exclusion_data)
+
+        if sums is None:
+            vals = convolve(counts.data * exclusion_data, self.kernel_bkg, mode='constant')
+            norm = convolve(exclusion_data, self.kernel_bkg, mode='constant')
+        else:
+            vals, norm = sums
+
+        if self.parameters['incremental']:
+            self._background_sums = {
+                'counts': counts.data,
+                'exclusion': exclusion_data.copy(),
+                'vals': vals,
+                'norm': norm,
+            }
+
         bkg = Map.from_geom(counts.geom)
         bkg.data = vals / norm
         return bkg
 
+    def _update_background_sums(self, counts, exclusion):
+        """Update convolved images of the last background estimate.
+
+        The change of the exclusion mask is split into connected regions and
+        the convolution of each region is added in its kernel footprint only.
+
+        Returns ``None`` if no previous estimate for the same counts image
+        is available, or if the footprints cover more than the whole image
+        and a full re-computation is cheaper.
+        """
+        from scipy.ndimage import convolve, label, find_objects
+        sums = self._background_sums
+
+        if sums is None or sums['counts'] is not counts:
+            return None
+
+        vals, norm = sums['vals'].copy(), sums['norm'].copy()
+
+        delta = exclusion - sums['exclusion']
+        labels, _ = label(delta != 0, structure=np.ones((3, 3)))
+        regions = find_objects(labels)
+
+        windows = []
+        for slices in regions:
+            windows.append(tuple(
+                slice(max(_.start - size, 0), _.stop + size)
+                for _, size in zip(slices, self.kernel_bkg.shape)
+            ))
+
+        if sum(labels[_].size for _ in windows) > labels.size:
+            log.debug('Exclusion mask changed in large area, full background re-computation.')
+            return None
+
+        for label_idx, window in enumerate(windows):
+            delta_region = np.where(labels[window] == label_idx + 1, delta[window], 0)
+            norm[window] += convolve(delta_region, self.kernel_bkg, mode='constant')
+            vals[window] += convolve(counts[window] * delta_region, self.kernel_bkg, mode='constant')
+
+        log.debug('Updated background in {} regions.'.format(len(windows)))
+        return vals, norm
+
     @staticmethod
     def _is_converged(result, result_previous):
         """Check convergence.
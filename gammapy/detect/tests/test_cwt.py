@@ -1,11 +1,12 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import pytest
 import numpy as np
 from numpy.testing import assert_allclose, assert_equal
 from ...utils.testing import requires_dependency, requires_data
 from ...detect import CWT, CWTKernels, CWTData
 from ...datasets import load_poisson_stats_image
-from ...image import SkyImage
+from ...image import SkyImage, FFTConvolver
 
 
 @requires_dependency('scipy')
@@ -122,6 +123,55 @@ class TestCWT:
         assert_allclose(transform_2d.sum(), 9.91731463861)
 
 
+@requires_dependency('scipy')
+@pytest.mark.parametrize('parallel', [False, True])
+def test_cwt_transform_fftconvolve(parallel):
+    from scipy.signal import fftconvolve
+
+    counts = SkyImage.empty(nxpix=60, nypix=50, binsz=0.02)
+    counts.data = np.random.RandomState(0).poisson(2, counts.data.shape).astype(float)
+    background = SkyImage.empty(nxpix=60, nypix=50, binsz=0.02, fill=2.)
+
+    kernels = CWTKernels(n_scale=2, min_scale=2.0, step_scale=2.6)
+    cwt = CWT(kernels=kernels, parallel=parallel)
+    cwt_data = CWTData(counts=counts, background=background, n_scale=2)
+    cwt._transform(data=cwt_data)
+
+    excess = counts.data - background.data
+    for idx_scale, kern in kernels.kern_base.items():
+        desired = fftconvolve(excess, kern, mode='same')
+        assert_allclose(cwt_data._transform_3d[idx_scale], desired, atol=1e-12)
+        desired = np.sqrt(fftconvolve(background.data, kern ** 2, mode='same'))
+        assert_allclose(cwt_data._error[idx_scale], desired, rtol=1e-8)
+
+    desired = fftconvolve(background.data, kernels.kern_approx, mode='same')
+    assert_allclose(cwt_data._approx_bkg, desired, rtol=1e-8)
+
+    # kernel FFTs are only computed once per FFT shape
+    assert len(kernels._kernel_ffts) == 1
+
+
+@requires_dependency('scipy')
+def test_cwt_analyze_convolver():
+    counts = SkyImage.empty(nxpix=60, nypix=50, binsz=0.02)
+    counts.data = np.random.RandomState(0).poisson(2, counts.data.shape).astype(float)
+    background = SkyImage.empty(nxpix=60, nypix=50, binsz=0.02, fill=2.)
+    kernels = CWTKernels(n_scale=2, min_scale=2.0, step_scale=2.6)
+
+    # A convolver that is passed in is left open for the caller
+    convolver = FFTConvolver(parallel=True)
+    cwt = CWT(kernels=kernels, max_iter=2, convolver=convolver)
+    cwt.analyze(CWTData(counts=counts, background=background, n_scale=2))
+    assert convolver._pool is not None
+
+    data = CWTData(counts=counts, background=background, n_scale=2)
+    CWT(kernels=kernels, max_iter=2).analyze(data)
+    cwt_data = CWTData(counts=counts, background=background, n_scale=2)
+    cwt.analyze(cwt_data)
+    assert_allclose(cwt_data.model.data, data.model.data)
+    convolver.close()
+
+
 @requires_dependency('scipy')
 @requires_data('gammapy-extra')
 class TestCWTKernels:
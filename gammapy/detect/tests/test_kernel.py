@@ -66,3 +66,31 @@ def test_run(kbe, images):
     assert_allclose(mask.sum(), 89)
     assert_allclose(background, 42 * np.ones((10, 10)))
     assert len(kbe.images_stack) == 4
+
+
+def test_run_incremental():
+    counts = Map.create(npix=80, binsz=0.1)
+    counts.data = np.random.RandomState(0).poisson(10, counts.data.shape).astype(float)
+    counts.data[20:23, 30:33] += 200
+    counts.data[60:62, 50:52] += 100
+    exclusion = Map.from_geom(counts.geom)
+    exclusion.data += 1
+
+    results = []
+    for incremental in [False, True]:
+        kbe = KernelBackgroundEstimator(
+            kernel_src=np.ones((3, 3)),
+            kernel_bkg=np.ones((15, 15)),
+            significance_threshold=4,
+            mask_dilation_radius='0.1 deg',
+            keep_record=True,
+            incremental=incremental,
+        )
+        results.append(kbe.run({'counts': counts, 'exclusion': exclusion}))
+        assert len(kbe.images_stack) > 2
+
+    full, incremental = results
+    assert_allclose(incremental['exclusion'].data, full['exclusion'].data)
+    assert_allclose(incremental['background'].data, full['background'].data, rtol=1e-10)
+    assert_allclose(incremental['significance'].data, full['significance'].data, rtol=1e-10)
+    assert (full['exclusion'].data == 0).sum() > 0
@@ -8,7 +8,7 @@ import numpy as np
 from astropy.coordinates import Angle
 from astropy.convolution import Gaussian2DKernel, Tophat2DKernel
 from ..stats import significance
-from .utils import scale_cube
+from .utils import scale_cube, FFTConvolver
 
 __all__ = ['ASmooth']
 
@@ -38,12 +38,24 @@ class ASmooth(object):
         Significance threshold.
     scales : `~astropy.units.Quantity`
         Smoothing scales.
+    convolver : `~gammapy.image.FFTConvolver`, optional
+        Convolution executor. Pass a shared instance to re-use the worker pool
+        and the cached kernel FFTs between calls to `run`. By default a new
+        convolver is created for each call to `run`.
+    streaming : bool
+        Walk the scales from small to large instead of building the full
+        scale cubes. Pixels that reached the significance threshold are dropped
+        and the results are written directly to the output images, so that
+        only a few image buffers are needed, independent of the number of
+        scales. The results are identical to the default mode.
     """
 
     def __init__(self, kernel=Gaussian2DKernel, method='simple', threshold=5,
-                 scales=None):
+                 scales=None, convolver=None, streaming=False):
         self.parameters = OrderedDict(kernel=kernel, method=method,
                                       threshold=threshold, scales=scales)
+        self.convolver = convolver
+        self.streaming = streaming
 
     def kernels(self, pixel_scale):
         """
@@ -113,22 +125,32 @@ class ASmooth(object):
         pixel_scale = counts.geom.pixel_scales.mean()
         kernels = self.kernels(pixel_scale)
 
-        cubes = {}
-        cubes['counts'] = scale_cube(counts.data, kernels)
-
-        if background is not None:
-            cubes['background'] = scale_cube(background.data, kernels)
-        else:
+        if background is None:
             # TODO: Estimate background with asmooth method
             raise ValueError('Background estimation required.')
 
+        convolver = self.convolver or FFTConvolver()
+
+        images = OrderedDict()
+        images['counts'] = counts.data
+        images['background'] = background.data
+
         if exposure is not None:
             flux = (counts.data - background.data) / exposure.data
-            cubes['flux'] = scale_cube(flux, kernels)
+            images['flux'] = flux
 
-        cubes['significance'] = self._significance_cube(cubes, method=self.parameters['method'])
+        if self.streaming:
+            smoothed = self._smooth_streaming(images, kernels, convolver)
+        else:
+            cubes = {}
+            for key, data in images.items():
+                cubes[key] = scale_cube(data, kernels, convolver=convolver)
+
+            cubes['significance'] = self._significance_cube(cubes, method=self.parameters['method'])
+            smoothed = self._reduce_cubes(cubes, kernels)
 
-        smoothed = self._reduce_cubes(cubes, kernels)
+        if convolver is not self.convolver:
+            convolver.close()
 
         result = {}
 
@@ -185,6 +207,63 @@ class ASmooth(object):
 
         return smoothed
 
+    def _smooth_streaming(self, images, kernels, convolver):
+        """
+        Smooth images scale by scale, without building scale cubes.
+
+        Parameters
+        ----------
+        images : dict
+            Input data arrays.
+        kernels : list
+            Kernels, ordered from small to large scale.
+        convolver : `~gammapy.image.FFTConvolver`
+            Convolution executor.
+        """
+        p = self.parameters
+        images = {key: np.asarray(data, dtype=float) for key, data in images.items()}
+        shape = images['counts'].shape
+        smoothed = {}
+
+        # Init smoothed data arrays
+        for key in ['counts', 'background', 'scale', 'significance', 'flux']:
+            smoothed[key] = np.tile(np.nan, shape)
+
+        # one forward FFT per input image, re-used for all scales
+        ffts = {key: convolver.data_fft(data, kernels) for key, data in images.items()}
+
+        remaining = np.ones(shape, dtype=bool)
+
+        for scale, kernel in zip(p['scales'], kernels):
+            convolved = {}
+            for key in ['counts', 'background']:
+                data_fft, fft_shape = ffts[key]
+                data = convolver.convolve_kernel(kernel, images[key], data_fft, fft_shape)
+                convolved[key] = data[remaining]
+
+            significance = self._significance_cube(convolved, method=p['method'])
+            mask = significance > p['threshold']
+
+            idx = tuple(_[mask] for _ in np.nonzero(remaining))
+            smoothed['scale'][idx] = scale
+            smoothed['significance'][idx] = significance[mask]
+
+            # renormalize smoothed data arrays
+            norm = kernel.array.sum()
+            for key in ['counts', 'background']:
+                smoothed[key][idx] = convolved[key][mask] / norm
+
+            if 'flux' in images:
+                data_fft, fft_shape = ffts['flux']
+                data = convolver.convolve_kernel(kernel, images['flux'], data_fft, fft_shape)
+                smoothed['flux'][idx] = data[idx] / norm
+
+            remaining[idx] = False
+            if not remaining.any():
+                break
+
+        return smoothed
+
     @staticmethod
     def make_scales(n_scales, factor=np.sqrt(2), kernel=Gaussian2DKernel):
         """Create list of Gaussian widths."""
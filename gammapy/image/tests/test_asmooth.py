@@ -1,9 +1,10 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import pytest
 import numpy as np
 from numpy.testing import assert_allclose
 import astropy.units as u
-from astropy.convolution import Gaussian2DKernel
+from astropy.convolution import Gaussian2DKernel, Tophat2DKernel
 from ...utils.testing import requires_data, requires_dependency
 from ...utils.scripts import make_path
 from ...maps import Map
@@ -38,3 +39,31 @@ def test_asmooth():
     for name in smoothed:
         actual = smoothed[name].data[100, 100]
         assert_allclose(actual, desired[name])
+
+
+@requires_dependency('scipy')
+@pytest.mark.parametrize('kernel', [Gaussian2DKernel, Tophat2DKernel])
+def test_asmooth_streaming(kernel):
+    counts = Map.create(npix=60, binsz=0.02)
+    background = counts.copy()
+    exposure = counts.copy()
+
+    counts.data = np.random.RandomState(0).poisson(1, counts.data.shape).astype(float)
+    counts.data[25:30, 25:30] += 5
+    background.data += 1
+    exposure.data += 1e10
+
+    scales = ASmooth.make_scales(6, kernel=kernel) * 0.1 * u.deg
+
+    results = []
+    for streaming in [False, True]:
+        asmooth = ASmooth(kernel=kernel, scales=scales, method='lima',
+                          threshold=3, streaming=streaming)
+        results.append(asmooth.run(counts, background, exposure))
+
+    desired, actual = results
+    assert set(actual) == set(desired)
+    for name in desired:
+        assert_allclose(actual[name].data, desired[name].data, rtol=1e-10)
+
+    assert np.isfinite(actual['scale'].data).sum() > 0
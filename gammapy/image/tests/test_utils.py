@@ -0,0 +1,44 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
+from numpy.testing import assert_allclose
+from astropy.convolution import Gaussian2DKernel, Ring2DKernel, Tophat2DKernel
+from ...utils.testing import requires_dependency
+from ..utils import FFTConvolver, scale_cube
+
+
+@requires_dependency('scipy')
+def test_fft_convolver():
+    from scipy.signal import fftconvolve
+
+    data = np.random.RandomState(0).poisson(2, (40, 51)).astype(float)
+    kernels = [Tophat2DKernel(2), Ring2DKernel(3, 2), np.ones((4, 6))]
+
+    with FFTConvolver() as convolver:
+        result = convolver.convolve(data, kernels)
+        assert len(convolver._kernel_fft_cache) == 3
+
+        # kernel FFTs are re-used for another image with the same shape
+        convolver.convolve(2 * data, kernels)
+        assert len(convolver._kernel_fft_cache) == 3
+
+    for actual, kernel in zip(result, kernels):
+        desired = fftconvolve(data, getattr(kernel, 'array', kernel), mode='same')
+        assert actual.shape == data.shape
+        assert_allclose(actual, desired, atol=1e-10)
+
+
+@requires_dependency('scipy')
+def test_scale_cube():
+    data = np.zeros((30, 30))
+    data[15, 15] = 1
+    kernels = [Gaussian2DKernel(1), Tophat2DKernel(3)]
+
+    actual = scale_cube(data, kernels, parallel=False)
+    assert actual.shape == (30, 30, 2)
+    assert_allclose(actual[15, 15, 0], kernels[0].array.max(), rtol=1e-2)
+    assert_allclose(actual[:, :, 1].sum(), kernels[1].array.sum())
+
+    with FFTConvolver(parallel=False) as convolver:
+        cube = scale_cube(data, kernels, convolver=convolver)
+    assert_allclose(cube, actual)
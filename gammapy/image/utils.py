@@ -2,33 +2,312 @@
 """Image utility functions"""
 from __future__ import absolute_import, division, print_function, unicode_literals
 import logging
-from multiprocessing import Pool
 from functools import partial
 import numpy as np
 from astropy.convolution import Gaussian2DKernel
+from ..utils.cache import LRUCache, array_key
 
 __all__ = [
+    'centered_kernel_fft',
+    'FFTConvolver',
     'scale_cube',
 ]
 
 log = logging.getLogger(__name__)
 
 
-def _fftconvolve_wrap(kernel, data):
-    from scipy.signal import fftconvolve
-    from scipy.ndimage.filters import gaussian_filter
+def _kernel_array(kernel):
+    """Kernel array for `~astropy.convolution.Kernel` or `~numpy.ndarray` input."""
+    return np.asarray(getattr(kernel, 'array', kernel), dtype=float)
 
-    # wrap gaussian filter as a special case, because the gain in
-    # performance is factor ~100
-    if isinstance(kernel, Gaussian2DKernel):
-        width = kernel.model.x_stddev.value
-        norm = kernel.array.sum()
-        return norm * gaussian_filter(data, width)
-    else:
-        return fftconvolve(data, kernel.array, mode='same')
 
+class FFTConvolver(object):
+    """Reusable executor to convolve an image with a list of kernels.
+
+    Compared to calling `~scipy.signal.fftconvolve` once per kernel, the
+    forward FFT of the data is computed only once per call to `convolve`,
+    the FFTs of the kernels are cached (keyed by padded FFT shape and kernel
+    content) and the worker pool is kept alive between calls. Repeated calls
+    with the same kernels, e.g. for the counts, background and exposure images
+    of an estimator, thus only pay for one forward FFT and one inverse FFT per
+    kernel.
+
+    `~astropy.convolution.Gaussian2DKernel` kernels are handled as a special
+    case with `~scipy.ndimage.gaussian_filter`, which is about a factor 100
+    faster than the FFT convolution.
+
+    The workers are threads, so the data and the cached kernel FFTs are shared
+    between them and never copied.
+
+    Parameters
+    ----------
+    parallel : bool
+        Whether to distribute the kernels over a thread pool.
+    n_jobs : int, optional
+        Number of worker threads. Default is the number of CPUs.
+
+    Examples
+    --------
+    The convolver can be shared between estimators and runs, so that the
+    kernel FFTs are only computed once::
 
-def scale_cube(data, kernels, parallel=True):
+        from gammapy.image import FFTConvolver, ASmooth
+
+        with FFTConvolver() as convolver:
+            asmooth = ASmooth(scales=scales, convolver=convolver)
+            for counts, background in images:
+                result = asmooth.run(counts, background)
+    """
+
+    def __init__(self, parallel=True, n_jobs=None):
+        self.parallel = parallel
+        self.n_jobs = n_jobs
+        self._pool = None
+        self._kernel_fft_cache = LRUCache()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    @property
+    def pool(self):
+        """Worker thread pool (`~multiprocessing.pool.ThreadPool`), created on first use."""
+        if self._pool is None:
+            from multiprocessing.pool import ThreadPool
+            self._pool = ThreadPool(self.n_jobs)
+        return self._pool
+
+    def close(self):
+        """Shut down the worker pool.
+
+        The kernel FFT cache is kept, the pool is re-created if needed.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def clear_cache(self):
+        """Clear kernel FFT cache."""
+        self._kernel_fft_cache.clear()
+
+    @staticmethod
+    def fft_shape(data_shape, kernel_shapes):
+        """Padded FFT shape for linear convolution of the data with all kernels.
+
+        Parameters
+        ----------
+        data_shape : tuple
+            Data shape.
+        kernel_shapes : list of tuple
+            Kernel shapes.
+
+        Returns
+        -------
+        shape : tuple
+            FFT shape, large enough to avoid wrap-around for the largest kernel.
+        """
+        from scipy.fftpack import next_fast_len
+        max_shape = np.max(np.atleast_2d(kernel_shapes), axis=0)
+        return tuple(next_fast_len(int(n + k - 1)) for n, k in zip(data_shape, max_shape))
+
+    def kernel_fft(self, kernel, shape):
+        """Centred real FFT of a kernel for a given FFT shape.
+
+        Results are cached, so that the FFT of a given kernel is only
+        computed once per FFT shape. See `centered_kernel_fft`.
+
+        Parameters
+        ----------
+        kernel : `~astropy.convolution.Kernel` or `~numpy.ndarray`
+            Convolution kernel.
+        shape : tuple
+            FFT shape.
+
+        Returns
+        -------
+        kernel_fft : `~numpy.ndarray`
+            Kernel FFT.
+        """
+        array = _kernel_array(kernel)
+        key = (tuple(shape),) + array_key(array)
+        return self._kernel_fft_cache.get(key, lambda: centered_kernel_fft(array, shape))
+
+    def map(self, func, iterable):
+        """Apply function to all items, using the worker pool if ``parallel`` is set.
+
+        Parameters
+        ----------
+        func : callable
+            Function to apply.
+        iterable : iterable
+            Items to apply the function to.
+
+        Returns
+        -------
+        result : list
+            List of results.
+        """
+        iterable = list(iterable)
+        if self.parallel and len(iterable) > 1:
+            return self.pool.map(func, iterable)
+        else:
+            return [func(_) for _ in iterable]
+
+    def data_fft(self, data, kernels):
+        """Forward FFT of the data, padded for the convolution with all kernels.
+
+        Parameters
+        ----------
+        data : `~numpy.ndarray`
+            Input data.
+        kernels : list of `~astropy.convolution.Kernel` or `~numpy.ndarray`
+            List of convolution kernels.
+
+        Returns
+        -------
+        data_fft, shape : `~numpy.ndarray`, tuple
+            Data FFT and FFT shape. Both are ``None`` if all kernels are
+            `~astropy.convolution.Gaussian2DKernel`, which don't need an FFT.
+        """
+        kernel_shapes = [_kernel_array(_).shape for _ in kernels
+                         if not isinstance(_, Gaussian2DKernel)]
+        if not kernel_shapes:
+            return None, None
+
+        shape = self.fft_shape(np.shape(data), kernel_shapes)
+        return np.fft.rfftn(np.asarray(data, dtype=float), shape), shape
+
+    def convolve(self, data, kernels):
+        """Convolve data with a list of kernels.
+
+        The output has the same shape as the data, as for
+        ``scipy.signal.fftconvolve(data, kernel, mode='same')``.
+
+        Parameters
+        ----------
+        data : `~numpy.ndarray`
+            Input data.
+        kernels : list of `~astropy.convolution.Kernel` or `~numpy.ndarray`
+            List of convolution kernels.
+
+        Returns
+        -------
+        result : list of `~numpy.ndarray`
+            Convolved data, one array per kernel.
+        """
+        data = np.asarray(data, dtype=float)
+        data_fft, shape = self.data_fft(data, kernels)
+        wrap = partial(self.convolve_kernel, data=data, data_fft=data_fft, shape=shape)
+        return self.map(wrap, kernels)
+
+    def convolve_kernel(self, kernel, data, data_fft=None, shape=None):
+        """Convolve data with a single kernel.
+
+        Parameters
+        ----------
+        kernel : `~astropy.convolution.Kernel` or `~numpy.ndarray`
+            Convolution kernel.
+        data : `~numpy.ndarray`
+            Input data.
+        data_fft, shape : `~numpy.ndarray`, tuple, optional
+            Data FFT and FFT shape as returned by `data_fft`, to re-use
+            the forward FFT of the data for several kernels.
+
+        Returns
+        -------
+        result : `~numpy.ndarray`
+            Convolved data.
+        """
+        from scipy.ndimage.filters import gaussian_filter
+
+        # wrap gaussian filter as a special case, because the gain in
+        # performance is factor ~100
+        if isinstance(kernel, Gaussian2DKernel):
+            width = kernel.model.x_stddev.value
+            norm = kernel.array.sum()
+            return norm * gaussian_filter(data, width)
+
+        if data_fft is None:
+            data_fft, shape = self.data_fft(data, [kernel])
+
+        full = np.fft.irfftn(data_fft * self.kernel_fft(kernel, shape), shape)
+        return _crop(full, np.shape(data))
+
+    def convolve_ffts(self, data, kernel_ffts, shape, out=None):
+        """Convolve data with a stack of precomputed kernel FFTs.
+
+        Only one forward FFT of the data is computed, the inverse FFTs are
+        distributed over the worker pool.
+
+        Parameters
+        ----------
+        data : `~numpy.ndarray`
+            Input data.
+        kernel_ffts : `~numpy.ndarray` or list of `~numpy.ndarray`
+            Centred kernel FFTs for the given FFT shape, see `centered_kernel_fft`.
+        shape : tuple
+            FFT shape.
+        out : `~numpy.ndarray`, optional
+            Output array of shape ``(len(kernel_ffts),) + data.shape``.
+
+        Returns
+        -------
+        out : `~numpy.ndarray`
+            Convolved data, stacked along the first axis.
+        """
+        data = np.asarray(data, dtype=float)
+        if out is None:
+            out = np.empty((len(kernel_ffts),) + data.shape)
+
+        data_fft = np.fft.rfftn(data, shape)
+
+        def _convolve(idx):
+            full = np.fft.irfftn(data_fft * kernel_ffts[idx], shape)
+            out[idx] = _crop(full, data.shape)
+
+        self.map(_convolve, range(len(kernel_ffts)))
+        return out
+
+
+def centered_kernel_fft(kernel, shape):
+    """Real FFT of a kernel, zero-padded and centred on the origin.
+
+    The kernel is zero-padded to the FFT shape and rolled such that its centre
+    pixel is at index 0. The (circular) convolution of data zero-padded to the
+    same shape then gives the result of
+    ``scipy.signal.fftconvolve(data, kernel, mode='same')`` in the first
+    ``data.shape`` pixels, independent of the kernel size. This allows to
+    apply kernels of different sizes to a single data FFT.
+
+    Parameters
+    ----------
+    kernel : `~astropy.convolution.Kernel` or `~numpy.ndarray`
+        Convolution kernel.
+    shape : tuple
+        FFT shape, at least ``data.shape + kernel.shape - 1``.
+
+    Returns
+    -------
+    kernel_fft : `~numpy.ndarray`
+        Kernel FFT.
+    """
+    array = _kernel_array(kernel)
+    padded = np.zeros(shape)
+    padded[tuple(slice(0, n) for n in array.shape)] = array
+    shift = [-((n - 1) // 2) for n in array.shape]
+    padded = np.roll(padded, shift, axis=tuple(range(array.ndim)))
+    return np.fft.rfftn(padded)
+
+
+def _crop(full, shape):
+    """Cut out the first ``shape`` pixels of a circular convolution result."""
+    return full[tuple(slice(0, n) for n in shape)]
+
+
+def scale_cube(data, kernels, parallel=True, convolver=None):
     """
     Compute scale space cube.
 
@@ -42,20 +321,20 @@ def scale_cube(data, kernels, parallel=True):
     kernels: list of `~astropy.convolution.Kernel`
         List of convolution kernels.
     parallel : bool
-        Whether to use multiprocessing.
+        Whether to use a worker pool. Ignored if ``convolver`` is given.
+    convolver : `FFTConvolver`, optional
+        Convolution executor to use. Passing the same convolver to several
+        calls re-uses its worker pool and cached kernel FFTs.
 
     Returns
     -------
     cube : `~numpy.ndarray`
         Array of the shape (len(kernels), data.shape)
     """
-    wrap = partial(_fftconvolve_wrap, data=data)
-
-    if parallel:
-        pool = Pool()
-        result = pool.map(wrap, kernels)
-        pool.close()
-        pool.join()
+    if convolver is None:
+        with FFTConvolver(parallel=parallel) as convolver:
+            result = convolver.convolve(data, kernels)
     else:
-        result = map(wrap, kernels)
+        result = convolver.convolve(data, kernels)
+
     return np.dstack(result)
@@ -65,46 +65,72 @@ class IRFStacker(object):
         """
         Compute mean effective area (`~gammapy.irf.EffectiveAreaTable`).
         """
-        nbins = self.list_aeff[0].energy.nbins
-        aefft = Quantity(np.zeros(nbins), 'cm2 s')
-        livetime_tot = np.sum(self.list_livetime)
+        sums = self._stacking_sums(edisp=False)
+        stacked_data = sums['aeff_livetime'] / sums['livetime']
 
-        for i, aeff in enumerate(self.list_aeff):
-            aeff_data = aeff.evaluate_fill_nan()
-            aefft_current = aeff_data * self.list_livetime[i]
-            aefft += aefft_current
-
-        stacked_data = aefft / livetime_tot
         self.stacked_aeff = EffectiveAreaTable(
             energy_lo=self.list_aeff[0].energy.lo,
             energy_hi=self.list_aeff[0].energy.hi,
-            data=stacked_data.to('cm2')
+            data=Quantity(stacked_data, 'cm2'),
         )
 
     def stack_edisp(self):
         """
         Compute mean energy dispersion (`~gammapy.irf.EnergyDispersion`).
         """
-        reco_bins = self.list_edisp[0].e_reco.nbins
-        true_bins = self.list_edisp[0].e_true.nbins
-
-        aefft = Quantity(np.zeros(true_bins), 'cm2 s')
-        temp = np.zeros(shape=(reco_bins, true_bins))
-        aefftedisp = Quantity(temp, 'cm2 s')
-
-        for i, edisp in enumerate(self.list_edisp):
-            aeff_data = self.list_aeff[i].evaluate_fill_nan()
-            aefft_current = aeff_data * self.list_livetime[i]
-            aefft += aefft_current
-            edisp_data = edisp.pdf_in_safe_range(self.list_low_threshold[i],
-                                                 self.list_high_threshold[i])
+        sums = self._stacking_sums()
+        aefft = sums['aeff_livetime'][:, np.newaxis]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stacked_edisp = np.nan_to_num(sums['aeff_livetime_edisp'] / aefft)
 
-            aefftedisp += edisp_data.transpose() * aefft_current
-
-        stacked_edisp = np.nan_to_num(aefftedisp / aefft)
+        e_reco = self.list_edisp[0].e_reco
         self.stacked_edisp = EnergyDispersion(
             e_true_lo=self.list_edisp[0].e_true.lo,
             e_true_hi=self.list_edisp[0].e_true.hi,
-            e_reco_lo=self.list_edisp[0].e_reco.lo,
-            e_reco_hi=self.list_edisp[0].e_reco.hi,
-            data=stacked_edisp.transpose())
+            e_reco_lo=e_reco.lo,
+            e_reco_hi=e_reco.hi,
+            data=stacked_edisp,
+        )
+
+    def _stacking_sums(self, edisp=True):
+        """Sums over the IRFs, before the normalisation by livetime or exposure.
+
+        Returns a dict with the total ``livetime`` in s, the summed
+        ``aeff_livetime`` in cm2 s per true energy bin and, if ``edisp`` is
+        True, the summed ``aeff_livetime_edisp`` matrix.
+        """
+        livetime = self.list_livetime.to('s').value
+        aefft = self._aeff_array() * livetime[:, np.newaxis]
+        sums = dict(livetime=livetime.sum(), aeff_livetime=aefft.sum(axis=0))
+
+        if edisp:
+            e_reco = self.list_edisp[0].e_reco
+            lo = Quantity(self.list_low_threshold).to(e_reco.unit).value
+            hi = Quantity(self.list_high_threshold).to(e_reco.unit).value
+            safe = ((e_reco.lo.value >= lo[:, np.newaxis]) &
+                    (e_reco.hi.value <= hi[:, np.newaxis]))
+            pdf = np.array([edisp.pdf_matrix for edisp in self.list_edisp])
+            sums['aeff_livetime_edisp'] = np.einsum('jl,jlk,jk->lk', aefft, pdf, safe)
+
+        return sums
+
+    def _aeff_array(self):
+        data = np.array([aeff.data.data.to('cm2').value for aeff in self.list_aeff])
+        return _fill_nan_aeff(data)
+
+
+def _fill_nan_aeff(data):
+    """`~gammapy.irf.EffectiveAreaTable.evaluate_fill_nan` for an array of effective areas.
+
+    Parameters
+    ----------
+    data : `~numpy.ndarray`
+        Effective area values at the energy nodes, with shape (n_aeff, n_energy)
+    """
+    finite = np.isfinite(data)
+    idx = np.arange(data.shape[1])
+    first = np.argmax(finite, axis=1)[:, np.newaxis]
+    last = data.shape[1] - 1 - np.argmax(finite[:, ::-1], axis=1)[:, np.newaxis]
+    last_value = data[np.arange(len(data))[:, np.newaxis], last]
+    data = np.where(idx < first, 0, data)
+    return np.where(idx >= last, last_value, data)
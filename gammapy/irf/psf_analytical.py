@@ -235,6 +235,49 @@ class EnergyDependentMultiGaussPSF(object):
 
         return Angle(radius, 'deg')
 
+    def containment(self, energy, theta, rad_max):
+        """Containment fraction for arrays of energies, offsets and radii.
+
+        Uses the same nearest-neighbour parameter lookup as
+        ``psf_at_energy_and_theta``, evaluated for all inputs at once.
+
+        Parameters
+        ----------
+        energy : `~astropy.units.Quantity`
+            Energy
+        theta : `~astropy.coordinates.Angle`
+            Offset in the field of view
+        rad_max : `~astropy.coordinates.Angle`
+            Offset from PSF center
+
+        Returns
+        -------
+        containment : `~numpy.ndarray`
+            Containment fraction with the broadcast shape of the inputs
+        """
+        energy = Quantity(energy).to('TeV').value
+        theta = Angle(theta).to('deg').value
+        rad_max = Angle(rad_max).to('deg').value
+        energy, theta, rad_max = np.broadcast_arrays(energy, theta, rad_max)
+
+        i = np.argmin(np.abs(self.energy.value - energy[..., np.newaxis]), axis=-1)
+        j = np.argmin(np.abs(self.theta.value - theta[..., np.newaxis]), axis=-1)
+
+        # Integral of each component, see `HESSMultiGaussPSF.to_MultiGauss2D`
+        # The norms are ``scale``, ``A_2`` and ``A_3``, with ``A_1 = 1``
+        scale = self.norms[0][j, i]
+        amplitudes = [1, self.norms[1][j, i], self.norms[2][j, i]]
+
+        total_norm, total = 0, 0
+        for sigmas, amplitude in zip(self.sigmas, amplitudes):
+            sigma = sigmas[j, i]
+            norm = scale * amplitude * sigma ** 2
+            total_norm += norm
+            total += norm * (1 - np.exp(-0.5 * rad_max ** 2 / sigma ** 2))
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total_norm != 0, total / total_norm, total)
+
     def plot_containment(self, fraction=0.68, ax=None, show_safe_energy=False,
                          add_cbar=True, **kwargs):
         """
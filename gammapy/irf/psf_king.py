@@ -209,6 +209,39 @@ class PSFKing(object):
         param["gamma"] = gamma
         return param
 
+    def containment(self, energy, offset, rad_max):
+        """Containment fraction for arrays of energies, offsets and radii.
+
+        Uses the analytic integral of the King profile,
+        :math:`1 - (1 + r^2 / (2 \\gamma \\sigma^2))^{1 - \\gamma}`, with the
+        same nearest-neighbour parameter lookup as ``evaluate``.
+
+        Parameters
+        ----------
+        energy : `~astropy.units.Quantity`
+            Energy
+        offset : `~astropy.coordinates.Angle`
+            Offset in the field of view
+        rad_max : `~astropy.coordinates.Angle`
+            Offset from PSF center
+
+        Returns
+        -------
+        containment : `~numpy.ndarray`
+            Containment fraction with the broadcast shape of the inputs
+        """
+        energy = Quantity(energy).to('TeV').value
+        offset = Angle(offset).to('deg').value
+        rad_max = Angle(rad_max).to('deg').value
+        energy, offset, rad_max = np.broadcast_arrays(energy, offset, rad_max)
+
+        i = np.argmin(np.abs(self.energy.to('TeV').value - energy[..., np.newaxis]), axis=-1)
+        j = np.argmin(np.abs(self.offset.to('deg').value - offset[..., np.newaxis]), axis=-1)
+
+        sigma = self.sigma.to('deg').value[j, i]
+        gamma = self.gamma[j, i]
+        return 1 - (1 + rad_max ** 2 / (2 * gamma * sigma ** 2)) ** (1 - gamma)
+
     def to_energy_dependent_table_psf(self, theta=None, rad=None, exposure=None):
         """Convert to energy-dependent table PSF.
 
@@ -621,6 +621,53 @@ class EnergyDependentTablePSF(object):
         psf = self.table_psf_at_energy(energy)
         return psf.integral(rad_min, rad_max)
 
+    def containment(self, energy, rad_max, interp_kwargs=None):
+        """Containment fraction for arrays of energies and radii.
+
+        Equivalent to ``table_psf_at_energy(energy).integral(0 deg, rad_max)``,
+        but the piecewise linear :math:`dP / dr` is integrated for all
+        energies and radii at once, instead of setting up one `TablePSF`
+        and its splines per energy.
+
+        Parameters
+        ----------
+        energy : `~astropy.units.Quantity`
+            Energy
+        rad_max : `~astropy.coordinates.Angle`
+            Offset, broadcast against ``energy``
+        interp_kwargs : dict
+            Option for interpolation for `~scipy.interpolate.RegularGridInterpolator`
+
+        Returns
+        -------
+        containment : `~numpy.ndarray`
+            Containment fraction with the broadcast shape of ``energy`` and ``rad_max``
+        """
+        energy = Quantity(energy).to('TeV').value
+        rad_max = Angle(rad_max).to('radian').value
+        energy, rad_max = np.broadcast_arrays(energy, rad_max)
+
+        energy_unique, energy_idx = np.unique(energy, return_inverse=True)
+        psf_value = self.evaluate(Quantity(energy_unique, 'TeV'), None, interp_kwargs)
+
+        rad = self.rad.to('radian').value
+        dp_dr = 2 * np.pi * rad * psf_value.to('sr^-1').value
+
+        # Cumulative trapezoidal integral of dP / dr at the rad nodes
+        slope = np.diff(dp_dr, axis=1) / np.diff(rad)
+        cdf_nodes = np.cumsum(0.5 * (dp_dr[:, 1:] + dp_dr[:, :-1]) * np.diff(rad), axis=1)
+        cdf_nodes = np.hstack([np.zeros((len(energy_unique), 1)), cdf_nodes])
+
+        def cdf(rad_eval):
+            rad_eval = np.clip(rad_eval, 0, rad[-1])
+            idx = np.clip(np.searchsorted(rad, rad_eval, side='right') - 1, 0, len(rad) - 2)
+            dx = rad_eval - rad[idx]
+            return (cdf_nodes[energy_idx, idx] + dp_dr[energy_idx, idx] * dx +
+                    0.5 * slope[energy_idx, idx] * dx ** 2)
+
+        containment = cdf(rad_max.ravel()) - cdf(np.zeros(rad_max.size))
+        return containment.reshape(energy.shape)
+
     def info(self):
         """Print basic info"""
         print(self.__str__)
@@ -63,6 +63,21 @@ def make_test_psf(energy_bins=15, theta_bins=12):
     )
 
 
+def test_containment():
+    psf = make_test_psf()
+    energy = u.Quantity([0.3, 3, 30], 'TeV')
+    theta = u.Quantity([0, 1, 2], 'deg')
+    rad_max = u.Quantity([0.05, 0.1, 0.2], 'deg')
+
+    actual = psf.containment(energy[:, np.newaxis], theta, rad_max)
+    assert actual.shape == (3, 3)
+
+    for i, j in np.ndindex(3, 3):
+        psf_gauss = psf.psf_at_energy_and_theta(energy[i], theta[j])
+        desired = psf_gauss.containment_fraction(rad_max[j].value)
+        assert_allclose(actual[i, j], desired, rtol=1e-10)
+
+
 @requires_dependency('scipy')
 @requires_data('gammapy-extra')
 class TestEnergyDependentMultiGaussPSF:
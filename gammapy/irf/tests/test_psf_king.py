@@ -2,6 +2,8 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 import numpy as np
 import pytest
+from numpy.testing import assert_allclose
+from astropy.units import Quantity
 from astropy.coordinates import Angle
 from ...utils.testing import assert_quantity_allclose
 from ...utils.testing import requires_data
@@ -56,3 +58,20 @@ def test_psf_king_write(psf_king, tmpdir):
     assert_quantity_allclose(psf_king2.offset, psf_king.offset)
     assert_quantity_allclose(psf_king2.gamma, psf_king.gamma)
     assert_quantity_allclose(psf_king2.sigma, psf_king.sigma)
+
+
+def test_psf_king_containment():
+    energy = Quantity(np.logspace(-1, 2, 11), 'TeV')
+    offset = Angle([0, 1, 2], 'deg')
+    gamma = np.array([[2.], [3.], [4.]]) * np.ones((3, 10))
+    sigma = Angle(0.1 * np.ones((3, 10)), 'deg')
+    psf_king = PSFKing(energy[:-1], energy[1:], offset, gamma, sigma)
+
+    rad_max = Angle([0.05, 0.2, 1], 'deg')
+    actual = psf_king.containment(Quantity(1, 'TeV'), offset[:, np.newaxis], rad_max)
+    assert actual.shape == (3, 3)
+
+    table_psf = psf_king.to_energy_dependent_table_psf(theta=offset[1])
+    desired = table_psf.containment(Quantity(1, 'TeV'), rad_max)
+    assert_allclose(actual[1], desired, rtol=1e-3)
+    assert_allclose(actual[:, 0], [0.05882353, 0.0784, 0.0881821], rtol=1e-6)
@@ -73,6 +73,25 @@ def test_TablePSF():
     assert_allclose(actual, desired)
 
 
+@requires_dependency('scipy')
+def test_EnergyDependentTablePSF_containment():
+    energy = Quantity(np.logspace(-1, 2, 10), 'TeV')
+    rad = Angle(np.linspace(0, 1.5, 150), 'deg')
+    sigma = 0.05 + 0.1 / energy.value[:, np.newaxis]
+    psf_value = np.exp(-0.5 * (rad.value / sigma) ** 2) / (2 * np.pi * sigma ** 2)
+    psf = EnergyDependentTablePSF(energy, rad, psf_value=Quantity(psf_value, 'deg-2'))
+
+    energy = Quantity([0.3, 1, 30], 'TeV')
+    rad_max = Angle([0.05, 0.1, 0.3, 2], 'deg')
+    actual = psf.containment(energy[:, np.newaxis], rad_max)
+    assert actual.shape == (3, 4)
+
+    rad_min = Angle(0, 'deg')
+    desired = [[psf.integral(_, rad_min, __) for __ in rad_max] for _ in energy]
+    assert_allclose(actual, desired, rtol=1e-10)
+    assert_allclose(actual[2, 1], 0.8180402, rtol=1e-6)
+
+
 @requires_dependency('scipy')
 @requires_data('gammapy-extra')
 def test_EnergyDependentTablePSF():
@@ -4,7 +4,7 @@ import logging
 import numpy as np
 from astropy.table import Table, Column
 import astropy.units as u
-from gammapy.stats import significance_on_off
+from gammapy.stats import excess_matching_significance_on_off
 from gammapy.spectrum.models import PowerLaw
 from gammapy.spectrum.utils import CountsPredictor
 
@@ -108,30 +108,20 @@ class SensitivityEstimator(object):
 
         Notes
         -----
-        Find the number of needed gamma excess events using newtons method.
-        Defines a function `significance_on_off(x, off, alpha) - self.sigma`
-        and uses scipy.optimize.newton to find the `x` for which this function
-        is zero.
+        Find the number of needed gamma excess events for which
+        `~gammapy.stats.significance_on_off` is ``sigma``, using
+        `~gammapy.stats.excess_matching_significance_on_off`.
         """
-        from scipy.optimize import newton
+        bkg_counts = np.asanyarray(bkg_counts)
+        excess = np.zeros_like(bkg_counts)
 
-        def target_function(on, off, alpha):
-            return significance_on_off(on, off, alpha, method='lima') - self.sigma
+        # if the number of bg events is to small just return the predefined minimum
+        small = bkg_counts < 1
+        excess[small] = self.gamma_min
 
-        excess = np.zeros_like(bkg_counts)
-        for energy_bin, bg_count in enumerate(bkg_counts):
-            # if the number of bg events is to small just return the predefined minimum
-            if bg_count < 1:
-                excess[energy_bin] = self.gamma_min
-                continue
-
-            off = bg_count / self.alpha
-            # provide a proper start guess for the minimizer
-            on = bg_count + self.gamma_min
-            e = newton(target_function, x0=on, args=(off, self.alpha))
-
-            # excess is defined as the number of on events minues the number of background events
-            excess[energy_bin] = e - bg_count
+        bg_count = bkg_counts[~small]
+        off = bg_count / self.alpha
+        excess[~small] = excess_matching_significance_on_off(off, self.alpha, self.sigma)
 
         return excess
 
@@ -1,13 +1,23 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import logging
+import contextlib
+import copy
+import hashlib
+from collections import OrderedDict
+from functools import partial
+from multiprocessing import Pool
 import numpy as np
 import astropy.units as u
+from astropy.coordinates import Angle
+from astropy.utils import deprecated
 from regions import CircleSkyRegion
+from ..extern.six.moves import cPickle as pickle
 from . import PHACountsSpectrum
 from . import SpectrumObservation, SpectrumObservationList
 from ..utils.scripts import make_path
 from ..irf import PSF3D
+from ..data import HDULocation
 
 __all__ = [
     'SpectrumExtraction',
@@ -27,6 +37,16 @@ class SpectrumExtraction(object):
     sources analyzed with 'full containment' IRFs, a correction for PSF
     leakage out of the circular ON region can be applied.
 
+    The IRF reduction (effective area, energy dispersion and containment
+    correction) is done once for all observations that have the same IRFs
+    and offset. Observations from a data store are grouped by the file and
+    HDU their IRFs are stored in, other observations by the IRF content.
+    The IRF loading and reduction as well as the counts extraction can be
+    distributed over ``n_jobs`` processes. With
+    ``offset_binsize``, the IRFs are reduced at the offset rounded to a
+    multiple of the bin size, so that observations with similar offsets
+    share the reduction.
+
     For more info see :ref:`spectral_fitting`.
 
     For a usage example see :gp-extra-notebook:`spectrum_analysis`
@@ -50,6 +70,11 @@ class SpectrumExtraction(object):
     use_recommended_erange : bool
         Extract spectrum only within the recommended valid energy range of the
         effective area table (default is True).
+    n_jobs : int
+        Number of processes used for the IRF reduction and counts extraction.
+    offset_binsize : `~astropy.coordinates.Angle`, optional
+        Offset bin size for the IRF reduction, default is to use the exact
+        offset of each observation.
     """
     DEFAULT_TRUE_ENERGY = np.logspace(-2, 2.5, 109) * u.TeV
     """True energy axis to be used if not specified otherwise"""
@@ -57,7 +82,8 @@ class SpectrumExtraction(object):
     """Reconstruced energy axis to be used if not specified otherwise"""
 
     def __init__(self, obs_list, bkg_estimate, e_reco=None, e_true=None,
-                 containment_correction=False, max_alpha=1, use_recommended_erange=True):
+                 containment_correction=False, max_alpha=1, use_recommended_erange=True,
+                 n_jobs=1, offset_binsize=None):
 
         self.obs_list = obs_list
         self.bkg_estimate = bkg_estimate
@@ -66,22 +92,57 @@ class SpectrumExtraction(object):
         self.containment_correction = containment_correction
         self.max_alpha = max_alpha
         self.use_recommended_erange = use_recommended_erange
+        self.n_jobs = n_jobs
+        self.offset_binsize = offset_binsize
         self.observations = SpectrumObservationList()
 
         self.containment = None
-        self._on_vector = None
-        self._off_vector = None
-        self._aeff = None
-        self._edisp = None
 
     def run(self):
         """Run all steps.
         """
         log.info('Running {}'.format(self))
-        for obs, bkg in zip(self.obs_list, self.bkg_estimate):
-            if not self._alpha_ok(obs, bkg):
-                continue
-            self.observations.append(self.process(obs, bkg))
+        jobs = [(obs, bkg) for obs, bkg in zip(self.obs_list, self.bkg_estimate)
+                if self._alpha_ok(obs, bkg)]
+
+        # Reduce IRFs once per group of observations with same IRFs and offset,
+        # the IRFs of one observation per group are loaded in the processes
+        groups, keys = OrderedDict(), []
+        for obs, bkg in jobs:
+            irf_job = self._irf_job(obs, bkg)
+            keys.append(_irf_key(*irf_job))
+            groups.setdefault(keys[-1], irf_job)
+
+        counts_jobs = [_counts_job(obs, bkg) for obs, bkg in jobs]
+
+        reduce_irfs = partial(
+            _reduce_irfs,
+            e_reco=self.e_reco,
+            e_true=self.e_true,
+        )
+        extract_counts = partial(_extract_counts, e_reco=self.e_reco)
+
+        log.info('Reducing IRFs for {} observations in {} groups'.format(
+            len(jobs), len(groups)))
+        if self.n_jobs > 1:
+            with contextlib.closing(Pool(processes=self.n_jobs)) as pool:
+                results = pool.map(reduce_irfs, groups.values())
+                counts = pool.map(extract_counts, counts_jobs)
+        else:
+            results = [reduce_irfs(irf_job) for irf_job in groups.values()]
+            counts = [extract_counts(counts_job) for counts_job in counts_jobs]
+
+        irfs_groups = dict(zip(groups.keys(), results))
+
+        used = set()
+        for (obs, bkg), key, (on_vector, off_vector) in zip(jobs, keys, counts):
+            irfs = irfs_groups[key]
+            if key in used:
+                irfs = copy.deepcopy(irfs)
+            used.add(key)
+
+            self.observations.append(
+                self._make_observation(obs, on_vector, off_vector, irfs))
 
     def _alpha_ok(self, obs, bkg):
         """Check if observation fulfills alpha criterion"""
@@ -93,47 +154,70 @@ class SpectrumExtraction(object):
         else:
             return True
 
+    def _irf_job(self, obs, bkg):
+        """Arguments of `_reduce_irfs` for one observation.
+
+        The IRFs are given by their `~gammapy.data.HDULocation` if the
+        observation is from a data store, so that they are loaded by
+        `_reduce_irfs` and only once per group.
+        """
+        offset = obs.pointing_radec.separation(bkg.on_region.center)
+        if self.offset_binsize is not None:
+            offset_binsize = Angle(self.offset_binsize)
+            offset = np.round((offset / offset_binsize).to('').value) * offset_binsize
+
+        psf, radius = None, None
+        if self.containment_correction:
+            if not isinstance(bkg.on_region, CircleSkyRegion):
+                raise TypeError("Incorrect region type for containment correction."
+                                " Should be CircleSkyRegion.")
+            psf, radius = _irf_source(obs, 'psf'), bkg.on_region.radius
+
+        aeff, edisp = _irf_source(obs, 'aeff'), _irf_source(obs, 'edisp')
+        return aeff, edisp, psf, offset, radius
+
+    def _make_observation(self, obs, on_vector, off_vector, irfs):
+        """Combine extracted counts and reduced IRFs."""
+        spectrum_observation = SpectrumObservation(
+            on_vector=on_vector,
+            aeff=irfs['aeff'],
+            off_vector=off_vector,
+            edisp=irfs['edisp'],
+        )
+
+        if self.use_recommended_erange:
+            if irfs['thresholds'] is None:
+                log.warning('No thresholds defined for obs {}'.format(obs))
+            else:
+                lo_threshold, hi_threshold = irfs['thresholds']
+                spectrum_observation.hi_threshold = hi_threshold
+                spectrum_observation.lo_threshold = lo_threshold
+
+        return spectrum_observation
+
     def process(self, obs, bkg):
         """Process one observation.
-        
+
+        This method doesn't change the state of the `SpectrumExtraction`.
+
         Parameters
         ----------
         obs : `~gammapy.data.DataStoreObservation`
             Observation
         bkg : `~gammapy.background.BackgroundEstimate`
             Background estimate
-        
+
         Returns
         -------
         spectrum_observation : `~gammapy.spectrum.SpectrumObservation`
             Spectrum observation
         """
         log.info('Process observation\n {}'.format(obs))
-        self.make_empty_vectors(obs, bkg)
-        self.extract_counts(bkg)
-        self.extract_irfs(obs)
-
-        if self.containment_correction:
-            self.apply_containment_correction(obs, bkg)
-        else:
-            self.containment = np.ones(self._aeff.energy.nbins)
-
-        spectrum_observation = SpectrumObservation(
-            on_vector=self._on_vector,
-            aeff=self._aeff,
-            off_vector=self._off_vector,
-            edisp=self._edisp,
-        )
-
-        if self.use_recommended_erange:
-            try:
-                spectrum_observation.hi_threshold = obs.aeff.high_threshold
-                spectrum_observation.lo_threshold = obs.aeff.low_threshold
-            except KeyError:
-                log.warning('No thresholds defined for obs {}'.format(obs))
-
-        return spectrum_observation
+        irfs = _reduce_irfs(self._irf_job(obs, bkg), self.e_reco, self.e_true)
+        on_vector, off_vector = _extract_counts(_counts_job(obs, bkg), self.e_reco)
+        return self._make_observation(obs, on_vector, off_vector, irfs)
 
+    @deprecated('0.8', alternative='process')
     def make_empty_vectors(self, obs, bkg):
         """Create empty vectors.
 
@@ -146,23 +230,10 @@ class SpectrumExtraction(object):
         bkg : `~gammapy.background.BackgroundEstimate`
             Background estimate
         """
-        log.info('Update observation meta info')
-
-        offset = obs.pointing_radec.separation(bkg.on_region.center)
-        log.info('Offset : {}\n'.format(offset))
-
-        self._on_vector = PHACountsSpectrum(
-            energy_lo=self.e_reco[:-1],
-            energy_hi=self.e_reco[1:],
-            backscal=bkg.a_on,
-            offset=offset,
-            livetime=obs.observation_live_time_duration,
-            obs_id=obs.obs_id)
-
-        self._off_vector = self._on_vector.copy()
-        self._off_vector.is_bkg = True
-        self._off_vector.backscal = bkg.a_off
+        counts_job = _counts_job(obs, bkg)
+        self._on_vector, self._off_vector = _make_empty_vectors(counts_job, self.e_reco)
 
+    @deprecated('0.8', alternative='process')
     def extract_counts(self, bkg):
         """Fill on and off vector for one observation.
 
@@ -175,6 +246,7 @@ class SpectrumExtraction(object):
         self._on_vector.fill(bkg.on_events)
         self._off_vector.fill(bkg.off_events)
 
+    @deprecated('0.8', alternative='process')
     def extract_irfs(self, obs):
         """Extract IRFs.
 
@@ -183,12 +255,11 @@ class SpectrumExtraction(object):
         obs : `~gammapy.data.DataStoreObservation`
             Observation
         """
-        log.info('Extract IRFs')
-        offset = self._on_vector.offset
-        self._aeff = obs.aeff.to_effective_area_table(offset, energy=self.e_true)
-        self._edisp = obs.edisp.to_energy_dispersion(
-            offset, e_reco=self.e_reco, e_true=self.e_true)
+        irf_job = obs.aeff, obs.edisp, None, self._on_vector.offset, None
+        irfs = _reduce_irfs(irf_job, self.e_reco, self.e_true)
+        self._aeff, self._edisp = irfs['aeff'], irfs['edisp']
 
+    @deprecated('0.8', alternative='process')
     def apply_containment_correction(self, obs, bkg):
         """Apply PSF containment correction.
 
@@ -199,33 +270,12 @@ class SpectrumExtraction(object):
         bkg : `~gammapy.background.BackgroundEstimate`
             background esimate
         """
-        # TODO: This should be split out into a separate class
         if not isinstance(bkg.on_region, CircleSkyRegion):
             raise TypeError("Incorrect region type for containment correction."
                             " Should be CircleSkyRegion.")
 
-        log.info('Apply containment correction')
-        # First need psf
-        angles = np.linspace(0., 1.5, 150) * u.deg
-        offset = self._on_vector.offset
-        if isinstance(obs.psf, PSF3D):
-            psf = obs.psf.to_energy_dependent_table_psf(theta=offset)
-        else:
-            psf = obs.psf.to_energy_dependent_table_psf(offset, angles)
-
-        center_energies = self._aeff.energy.nodes
-        containment = []
-        for index, energy in enumerate(center_energies):
-            try:
-                cont_ = psf.integral(energy, 0. * u.deg, bkg.on_region.radius)
-            except:
-                msg = 'Containment correction failed for bin {}, energy {}.'
-                log.warning(msg.format(index, energy))
-                cont_ = 1
-            finally:
-                containment.append(cont_)
-
-        self.containment = np.array(containment)
+        self.containment = _containment_correction(
+            obs.psf, self._on_vector.offset, bkg.on_region.radius, self._aeff.energy.nodes)
         self._aeff.data.data *= self.containment
 
     def compute_energy_threshold(self, **kwargs):
@@ -258,3 +308,189 @@ class SpectrumExtraction(object):
         self.observations.write(outdir / ogipdir, use_sherpa=use_sherpa, overwrite=overwrite)
 
         # TODO : add more debug plots etc. here
+
+
+def _irf_source(obs, hdu_type):
+    """HDU location of an IRF, or the IRF for observations without data store."""
+    if hasattr(obs, 'location'):
+        return obs.location(hdu_type=hdu_type)
+    else:
+        return getattr(obs, hdu_type)
+
+
+def _load_irf(irf):
+    """Load an IRF given by its HDU location."""
+    if isinstance(irf, HDULocation):
+        return irf.load()
+    else:
+        return irf
+
+
+def _irf_key(aeff, edisp, psf, offset, radius):
+    """Key identifying observations with the same reduced IRFs.
+
+    IRFs given by their HDU location are identified by file and HDU name,
+    other IRFs by their content.
+    """
+    irfs = tuple(_location_key(irf) for irf in [aeff, edisp, psf] if irf is not None)
+    radius = None if radius is None else radius.to('deg').value
+    return irfs, offset.to('deg').value, radius
+
+
+def _location_key(irf):
+    """File and HDU name of the IRF, or SHA-1 digest of the pickled IRF."""
+    if isinstance(irf, HDULocation):
+        return str(irf.path()), irf.hdu_name
+    else:
+        return hashlib.sha1(pickle.dumps(irf, protocol=2)).hexdigest()
+
+
+def _counts_job(obs, bkg):
+    """Arguments of `_extract_counts` for one observation."""
+    return dict(
+        obs_id=obs.obs_id,
+        offset=obs.pointing_radec.separation(bkg.on_region.center),
+        livetime=obs.observation_live_time_duration,
+        a_on=bkg.a_on,
+        a_off=bkg.a_off,
+        on_energy=bkg.on_events.energy,
+        off_energy=bkg.off_events.energy,
+    )
+
+
+def _make_empty_vectors(counts_job, e_reco):
+    """Empty on and off vector for one observation, with the meta info."""
+    log.info('Offset : {}\n'.format(counts_job['offset']))
+
+    on_vector = PHACountsSpectrum(
+        energy_lo=e_reco[:-1],
+        energy_hi=e_reco[1:],
+        backscal=counts_job['a_on'],
+        offset=counts_job['offset'],
+        livetime=counts_job['livetime'],
+        obs_id=counts_job['obs_id'])
+
+    off_vector = on_vector.copy()
+    off_vector.is_bkg = True
+    off_vector.backscal = counts_job['a_off']
+    return on_vector, off_vector
+
+
+def _extract_counts(counts_job, e_reco):
+    """Fill on and off vector for one observation.
+
+    This copies over all meta info and sets up the energy binning. This
+    function is stateless, so that it can be run in parallel.
+
+    Parameters
+    ----------
+    counts_job : dict
+        Observation meta info and energies of the on and off events,
+        see `_counts_job`
+    e_reco : `~astropy.units.Quantity`
+        Reconstructed energy binning
+
+    Returns
+    -------
+    on_vector, off_vector : `~gammapy.spectrum.PHACountsSpectrum`
+        On and off counts spectrum
+    """
+    on_vector, off_vector = _make_empty_vectors(counts_job, e_reco)
+
+    log.info('Fill events')
+    on_vector.fill(counts_job['on_energy'])
+    off_vector.fill(counts_job['off_energy'])
+    return on_vector, off_vector
+
+
+def _reduce_irfs(irf_job, e_reco, e_true):
+    """Reduce the IRFs of one observation at a given offset.
+
+    This function is stateless, so that it can be run in parallel.
+
+    Parameters
+    ----------
+    irf_job : tuple
+        Effective area, energy dispersion, PSF, offset and on region radius.
+        The IRFs can be given by their `~gammapy.data.HDULocation`, they are
+        loaded here. The PSF and radius are ``None`` if no containment
+        correction should be applied.
+    e_reco, e_true : `~astropy.units.Quantity`
+        Reconstructed and true energy binning
+
+    Returns
+    -------
+    irfs : dict
+        Effective area table ``aeff``, energy dispersion ``edisp``, PSF
+        containment fraction ``containment`` and recommended energy range
+        ``thresholds`` (``None`` if not defined).
+    """
+    aeff_2d, edisp_2d, psf, offset, radius = irf_job
+    log.info('Extract IRFs')
+    aeff_2d, edisp_2d = _load_irf(aeff_2d), _load_irf(edisp_2d)
+
+    aeff = aeff_2d.to_effective_area_table(offset, energy=e_true)
+    edisp = edisp_2d.to_energy_dispersion(offset, e_reco=e_reco, e_true=e_true)
+
+    try:
+        thresholds = aeff_2d.low_threshold, aeff_2d.high_threshold
+    except KeyError:
+        thresholds = None
+
+    if radius is not None:
+        containment = _containment_correction(
+            _load_irf(psf), offset, radius, aeff.energy.nodes)
+        aeff.data.data *= containment
+    else:
+        containment = np.ones(aeff.energy.nbins)
+
+    return dict(aeff=aeff, edisp=edisp, containment=containment, thresholds=thresholds)
+
+
+def _containment_correction(psf, offset, radius, energy):
+    """PSF containment fraction within the on region radius.
+
+    PSFs with an analytic ``containment`` method, i.e.
+    `~gammapy.irf.EnergyDependentMultiGaussPSF` and `~gammapy.irf.PSFKing`,
+    are evaluated directly, other PSFs are converted to a table PSF first.
+
+    Parameters
+    ----------
+    psf : `~gammapy.irf.PSF3D`, `~gammapy.irf.EnergyDependentMultiGaussPSF` or `~gammapy.irf.PSFKing`
+        PSF
+    offset : `~astropy.coordinates.Angle`
+        Offset of the on region
+    radius : `~astropy.coordinates.Angle`
+        Radius of the on region
+    energy : `~astropy.units.Quantity`
+        Energies for which to compute the containment
+
+    Returns
+    -------
+    containment : `~numpy.ndarray`
+        Containment fraction
+    """
+    log.info('Apply containment correction')
+    if hasattr(psf, 'containment'):
+        containment = psf.containment(energy, offset, radius)
+    else:
+        containment = _table_containment(psf, offset, radius, energy)
+
+    invalid = ~np.isfinite(containment)
+    if invalid.any():
+        msg = 'Containment correction failed for energies {}.'
+        log.warning(msg.format(energy[invalid]))
+        containment[invalid] = 1
+
+    return containment
+
+
+def _table_containment(psf, offset, radius, energy):
+    """PSF containment fraction computed from the table PSF at the given offset."""
+    if isinstance(psf, PSF3D):
+        psf = psf.to_energy_dependent_table_psf(theta=offset)
+    else:
+        angles = np.linspace(0., 1.5, 150) * u.deg
+        psf = psf.to_energy_dependent_table_psf(offset, angles)
+
+    return psf.containment(energy, radius)
@@ -3,16 +3,18 @@ import logging
 import copy
 import numpy as np
 import astropy.units as u
+from astropy.table import Table
 from ..utils.scripts import make_path
-from ..utils.fitting import fit_iminuit
+from ..utils.fitting import fit_iminuit, likelihood_profile
 from .. import stats
-from .utils import CountsPredictor
+from .utils import CountsPredictor, CompiledCountsPredictor, GaussLegendreIntegrator
 from . import SpectrumObservationList, SpectrumObservation
 from itertools import product
 
 
 __all__ = [
     'SpectrumFit',
+    'PowerLawBatchFit',
 ]
 
 log = logging.getLogger(__name__)
@@ -48,15 +50,21 @@ class SpectrumFit(object):
     error_method : {'covar', 'conf', 'HESSE', 'MINOS'}
         Method of the error estimation depending on the backend.
         TODO: Not implemented yet. For now 'covar'/'HESSE' are used by default.
+    compiled_response : bool, default: False
+        Precompute one response matrix per observation and predict the source
+        counts with a batched matrix product, see
+        `~gammapy.spectrum.CompiledCountsPredictor`. Only used for forward
+        folded fits. Recommended for joint fits of many observations.
     """
 
     def __init__(self, obs_list, model, stat='wstat', forward_folded=True,
                  fit_range=None, background_model=None,
-                 method='sherpa', error_method=None):
+                 method='sherpa', error_method=None, compiled_response=False):
         self.obs_list = obs_list
         self._model = model
-        self.stat = stat
+        self._stat = stat
         self.forward_folded = forward_folded
+        self.compiled_response = compiled_response
         self.fit_range = fit_range
         self._background_model = background_model
         self.method = method
@@ -64,6 +72,7 @@ class SpectrumFit(object):
 
         self._predicted_counts = None
         self._statval = None
+        self._stat_kernels = None
 
         self.covar_axis = None
         self.covariance = None
@@ -72,6 +81,13 @@ class SpectrumFit(object):
         self._check_valid_fit()
         self._apply_fit_range()
 
+    def __getstate__(self):
+        # The fitter backends can't be pickled, e.g. for multiprocessing
+        state = self.__dict__.copy()
+        state.pop('_sherpa_fit', None)
+        state.pop('_iminuit_fit', None)
+        return state
+
     def __str__(self):
         ss = self.__class__.__name__
         ss += '\nSource model {}'.format(self._model.__class__.__name__)
@@ -97,6 +113,16 @@ class SpectrumFit(object):
         """
         return self._result
 
+    @property
+    def stat(self):
+        """Fit statistic"""
+        return self._stat
+
+    @stat.setter
+    def stat(self, stat):
+        self._stat = stat
+        self._stat_kernels = None
+
     @property
     def background_model(self):
         """Background model
@@ -110,6 +136,7 @@ class SpectrumFit(object):
     @background_model.setter
     def background_model(self, model):
         self._background_model = model
+        self._stat_kernels = None
 
     @property
     def obs_list(self):
@@ -122,6 +149,8 @@ class SpectrumFit(object):
             obs_list = SpectrumObservationList([obs_list])
 
         self._obs_list = SpectrumObservationList(obs_list)
+        self._compiled_predictor = None
+        self._stat_kernels = None
 
     @property
     def bins_in_fit_range(self):
@@ -177,6 +206,7 @@ class SpectrumFit(object):
 
     def _apply_fit_range(self):
         """Mark bins within desired fit range for each observation."""
+        self._stat_kernels = None
         self._bins_in_fit_range = []
         for obs in self.obs_list:
             # Take into account fit range
@@ -209,11 +239,18 @@ class SpectrumFit(object):
 
         The result is stored as ``predicted_counts`` attribute.
         """
+        if self.compiled_response and self.forward_folded:
+            if self._compiled_predictor is None:
+                self._compiled_predictor = CompiledCountsPredictor(self.obs_list, self._model)
+            mu_sigs = self._compiled_predictor.predict(self._model)
+        else:
+            mu_sigs = [
+                self._predict_counts_helper(obs, self._model, self.forward_folded)
+                for obs in self.obs_list
+            ]
+
         predicted_counts = []
-        for obs in self.obs_list:
-            mu_sig = self._predict_counts_helper(obs,
-                                                 self._model,
-                                                 self.forward_folded)
+        for obs, mu_sig in zip(self.obs_list, mu_sigs):
             mu_bkg = None
             if self.background_model is not None:
                 # For now, never fold background model with IRFs
@@ -268,66 +305,88 @@ class SpectrumFit(object):
         """Calc statistic for all observations.
 
         The result is stored as attribute ``statval``, bin outside the fit
-        range are set to 0.
+        range are set to 0. The arrays in ``statval`` are overwritten by the
+        next call.
         """
-        statval = []
-        for obs, npred in zip(self.obs_list, self.predicted_counts):
-            on_stat, off_stat = self._calc_statval_helper(obs, npred)
-            statvals = (on_stat, off_stat)
-            statval.append(statvals)
-        self._statval = statval
-        self._restrict_statval()
+        kernels = self._get_stat_kernels()
+        on_kernel, off_kernel = kernels['on'], kernels['off']
+        mu_sig, mu_bkg = kernels['mu_sig'], kernels['mu_bkg']
 
-    def _calc_statval_helper(self, obs, prediction):
-        """Calculate ``statval`` for one observation.
+        for idx, (n_bins, prediction) in enumerate(zip(kernels['n_bins'], self.predicted_counts)):
+            mu_sig[idx, :n_bins] = prediction[0]
+            if self.background_model is not None:
+                mu_bkg[idx, :n_bins] = prediction[1]
 
-        Parameters
-        ----------
-        obs : `~gammapy.spectrum.SpectrumObservation`
-            Measured counts
-        prediction : tuple of `~numpy.ndarray`
-            Predicted (on counts, off counts)
+        if self.stat == 'wstat':
+            on_stat = on_kernel.evaluate(mu_sig)
+            # The on_stat sometime contains nan values
+            # TODO: Handle properly
+            np.copyto(on_stat, 0, where=np.isnan(on_stat))
+            big = np.finfo(on_stat.dtype).max
+            np.clip(on_stat, -big, big, out=on_stat)
+            # Store the result of the profile likelihood as bkg prediction
+            np.multiply(on_kernel.mu_bkg, kernels['alpha'], out=mu_bkg)
+            for idx, (n_bins, prediction) in enumerate(zip(kernels['n_bins'], self.predicted_counts)):
+                prediction[1] = mu_bkg[idx, :n_bins]
+        elif self.background_model is not None:
+            mu_on, mu_off = kernels['mu_on'], kernels['mu_off']
+            np.add(mu_sig, mu_bkg, out=mu_on)
+            on_kernel.evaluate(mu_on)
+            np.divide(mu_bkg, kernels['alpha'], out=mu_off)
+            off_kernel.evaluate(mu_off)
+        else:
+            on_kernel.evaluate(mu_sig)
 
-        Returns
-        ------
-        statsval : tuple of `~numpy.ndarray`
-            Statval for (on, off)
+        self._statval = kernels['statval']
+
+    def _get_stat_kernels(self):
+        """Fit statistic kernels for the counts of all observations.
+
+        The counts of all observations are stacked into ``(n_obs, n_bins)``
+        arrays, observations with fewer bins are padded with empty bins
+        outside the fit range. The kernels are re-used for every evaluation
+        of the statistic. They are set up again if the observations, fit
+        range, statistic or background model are set, and once per call of
+        `fit`, `likelihood_1d` and `likelihood_profile`, so that changed
+        counts are taken into account.
         """
-        stats_func = getattr(stats, self.stat)
+        if self._stat_kernels is not None:
+            return self._stat_kernels
 
-        # Off stat = 0 by default
-        off_stat = np.zeros(obs.e_reco.nbins)
-        if self.stat == 'cash' or self.stat == 'cstat':
+        use_off = self.stat == 'wstat' or self.background_model is not None
+
+        n_bins = [obs.e_reco.nbins for obs in self.obs_list]
+        shape = (len(n_bins), max(n_bins))
+        n_on, n_off = np.zeros(shape), np.zeros(shape)
+        alpha, mask = np.ones(shape), np.zeros(shape, dtype=bool)
+
+        for idx, obs in enumerate(self.obs_list):
+            n_on[idx, :n_bins[idx]] = obs.on_vector.data.data.value
+            mask[idx, :n_bins[idx]] = self.bins_in_fit_range[idx]
+            if use_off:
+                n_off[idx, :n_bins[idx]] = obs.off_vector.data.data.value
+                alpha[idx, :n_bins[idx]] = obs.alpha
+
+        kernels = dict(n_bins=n_bins, alpha=alpha, off=None,
+                       mu_sig=np.zeros(shape), mu_bkg=np.zeros(shape))
+        if self.stat == 'wstat':
+            kernels['on'] = stats.WStatKernel(n_on, n_off, alpha, mask=mask)
+        elif self.stat == 'cash' or self.stat == 'cstat':
+            kernel_cls = stats.CashKernel if self.stat == 'cash' else stats.CStatKernel
+            kernels['on'] = kernel_cls(n_on, mask=mask)
             if self.background_model is not None:
-                mu_on = prediction[0] + prediction[1]
-                on_stat = stats_func(n_on=obs.on_vector.data.data.value,
-                                     mu_on=mu_on)
-                mu_off = prediction[1] / obs.alpha
-                off_stat = stats_func(n_on=obs.off_vector.data.data.value,
-                                      mu_on=mu_off)
-            else:
-                mu_on = prediction[0]
-                on_stat = stats_func(n_on=obs.on_vector.data.data.value,
-                                     mu_on=mu_on)
-                off_stat = np.zeros_like(on_stat)
-
-        elif self.stat == 'wstat':
-            kwargs = dict(n_on=obs.on_vector.data.data.value,
-                          n_off=obs.off_vector.data.data.value,
-                          alpha=obs.alpha,
-                          mu_sig=prediction[0])
-            # Store the result of the profile likelihood as bkg prediction
-            mu_bkg = stats.get_wstat_mu_bkg(**kwargs)
-            prediction[1] = mu_bkg * obs.alpha
-            on_stat_ = stats_func(**kwargs)
-            # The on_stat sometime contains nan values
-            # TODO: Handle properly
-            on_stat = np.nan_to_num(on_stat_)
-            off_stat = np.zeros_like(on_stat)
+                kernels['off'] = kernel_cls(n_off, mask=mask)
+                kernels['mu_on'], kernels['mu_off'] = np.zeros(shape), np.zeros(shape)
         else:
             raise NotImplementedError('{}'.format(self.stat))
 
-        return on_stat, off_stat
+        # Off stat = 0 by default
+        off_stat = np.zeros(shape) if kernels['off'] is None else kernels['off'].stat
+        kernels['statval'] = [(kernels['on'].stat[idx, :n], off_stat[idx, :n])
+                              for idx, n in enumerate(n_bins)]
+
+        self._stat_kernels = kernels
+        return kernels
 
     def total_stat(self, parameters):
         """Statistic summed over all bins and all observations.
@@ -342,17 +401,11 @@ class SpectrumFit(object):
         self._model.parameters = parameters
         self.predict_counts()
         self.calc_statval()
-        total_stat = np.sum([np.sum(v) for v in self.statval], dtype=np.float64)
-        return total_stat
 
-    def _restrict_statval(self):
-        """Apply valid fit range to statval.
-        """
-        for statval, valid_range in zip(self.statval, self.bins_in_fit_range):
-            # Find bins outside safe range
-            idx = np.where(np.invert(valid_range))[0]
-            statval[0][idx] = 0
-            statval[1][idx] = 0
+        total_stat = np.sum(self._stat_kernels['on'].stat)
+        if self._stat_kernels['off'] is not None:
+            total_stat += np.sum(self._stat_kernels['off'].stat)
+        return total_stat
 
     def _check_valid_fit(self):
         """Helper function to give useful error messages."""
@@ -382,12 +435,39 @@ class SpectrumFit(object):
         """
         likelihood = []
         self._model = model
+        self._stat_kernels = None
         for val in parvals:
             self._model.parameters[parname].value = val
             stat = self.total_stat(self._model.parameters)
             likelihood.append(stat)
         return np.array(likelihood)
 
+    def likelihood_profile(self, values, reoptimize=False, n_jobs=1, opts_minuit=None):
+        """Likelihood profile or contour on a grid of one or two parameters.
+
+        Calls `~gammapy.utils.fitting.likelihood_profile`, see there for details.
+
+        Parameters
+        ----------
+        values : dict
+            Grid values for one or two model parameters, keyed by parameter name
+        reoptimize : bool
+            Re-optimise the other free parameters at each grid point
+        n_jobs : int
+            Number of processes
+        opts_minuit : dict (optional)
+            Options passed to `iminuit.Minuit` constructor
+
+        Returns
+        -------
+        result : `~collections.OrderedDict`
+            Statistic ``stat`` and values of all parameters on the grid
+        """
+        self._stat_kernels = None
+        return likelihood_profile(self.total_stat, self._model.parameters, values,
+                                  reoptimize=reoptimize, n_jobs=n_jobs,
+                                  opts_minuit=opts_minuit)
+
     def plot_likelihood_1d(self, ax=None, **kwargs):
         """Plot 1-dim likelihood profile.
 
@@ -410,6 +490,7 @@ class SpectrumFit(object):
         opts_minuit : dict (optional)
             Options passed to `iminuit.Minuit` constructor
         """
+        self._stat_kernels = None
         if self.method == 'sherpa':
             self._fit_sherpa()
         elif self.method == 'iminuit':
@@ -486,7 +567,7 @@ class SpectrumFit(object):
         for idx, obs in enumerate(self.obs_list):
             fit_range = self.true_fit_range[idx]
             statval = np.sum(self.statval[idx])
-            stat_per_bin = self.statval[idx]
+            stat_per_bin = copy.deepcopy(self.statval[idx])
             npred_src = copy.deepcopy(self.predicted_counts[idx][0])
             npred_bkg = copy.deepcopy(self.predicted_counts[idx][1])
 
@@ -569,3 +650,279 @@ class SpectrumFit(object):
         filename = outdir / 'fit_result_{}.yaml'.format(modelname)
         log.info('Writing {}'.format(filename))
         self.result[0].to_yaml(filename)
+
+
+class PowerLawBatchFit(object):
+    """Fit a power law to many counts spectra with the same response at once.
+
+    This is meant for Monte Carlo studies, e.g. with counts from
+    `~gammapy.spectrum.SpectrumSimulation.simulate_counts`. Amplitude and
+    index of a `~gammapy.spectrum.models.PowerLaw` are fitted to all
+    realisations simultaneously with damped Newton iterations, using the
+    analytic derivatives of the ``cash`` statistic or, if off counts are
+    given, of the profile ``wstat`` statistic.
+
+    The power law is integrated over the true energy bins on fixed
+    Gauss-Legendre nodes (see `~gammapy.spectrum.GaussLegendreIntegrator`),
+    so that the derivatives with respect to the index are simple sums over
+    the nodes.
+
+    Parameters
+    ----------
+    livetime : `~astropy.units.Quantity`
+        Livetime
+    aeff : `~gammapy.irf.EffectiveAreaTable`
+        Effective area
+    edisp : `~gammapy.irf.EnergyDispersion`, optional
+        Energy dispersion
+    alpha : float, optional
+        Exposure ratio between on and off region, required for on-off fits
+    reference : `~astropy.units.Quantity`
+        Reference energy of the power law
+    fit_range : tuple of `~astropy.units.Quantity`, optional
+        Reconstructed energy range, only bins fully inside are used
+    """
+
+    def __init__(self, livetime, aeff, edisp=None, alpha=None,
+                 reference=1 * u.TeV, fit_range=None):
+        self.livetime = livetime
+        self.aeff = aeff
+        self.edisp = edisp
+        self.alpha = alpha
+        self.reference = reference
+        self.fit_range = fit_range
+        self._setup()
+
+    def _setup(self):
+        e_true = self.aeff.energy.bins.to('TeV').value
+        integrator = GaussLegendreIntegrator(e_true[:-1], e_true[1:])
+        self._log_x = np.log(integrator.nodes / self.reference.to('TeV').value)
+        self._weights = integrator.weights
+
+        response = (self.livetime * self.aeff.data.data).to('cm2 s').value
+        if self.edisp is not None:
+            response = self.edisp.pdf_matrix * response[:, np.newaxis]
+            e_reco = self.edisp.e_reco.bins.to('TeV').value
+        else:
+            response = np.diag(response)
+            e_reco = e_true
+
+        mask = np.ones(len(e_reco) - 1, dtype=bool)
+        if self.fit_range is not None:
+            precision = 1e-3
+            emin, emax = [_.to('TeV').value for _ in self.fit_range]
+            mask &= e_reco[:-1] * (1 + precision) >= emin
+            mask &= e_reco[1:] * (1 - precision) <= emax
+
+        self._mask = mask
+        self._response = response[:, mask]
+
+    def predict_counts(self, index):
+        """Predicted source counts and their derivatives with respect to the index.
+
+        Parameters
+        ----------
+        index : `~numpy.ndarray`
+            Spectral index
+
+        Returns
+        -------
+        npred, dnpred, d2npred : `~numpy.ndarray`
+            Predicted counts per unit amplitude (``cm-2 s-1 TeV-1``) in the
+            bins inside the fit range, and their first and second derivative
+            with respect to the index, with shape ``(n_realisations, n_bins)``
+        """
+        index = np.atleast_1d(index)[:, np.newaxis, np.newaxis]
+        values = np.exp(-index * self._log_x) * self._weights
+
+        npred = np.sum(values, axis=-1).dot(self._response)
+        dnpred = -np.sum(values * self._log_x, axis=-1).dot(self._response)
+        d2npred = np.sum(values * self._log_x ** 2, axis=-1).dot(self._response)
+        return npred, dnpred, d2npred
+
+    def _total_stat(self, amplitude, index, n_on, n_off):
+        npred = self.predict_counts(index)[0]
+        stat = _stat_derivatives(amplitude[:, np.newaxis] * npred, n_on, n_off, self.alpha)[0]
+        return np.sum(stat, axis=-1)
+
+    def run(self, on_counts, off_counts=None, index=2, max_iter=50, tol=1e-6):
+        """Fit all realisations.
+
+        Parameters
+        ----------
+        on_counts : `~numpy.ndarray`
+            On counts with shape ``(n_realisations, n_bins)``
+        off_counts : `~numpy.ndarray`, optional
+            Off counts with the same shape, for a ``wstat`` fit
+        index : float
+            Start value of the spectral index
+        max_iter : int
+            Maximum number of Newton iterations
+        tol : float
+            Convergence tolerance on the change of the fit statistic
+
+        Returns
+        -------
+        result : `~astropy.table.Table`
+            Best-fit ``amplitude`` and ``index`` with errors, fit statistic
+            ``statval`` and a ``converged`` flag for every realisation
+        """
+        n_on = np.atleast_2d(on_counts)[:, self._mask].astype(float)
+        if off_counts is not None:
+            if self.alpha is None:
+                raise ValueError('alpha required for on-off fit')
+            n_off = np.atleast_2d(off_counts)[:, self._mask].astype(float)
+            excess = n_on - self.alpha * n_off
+        else:
+            n_off = None
+            excess = n_on
+
+        n_real = len(n_on)
+        index = index * np.ones(n_real)
+        npred = self.predict_counts(index)[0]
+        amplitude = np.clip(excess.sum(axis=-1), 1, None) / npred.sum(axis=-1)
+
+        # Internally the amplitude is scaled to order one
+        scale = np.median(amplitude)
+        norm = amplitude / scale
+
+        stat = self._total_stat(scale * norm, index, n_on, n_off)
+        converged = np.zeros(n_real, dtype=bool)
+
+        for _ in range(max_iter):
+            active = ~converged
+            if not active.any():
+                break
+
+            hessian, grad = self._newton_terms(
+                scale, norm[active], index[active], n_on[active],
+                None if n_off is None else n_off[active],
+            )
+            step = self._newton_step(hessian, grad)
+
+            # Damping: halve the step until the statistic doesn't increase
+            norm_new, index_new = norm[active], index[active]
+            stat_old = stat[active]
+            stat_new = np.full_like(stat_old, np.inf)
+            todo = np.ones(len(stat_old), dtype=bool)
+            for _ in range(20):
+                idx = np.where(todo)[0]
+                norm_try = norm[active][idx] + step[idx, 0]
+                index_try = index[active][idx] + step[idx, 1]
+                stat_try = self._total_stat(
+                    scale * norm_try, index_try, n_on[active][idx],
+                    None if n_off is None else n_off[active][idx],
+                )
+                ok = stat_try <= stat_old[idx]
+                norm_new[idx[ok]] = norm_try[ok]
+                index_new[idx[ok]] = index_try[ok]
+                stat_new[idx[ok]] = stat_try[ok]
+                todo[idx[ok]] = False
+                if not todo.any():
+                    break
+                step[todo] *= 0.5
+
+            # Realisations without improvement are at the minimum
+            stat_new[todo] = stat_old[todo]
+            delta = stat_old - stat_new
+
+            norm[active], index[active], stat[active] = norm_new, index_new, stat_new
+            converged[active] = delta < tol
+
+        hessian, _ = self._newton_terms(scale, norm, index, n_on, n_off)
+        with np.errstate(all='ignore'):
+            covariance = 2 * np.linalg.inv(hessian)
+
+        result = Table()
+        unit = u.Unit('cm-2 s-1 TeV-1')
+        result['amplitude'] = scale * norm * unit
+        result['amplitude_err'] = scale * np.sqrt(covariance[:, 0, 0]) * unit
+        result['index'] = index
+        result['index_err'] = np.sqrt(covariance[:, 1, 1])
+        result['statval'] = self._statval(scale * norm, index, n_on, n_off)
+        result['converged'] = converged
+        return result
+
+    def _newton_terms(self, scale, norm, index, n_on, n_off):
+        """Hessian and gradient of the statistic for (norm, index)."""
+        npred, dnpred, d2npred = self.predict_counts(index)
+        amplitude = (scale * norm)[:, np.newaxis]
+        mu_sig = amplitude * npred
+        _, d1, d2 = _stat_derivatives(mu_sig, n_on, n_off, self.alpha)
+
+        # Derivatives of mu_sig with respect to norm and index
+        dmu = [scale * npred, amplitude * dnpred]
+        d2mu = [[0, scale * dnpred], [scale * dnpred, amplitude * d2npred]]
+
+        grad = np.stack([np.sum(d1 * _, axis=-1) for _ in dmu], axis=-1)
+        hessian = np.empty((len(norm), 2, 2))
+        for i in range(2):
+            for j in range(2):
+                hessian[:, i, j] = np.sum(d2 * dmu[i] * dmu[j] + d1 * d2mu[i][j], axis=-1)
+
+        return hessian, grad
+
+    @staticmethod
+    def _newton_step(hessian, grad):
+        """Newton step, falls back to a diagonal step if the Hessian isn't positive definite."""
+        a, b, c = hessian[:, 0, 0], hessian[:, 0, 1], hessian[:, 1, 1]
+        det = a * c - b * b
+        positive = (a > 0) & (det > 0)
+
+        with np.errstate(all='ignore'):
+            step = np.stack([
+                -(c * grad[:, 0] - b * grad[:, 1]) / det,
+                -(a * grad[:, 1] - b * grad[:, 0]) / det,
+            ], axis=-1)
+            diag = np.abs(np.stack([a, c], axis=-1)) + 1e-10
+            step_diag = -grad / diag
+
+        return np.where(positive[:, np.newaxis], step, step_diag)
+
+    def _statval(self, amplitude, index, n_on, n_off):
+        """Total fit statistic, including the constant terms used by `SpectrumFit`."""
+        mu_sig = amplitude[:, np.newaxis] * self.predict_counts(index)[0]
+        if n_off is None:
+            stat = stats.cash(n_on, mu_sig)
+        else:
+            shape = n_on.shape
+            stat = stats.wstat(n_on.ravel(), n_off.ravel(), self.alpha, mu_sig.ravel())
+            stat = np.nan_to_num(stat).reshape(shape)
+        return np.sum(stat, axis=-1)
+
+
+def _stat_derivatives(mu_sig, n_on, n_off=None, alpha=None):
+    """Fit statistic per bin and its derivatives with respect to ``mu_sig``.
+
+    The ``cash`` statistic is used if ``n_off`` is None, otherwise the
+    profile ``wstat`` statistic without the constant goodness of fit terms.
+    Invalid predictions give an infinite statistic.
+    """
+    with np.errstate(all='ignore'):
+        if n_off is None:
+            stat = 2 * (mu_sig - n_on * np.log(mu_sig))
+            d1 = 2 * (1 - n_on / mu_sig)
+            d2 = 2 * n_on / mu_sig ** 2
+            stat = np.where(n_on == 0, 2 * mu_sig, stat)
+        else:
+            mu_bkg = stats.get_wstat_mu_bkg(n_on, n_off, alpha, mu_sig)
+            stat = stats.wstat(n_on, n_off, alpha, mu_sig, mu_bkg, extra_terms=False)
+            mu_on = mu_sig + alpha * mu_bkg
+            d1 = 2 * (1 - n_on / mu_on)
+
+            # Second derivative of the profile likelihood, the background
+            # is re-optimised for every value of mu_sig
+            d2_sig = 2 * n_on / mu_on ** 2
+            d2_bkg = 2 * alpha ** 2 * n_on / mu_on ** 2
+            d2_bkg += np.where(n_off == 0, 0, 2 * n_off / mu_bkg ** 2)
+            d2 = np.where(
+                (mu_bkg > 0) & (d2_bkg > 0),
+                d2_sig - alpha ** 2 * d2_sig ** 2 / d2_bkg,
+                d2_sig,
+            )
+
+        d1 = np.where(n_on == 0, 2, d1)
+        d2 = np.where(n_on == 0, 0, d2)
+
+    stat = np.where(np.isfinite(stat), stat, np.inf)
+    return stat, d1, d2
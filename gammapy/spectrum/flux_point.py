@@ -1,7 +1,10 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import logging
+import contextlib
 from collections import OrderedDict
+from functools import partial
+from multiprocessing import Pool
 import numpy as np
 from astropy.table import Table, vstack
 from astropy import units as u
@@ -593,12 +596,27 @@ class FluxPointEstimator(object):
         Energy groups (usually output of `~gammapy.spectrum.SpectrumEnergyGroupMaker`)
     model : `~gammapy.spectrum.models.SpectralModel`
         Global model (usually output of `~gammapy.spectrum.SpectrumFit`)
+    method : {'fit', 'template'}
+        With 'fit' a `~gammapy.spectrum.SpectrumFit` is run for each group.
+        With 'template' the counts predicted by the approximate model are
+        computed once per group, the amplitude fit, sqrt(TS) and limits are
+        then computed on the 1D likelihood profile of the amplitude, starting
+        at the global model.
+    n_jobs : int
+        Number of processes used to compute the groups, only used for the
+        'template' method.
+    compiled_response : bool
+        Predict counts with the compiled response of all observations, see
+        `~gammapy.spectrum.SpectrumFit`. Recommended for many observations.
     """
 
-    def __init__(self, obs, groups, model):
+    def __init__(self, obs, groups, model, method='fit', n_jobs=1, compiled_response=False):
         self.obs = obs
         self.groups = groups
         self.model = model
+        self.method = method
+        self.n_jobs = n_jobs
+        self.compiled_response = compiled_response
         self.flux_points = None
 
     def __str__(self):
@@ -609,14 +627,30 @@ class FluxPointEstimator(object):
         return s
 
     def compute_points(self):
-        rows = []
+        groups = []
         for group in self.groups:
             if group.bin_type != 'normal':
                 log.debug('Skipping energy group:\n{}'.format(group))
                 continue
-
-            row = self.compute_flux_point(group)
-            rows.append(row)
+            groups.append(group)
+
+        if self.method == 'fit':
+            rows = [self.compute_flux_point(group) for group in groups]
+        elif self.method == 'template':
+            # Only the observations and the model are passed to the workers
+            compute = partial(
+                _template_flux_point,
+                obs=self.obs,
+                global_model=self.model,
+                compiled_response=self.compiled_response,
+            )
+            if self.n_jobs > 1:
+                with contextlib.closing(Pool(processes=self.n_jobs)) as pool:
+                    rows = pool.map(compute, groups)
+            else:
+                rows = [compute(group) for group in groups]
+        else:
+            raise ValueError('Invalid method: {}'.format(self.method))
 
         meta = OrderedDict([
             ('method', 'TODO'),
@@ -636,7 +670,12 @@ class FluxPointEstimator(object):
         # Put at log center of the bin
         energy_ref = np.sqrt(energy_group.energy_min * energy_group.energy_max)
 
-        return self.fit_point(
+        if self.method == 'template':
+            fit_point = self.fit_point_template
+        else:
+            fit_point = self.fit_point
+
+        return fit_point(
             model=model,
             energy_group=energy_group,
             energy_ref=energy_ref,
@@ -762,7 +801,7 @@ class FluxPointEstimator(object):
         # Set reference and remove min amplitude
         model.parameters['reference'].value = energy_ref.to('TeV').value
 
-        fit = SpectrumFit(self.obs, model)
+        fit = SpectrumFit(self.obs, model, compiled_response=self.compiled_response)
 
         # TODO: Notice channels contained in energy_group
         fit.fit_range = energy_min, energy_max
@@ -798,6 +837,209 @@ class FluxPointEstimator(object):
             ('dnde_errn', dnde_errn)
         ])
 
+    def fit_point_template(self, model, energy_group, energy_ref, sqrt_ts_threshold=1):
+        """Compute one flux point on the 1D amplitude likelihood profile.
+
+        The predicted counts are proportional to the amplitude of the
+        approximate model, so they are forward-folded only once, for unit
+        amplitude. Fit, sqrt(TS) and limits are then computed from this
+        template, without re-predicting counts. The amplitude fit is started
+        at the global model.
+
+        Parameters
+        ----------
+        model : `~gammapy.spectrum.models.SpectralModel`
+            Approximate model, only the amplitude is fitted
+        energy_group : `~gammapy.spectrum.SpectrumEnergyGroup`
+            Energy group
+        energy_ref : `~astropy.units.Quantity`
+            Reference energy of the flux point
+        sqrt_ts_threshold : float
+            Flux points with lower sqrt(TS) are flagged as upper limits
+
+        Returns
+        -------
+        row : `~collections.OrderedDict`
+            Flux point, same as for `fit_point`
+        """
+        return _fit_point_template(
+            obs=self.obs,
+            global_model=self.model,
+            model=model,
+            energy_group=energy_group,
+            energy_ref=energy_ref,
+            compiled_response=self.compiled_response,
+            sqrt_ts_threshold=sqrt_ts_threshold,
+        )
+
+
+def _template_flux_point(energy_group, obs, global_model, compiled_response=False):
+    """Template flux point for one energy group, see `FluxPointEstimator.compute_points`."""
+    model = FluxPointEstimator.compute_approx_model(global_model, energy_group)
+    energy_ref = np.sqrt(energy_group.energy_min * energy_group.energy_max)
+    return _fit_point_template(obs, global_model, model, energy_group, energy_ref,
+                               compiled_response=compiled_response)
+
+
+def _fit_point_template(obs, global_model, model, energy_group, energy_ref,
+                        compiled_response=False, sqrt_ts_threshold=1):
+    """Flux point on the amplitude likelihood profile, see `FluxPointEstimator.fit_point_template`."""
+    from .fit import SpectrumFit
+
+    energy_min = energy_group.energy_min
+    energy_max = energy_group.energy_max
+
+    model.parameters['reference'].value = energy_ref.to('TeV').value
+    amplitude = model.parameters['amplitude']
+    amplitude_start = (global_model(energy_ref) / model(energy_ref)).to('').value
+    amplitude_start *= amplitude.value
+
+    fit = SpectrumFit(obs, model, compiled_response=compiled_response)
+    fit.fit_range = energy_min, energy_max
+
+    amplitude.value = 1
+    dnde_unit = model(energy_ref)
+    fit.predict_counts()
+
+    profile = _AmplitudeProfile.from_fit(fit)
+    best, error, stat_best = profile.fit(amplitude_start)
+
+    amplitude.value = best
+    dnde = best * dnde_unit
+    dnde_err = error * dnde_unit
+
+    ts = np.abs(profile.stat(0) - stat_best)
+    sqrt_ts = np.sign(best) * np.sqrt(ts)
+
+    def limit(delta_ts, negative=False):
+        return profile.limit(best, error, stat_best, delta_ts, negative) * dnde_unit
+
+    dnde_ul = limit(4)
+    dnde_errp = limit(1) - dnde
+    dnde_errn = dnde - limit(1, negative=True)
+
+    return OrderedDict([
+        ('e_ref', energy_ref),
+        ('e_min', energy_min),
+        ('e_max', energy_max),
+        ('dnde', dnde.to(DEFAULT_UNIT['dnde'])),
+        ('dnde_err', dnde_err.to(DEFAULT_UNIT['dnde'])),
+        ('dnde_ul', dnde_ul.to(DEFAULT_UNIT['dnde'])),
+        ('is_ul', sqrt_ts < sqrt_ts_threshold),
+        ('sqrt_ts', sqrt_ts),
+        ('dnde_errp', dnde_errp),
+        ('dnde_errn', dnde_errn)
+    ])
+
+
+class _AmplitudeProfile(object):
+    """Fit statistic as a function of the amplitude.
+
+    Parameters
+    ----------
+    template : `~numpy.ndarray`
+        Predicted source counts for unit amplitude, for all bins in the fit range
+    n_on, n_off : `~numpy.ndarray`
+        Counts in the same bins, ``n_off`` is None for a ``cash`` fit
+    alpha : `~numpy.ndarray`
+        Exposure ratio between on and off region in the same bins
+    """
+
+    def __init__(self, template, n_on, n_off=None, alpha=None):
+        self.template = template
+        self.n_on = n_on
+        self.n_off = n_off
+        self.alpha = alpha
+
+    @classmethod
+    def from_fit(cls, fit):
+        """Collect template and counts of all bins in the fit range of a `SpectrumFit`."""
+        if fit.stat not in ['cash', 'wstat'] or fit.background_model is not None:
+            raise ValueError('Template flux points only support wstat '
+                             'and cash without background model.')
+
+        template, n_on, n_off, alpha = [], [], [], []
+        for obs, npred, mask in zip(fit.obs_list, fit.predicted_counts, fit.bins_in_fit_range):
+            mask = np.asarray(mask, dtype=bool)
+            template.append(npred[0][mask])
+            n_on.append(obs.on_vector.data.data.value[mask])
+            if fit.stat == 'wstat':
+                n_off.append(obs.off_vector.data.data.value[mask])
+                alpha.append(obs.alpha * np.ones(mask.sum()))
+
+        if fit.stat == 'wstat':
+            return cls(np.hstack(template), np.hstack(n_on), np.hstack(n_off), np.hstack(alpha))
+        else:
+            return cls(np.hstack(template), np.hstack(n_on))
+
+    def _derivatives(self, amplitude):
+        from .fit import _stat_derivatives
+        mu_sig = np.asarray(amplitude)[..., np.newaxis] * self.template
+        return _stat_derivatives(mu_sig, self.n_on, self.n_off, self.alpha)
+
+    def stat(self, amplitude):
+        """Total fit statistic, without constant terms."""
+        return np.sum(self._derivatives(amplitude)[0], axis=-1)
+
+    def fit(self, amplitude, max_iter=50, tol=1e-8):
+        """Damped Newton fit of the amplitude.
+
+        Returns
+        -------
+        amplitude, amplitude_err, stat : float
+            Best-fit amplitude, error from the curvature and fit statistic
+        """
+        stat = self.stat(amplitude)
+        for _ in range(max_iter):
+            _, d1, d2 = self._derivatives(amplitude)
+            grad = np.sum(d1 * self.template)
+            curvature = np.sum(d2 * self.template ** 2)
+            if curvature > 0:
+                step = -grad / curvature
+            else:
+                step = -np.sign(grad) * max(abs(amplitude), 1e-30)
+
+            for _ in range(30):
+                stat_new = self.stat(amplitude + step)
+                if stat_new <= stat:
+                    break
+                step *= 0.5
+            else:
+                break
+
+            amplitude += step
+            delta, stat = stat - stat_new, stat_new
+            if delta < tol:
+                break
+
+        curvature = np.sum(self._derivatives(amplitude)[2] * self.template ** 2)
+        with np.errstate(all='ignore'):
+            error = np.sqrt(2 / curvature)
+        return amplitude, error, stat
+
+    def limit(self, amplitude, amplitude_err, stat_best, delta_ts, negative=False):
+        """Amplitude where the fit statistic increased by ``delta_ts``.
+
+        Searches in the same range as `FluxPointEstimator.compute_flux_point_ul`,
+        returns NaN if no solution is found.
+        """
+        from scipy.optimize import brentq
+
+        if negative:
+            amplitude_min, amplitude_max = amplitude - 1E3 * amplitude_err, amplitude
+        else:
+            amplitude_min, amplitude_max = amplitude, amplitude + 1E3 * amplitude_err
+
+        def ts_diff(x):
+            return (stat_best + delta_ts) - self.stat(x)
+
+        try:
+            return brentq(ts_diff, amplitude_min, amplitude_max, maxiter=100,
+                          xtol=1e-6 * amplitude_err)
+        except (RuntimeError, ValueError):
+            log.debug('Flux point upper limit computation failed.')
+            return np.nan
+
 
 class FluxPointProfiles(object):
     """Flux point likelihood profiles.
@@ -7,11 +7,13 @@ import copy
 import operator
 import astropy.units as u
 from astropy.table import Table
+from astropy.utils import lazyproperty
 from ..utils.energy import EnergyBounds
 from ..utils.nddata import NDDataArray, BinnedDataAxis
-from .utils import integrate_spectrum
+from .utils import integrate_spectrum, GaussLegendreIntegrator
 from ..utils.scripts import make_path
 from ..utils.modeling import Parameter, ParameterList
+from ..utils.cache import LRUCache, array_key
 
 __all__ = [
     'SpectralModel',
@@ -28,6 +30,76 @@ __all__ = [
     'Absorption',
 ]
 
+# Canonical units of the unit-free evaluation path, see `SpectralModel.evaluate_numeric`
+NUMERIC_UNITS = ['', 'TeV', 'TeV-1', 'cm-2 s-1 TeV-1', 'cm-2 s-1']
+
+_numeric_scales = dict()
+
+
+def _numeric_scale(unit):
+    """Factor to convert a value in ``unit`` to its canonical numeric unit."""
+    try:
+        return _numeric_scales[unit]
+    except KeyError:
+        pass
+
+    for target in NUMERIC_UNITS:
+        try:
+            scale = u.Unit(unit).to(target)
+        except u.UnitsError:
+            continue
+        _numeric_scales[unit] = scale
+        return scale
+
+    raise ValueError('No canonical numeric unit for: {!r}'.format(unit))
+
+
+def _integrate(func, emin, emax, **kwargs):
+    """Integrate spectrum, using Gauss-Legendre quadrature for bin integrals."""
+    if kwargs.get('intervals', False) and np.ndim(emin) > 0:
+        integrator = GaussLegendreIntegrator.cached(emin, emax)
+        return integrator(func)
+    return integrate_spectrum(func, emin, emax, **kwargs)
+
+
+def _gamma_upper(s, x):
+    r"""Upper incomplete gamma function for any real ``s`` and ``x > 0``.
+
+    For ``s <= 0`` the recurrence
+    :math:`\Gamma(s, x) = (\Gamma(s + 1, x) - x^s e^{-x}) / s` is used.
+    ``s`` and ``x`` can be arrays, the recurrence is then applied per element.
+    """
+    from scipy.special import gamma, gammaincc, exp1
+    x = np.asarray(x, dtype=float)
+    s = np.asarray(s, dtype=float)
+
+    n_steps = np.maximum(np.ceil(-s), 0)
+    s_ = s + n_steps
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        val = np.where(s_ < 1e-10, exp1(x), gamma(s_) * gammaincc(s_, x))
+
+        for step in range(int(n_steps.max())):
+            active = step < n_steps
+            s_ = np.where(active, s_ - 1, s_)
+            val = np.where(active, (val - np.power(x, s_) * np.exp(-x)) / s_, val)
+    return val
+
+
+# Number of energy arrays with cached interpolation results per model
+_CACHE_SIZE = 16
+
+
+def _interp_weights(nodes, values):
+    """Indices and weights for linear interpolation (and extrapolation) on sorted nodes.
+
+    Same convention as `~scipy.interpolate.RegularGridInterpolator`, the
+    interpolated value is ``y[idx] * (1 - weight) + y[idx + 1] * weight``.
+    """
+    idx = np.searchsorted(nodes, values) - 1
+    idx = np.clip(idx, 0, len(nodes) - 2)
+    weight = (values - nodes[idx]) / (nodes[idx + 1] - nodes[idx])
+    return idx, weight
+
 
 class SpectralModel(object):
     """Spectral model base class.
@@ -36,7 +108,15 @@ class SpectralModel(object):
     `~gammapy.utils.modeling.ParameterList`
     See for example return pardict of
     `~gammapy.spectrum.models.PowerLaw`.
+
+    For use in fits there is a unit-free evaluation path, working on
+    `~numpy.ndarray` in the canonical units ``TeV`` for energies,
+    ``cm-2 s-1 TeV-1`` for differential and ``cm-2 s-1`` for integral fluxes,
+    see `~gammapy.spectrum.models.SpectralModel.evaluate_numeric`.
     """
+    # Whether ``evaluate`` works with the plain float parameter values
+    # returned by ``numeric_parameters``
+    _numeric_evaluate = False
 
     def __repr__(self):
         fmt = '{}()'
@@ -63,6 +143,58 @@ class SpectralModel(object):
 
         return self.evaluate(energy, **kwargs)
 
+    def numeric_parameters(self):
+        """Parameter values converted to canonical units (`dict` of float).
+
+        The units are ``TeV`` for energies, ``TeV-1`` for inverse energies,
+        ``cm-2 s-1 TeV-1`` for differential and ``cm-2 s-1`` for integral
+        fluxes. The conversion factors are cached per unit.
+        """
+        pars = dict()
+        for par in self.parameters.parameters:
+            pars[par.name] = par.value * _numeric_scale(par.unit)
+        return pars
+
+    def evaluate_numeric(self, energy):
+        """Evaluate model without units.
+
+        Parameters
+        ----------
+        energy : `~numpy.ndarray`
+            Energy in ``TeV``
+
+        Returns
+        -------
+        dnde : `~numpy.ndarray`
+            Differential flux in ``cm-2 s-1 TeV-1``
+        """
+        if self._numeric_evaluate:
+            return self.evaluate(energy, **self.numeric_parameters())
+
+        dnde = self(energy * u.TeV)
+        return dnde.to('cm-2 s-1 TeV-1').value
+
+    def integral_numeric(self, emin, emax, **kwargs):
+        """Integrate model without units.
+
+        Parameters
+        ----------
+        emin, emax : `~numpy.ndarray`
+            Lower and upper bound of integration range in ``TeV``
+        **kwargs : dict
+            Keyword arguments passed to :func:`~gammapy.spectrum.integrate_spectrum`
+
+        Returns
+        -------
+        flux : `~numpy.ndarray`
+            Integral flux in ``cm-2 s-1``
+        """
+        if self._numeric_evaluate:
+            return _integrate(self.evaluate_numeric, emin, emax, **kwargs)
+
+        flux = self.integral(emin * u.TeV, emax * u.TeV, **kwargs)
+        return flux.to('cm-2 s-1').value
+
     def __mul__(self, model):
         if not isinstance(model, SpectralModel):
             model = ConstantModel(const=model)
@@ -137,7 +269,9 @@ class SpectralModel(object):
             F(E_{min}, E_{max}) = \int_{E_{min}}^{E_{max}}\phi(E)dE
 
         If array input for ``emin`` and ``emax`` is given you have to set
-        ``intervals=True`` if you want the integral in each energy bin.
+        ``intervals=True`` if you want the integral in each energy bin. The bin
+        integrals are then computed using
+        `~gammapy.spectrum.GaussLegendreIntegrator`.
 
         Parameters
         ----------
@@ -146,7 +280,33 @@ class SpectralModel(object):
         **kwargs : dict
             Keyword arguments passed to :func:`~gammapy.spectrum.integrate_spectrum`
         """
-        return integrate_spectrum(self, emin, emax, **kwargs)
+        return _integrate(self, emin, emax, **kwargs)
+
+    def _integral_analytic(self, func, emin, emax):
+        """Evaluate integral ``func`` with energies in units of the reference energy.
+
+        All energy and inverse energy parameters are converted to the unit of
+        the reference energy, the result has the unit ``amplitude * energy``.
+        """
+        pars = self.parameters
+        e_unit = u.Unit(pars['reference'].unit)
+
+        kwargs = dict()
+        for par in pars.parameters:
+            quantity = par.quantity
+            if par.name == 'amplitude':
+                kwargs[par.name] = par.value
+            elif quantity.unit.is_equivalent(e_unit):
+                kwargs[par.name] = quantity.to(e_unit).value
+            elif quantity.unit.is_equivalent(1 / e_unit):
+                kwargs[par.name] = quantity.to(1 / e_unit).value
+            else:
+                kwargs[par.name] = par.value
+
+        emin = u.Quantity(emin).to(e_unit).value
+        emax = u.Quantity(emax).to(e_unit).value
+        val = func(emin, emax, **kwargs)
+        return val * u.Unit(pars['amplitude'].unit) * e_unit
 
     def integral_error(self, emin, emax, **kwargs):
         """Integrate spectral model numerically with error propagation.
@@ -440,6 +600,8 @@ class ConstantModel(SpectralModel):
     const : `~astropy.units.Quantity`
         :math:`k`
     """
+    _numeric_evaluate = True
+
     def __init__(self, const):
         self.parameters = ParameterList([
             Parameter('const', const)
@@ -486,6 +648,15 @@ class CompoundSpectralModel(SpectralModel):
 
         return self.operator(val1, val2)
 
+    def evaluate_numeric(self, energy):
+        val1 = self.model1.evaluate_numeric(energy)
+        val2 = self.model2.evaluate_numeric(energy)
+
+        return self.operator(val1, val2)
+
+    def integral_numeric(self, emin, emax, **kwargs):
+        return _integrate(self.evaluate_numeric, emin, emax, **kwargs)
+
     def to_dict(self):
         retval = dict()
         retval['model1'] = self.model1.to_dict()
@@ -524,6 +695,7 @@ class PowerLaw(SpectralModel):
         plt.show()
 
     """
+    _numeric_evaluate = True
 
     def __init__(self, index=2., amplitude=1E-12 * u.Unit('cm-2 s-1 TeV-1'),
                  reference=1 * u.TeV):
@@ -569,6 +741,26 @@ class PowerLaw(SpectralModel):
 
         return prefactor * (upper - lower)
 
+    @staticmethod
+    def evaluate_integral(emin, emax, index, amplitude, reference):
+        """Evaluate the integral (static function), for ``index != 1``."""
+        val = -1 * index + 1
+        upper = np.power(emax / reference, val)
+        lower = np.power(emin / reference, val)
+        return amplitude * reference / val * (upper - lower)
+
+    def integral_numeric(self, emin, emax, **kwargs):
+        """Integrate power law analytically without units.
+
+        See `~gammapy.spectrum.models.SpectralModel.integral_numeric`.
+        """
+        pars = self.numeric_parameters()
+
+        if np.isclose(pars['index'], 1):
+            return pars['amplitude'] * pars['reference'] * np.log(emax / emin)
+
+        return self.evaluate_integral(emin, emax, **pars)
+
     def integral_error(self, emin, emax, **kwargs):
         r"""Integrate power law analytically with error propagation.
 
@@ -727,6 +919,7 @@ class PowerLaw2(SpectralModel):
         pwl2.plot(energy_range=[0.1, 100] * u.TeV)
         plt.show()
     """
+    _numeric_evaluate = True
 
     def __init__(self, amplitude=1E-12 * u.Unit('cm-2 s-1'), index=2,
                  emin=0.1 * u.TeV, emax=100 * u.TeV):
@@ -772,6 +965,23 @@ class PowerLaw2(SpectralModel):
 
         return pars['amplitude'].quantity * top / bottom
 
+    @staticmethod
+    def evaluate_integral(energy_min, energy_max, amplitude, index, emin, emax):
+        """Evaluate the integral (static function)."""
+        val = -1 * index + 1
+
+        top = np.power(energy_max, val) - np.power(energy_min, val)
+        bottom = np.power(emax, val) - np.power(emin, val)
+        return amplitude * top / bottom
+
+    def integral_numeric(self, emin, emax, **kwargs):
+        """Integrate power law analytically without units.
+
+        See `~gammapy.spectrum.models.SpectralModel.integral_numeric`.
+        """
+        pars = self.numeric_parameters()
+        return self.evaluate_integral(emin, emax, **pars)
+
     def integral_error(self, emin, emax, **kwargs):
         r"""Integrate power law analytically with error propagation.
 
@@ -850,6 +1060,7 @@ class ExponentialCutoffPowerLaw(SpectralModel):
         ecpl.plot(energy_range=[0.1, 100] * u.TeV)
         plt.show()
     """
+    _numeric_evaluate = True
 
     def __init__(self, index=1.5, amplitude=1E-12 * u.Unit('cm-2 s-1 TeV-1'),
                  reference=1 * u.TeV, lambda_=0.1 / u.TeV):
@@ -871,6 +1082,44 @@ class ExponentialCutoffPowerLaw(SpectralModel):
             cutoff = exp(-energy * lambda_)
         return pwl * cutoff
 
+    @staticmethod
+    def evaluate_integral(emin, emax, index, amplitude, reference, lambda_):
+        """Evaluate the integral (static function)."""
+        s = 1 - index
+        val = _gamma_upper(s, lambda_ * emin) - _gamma_upper(s, lambda_ * emax)
+        return amplitude * reference * np.power(lambda_ * reference, -s) * val
+
+    def integral(self, emin, emax, **kwargs):
+        r"""Integrate exponential cutoff power law analytically.
+
+        .. math::
+
+            F(E_{min}, E_{max}) = \phi_0 E_0 (\lambda E_0)^{\Gamma - 1}
+            \left[ \Gamma(1 - \Gamma, \lambda E_{min}) -
+            \Gamma(1 - \Gamma, \lambda E_{max}) \right]
+
+        where :math:`\Gamma(s, x)` is the upper incomplete gamma function.
+        For :math:`\lambda \leq 0` the integral is computed numerically.
+
+        Parameters
+        ----------
+        emin, emax : `~astropy.units.Quantity`
+            Lower and upper bound of integration range.
+        """
+        if self.parameters['lambda_'].value > 0:
+            return self._integral_analytic(self.evaluate_integral, emin, emax)
+        return super(ExponentialCutoffPowerLaw, self).integral(emin, emax, **kwargs)
+
+    def integral_numeric(self, emin, emax, **kwargs):
+        """Integrate exponential cutoff power law analytically without units.
+
+        See `~gammapy.spectrum.models.SpectralModel.integral_numeric`.
+        """
+        pars = self.numeric_parameters()
+        if pars['lambda_'] > 0:
+            return self.evaluate_integral(emin, emax, **pars)
+        return super(ExponentialCutoffPowerLaw, self).integral_numeric(emin, emax, **kwargs)
+
     def to_sherpa(self, name='default'):
         """Convert to a `~sherpa.models.ArithmeticModel`.
 
@@ -946,6 +1195,7 @@ class ExponentialCutoffPowerLaw3FGL(SpectralModel):
         ecpl_3fgl.plot(energy_range=[0.1, 100] * u.TeV)
         plt.show()
     """
+    _numeric_evaluate = True
 
     def __init__(self, index=1.5, amplitude=1E-12 * u.Unit('cm-2 s-1 TeV-1'),
                  reference=1 * u.TeV, ecut=10 * u.TeV):
@@ -1004,6 +1254,7 @@ class PLSuperExpCutoff3FGL(SpectralModel):
         secpl_3fgl.plot(energy_range=[0.1, 100] * u.TeV)
         plt.show()
     """
+    _numeric_evaluate = True
 
     def __init__(self, index_1=1.5, index_2=2, amplitude=1E-12 * u.Unit('cm-2 s-1 TeV-1'),
                  reference=1 * u.TeV, ecut=10 * u.TeV):
@@ -1029,6 +1280,50 @@ class PLSuperExpCutoff3FGL(SpectralModel):
                          - (energy / ecut) ** (index_2))
         return pwl * cutoff
 
+    @staticmethod
+    def evaluate_integral(emin, emax, amplitude, reference, ecut, index_1, index_2):
+        """Evaluate the integral (static function)."""
+        s = (1 - index_1) / index_2
+        val = (_gamma_upper(s, np.power(emin / ecut, index_2)) -
+               _gamma_upper(s, np.power(emax / ecut, index_2)))
+        prefactor = amplitude * np.exp((reference / ecut) ** index_2)
+        prefactor *= np.power(reference / ecut, index_1) * ecut / index_2
+        return prefactor * val
+
+    def integral(self, emin, emax, **kwargs):
+        r"""Integrate super exponential cutoff power law analytically.
+
+        .. math::
+
+            F(E_{min}, E_{max}) = \phi_0 \exp \left( \left(\frac{E_0}{E_{C}} \right)^{\Gamma_2} \right)
+            \left( \frac{E_0}{E_{C}} \right)^{\Gamma_1} \frac{E_C}{\Gamma_2}
+            \left[ \Gamma(s, (E_{min} / E_C)^{\Gamma_2}) -
+            \Gamma(s, (E_{max} / E_C)^{\Gamma_2}) \right]
+
+        with :math:`s = (1 - \Gamma_1) / \Gamma_2` and the upper incomplete
+        gamma function :math:`\Gamma(s, x)`. For :math:`\Gamma_2 \leq 0`
+        the integral is computed numerically.
+
+        Parameters
+        ----------
+        emin, emax : `~astropy.units.Quantity`
+            Lower and upper bound of integration range.
+        """
+        pars = self.parameters
+        if pars['index_2'].value > 0 and pars['ecut'].value > 0:
+            return self._integral_analytic(self.evaluate_integral, emin, emax)
+        return super(PLSuperExpCutoff3FGL, self).integral(emin, emax, **kwargs)
+
+    def integral_numeric(self, emin, emax, **kwargs):
+        """Integrate super exponential cutoff power law analytically without units.
+
+        See `~gammapy.spectrum.models.SpectralModel.integral_numeric`.
+        """
+        pars = self.numeric_parameters()
+        if pars['index_2'] > 0 and pars['ecut'] > 0:
+            return self.evaluate_integral(emin, emax, **pars)
+        return super(PLSuperExpCutoff3FGL, self).integral_numeric(emin, emax, **kwargs)
+
 
 class LogParabola(SpectralModel):
     r"""Spectral log parabola model.
@@ -1073,6 +1368,7 @@ class LogParabola(SpectralModel):
         log_parabola.plot(energy_range=[0.1, 100] * u.TeV)
         plt.show()
     """
+    _numeric_evaluate = True
 
     def __init__(self, amplitude=1E-12 * u.Unit('cm-2 s-1 TeV-1'), reference=10 * u.TeV,
                  alpha=2, beta=1):
@@ -1093,11 +1389,12 @@ class LogParabola(SpectralModel):
     @staticmethod
     def evaluate(energy, amplitude, reference, alpha, beta):
         """Evaluate the model (static function)."""
-        # TODO: can this comment be removed?
-        # cast dimensionless values as np.array, because of bug in Astropy < v1.2
-        # https://github.com/astropy/astropy/issues/4764
+        xx = energy / reference
+        if isinstance(xx, u.Quantity):
+            # cast dimensionless values as np.array, because of bug in Astropy < v1.2
+            # https://github.com/astropy/astropy/issues/4764
+            xx = xx.to('')
         try:
-            xx = (energy / reference).to('')
             exponent = -alpha - beta * np.log(xx)
         except AttributeError:
             from uncertainties.unumpy import log
@@ -1105,6 +1402,61 @@ class LogParabola(SpectralModel):
             exponent = -alpha - beta * log(xx)
         return amplitude * np.power(xx, exponent)
 
+    @staticmethod
+    def evaluate_integral(emin, emax, amplitude, reference, alpha, beta):
+        """Evaluate the integral (static function)."""
+        from scipy.special import erfc, erfcx
+        sqrt_beta = np.sqrt(beta)
+        center = (1 - alpha) / (2 * beta)
+
+        def primitive(energy):
+            # exp(beta * center ** 2) * erfc(z), computed such that it
+            # doesn't overflow for large z
+            y = np.log(energy / reference)
+            z = sqrt_beta * (y - center)
+            with np.errstate(over='ignore', invalid='ignore'):
+                val = np.where(
+                    z >= 0,
+                    np.exp((1 - alpha) * y - beta * y ** 2) * erfcx(z),
+                    np.exp(beta * center ** 2) * erfc(z),
+                )
+            return val
+
+        prefactor = amplitude * reference * np.sqrt(np.pi) / (2 * sqrt_beta)
+        return prefactor * (primitive(emin) - primitive(emax))
+
+    def integral(self, emin, emax, **kwargs):
+        r"""Integrate log parabola analytically.
+
+        With :math:`y = \log(E / E_0)` the integral is a Gaussian integral
+
+        .. math::
+
+            F(E_{min}, E_{max}) = \phi_0 E_0 \int_{y_{min}}^{y_{max}}
+            \exp \left( (1 - \alpha) y - \beta y^2 \right) dy
+
+        which is evaluated using the complementary error function.
+        For :math:`\beta \leq 0` the integral is computed numerically.
+
+        Parameters
+        ----------
+        emin, emax : `~astropy.units.Quantity`
+            Lower and upper bound of integration range.
+        """
+        if self.parameters['beta'].value > 0:
+            return self._integral_analytic(self.evaluate_integral, emin, emax)
+        return super(LogParabola, self).integral(emin, emax, **kwargs)
+
+    def integral_numeric(self, emin, emax, **kwargs):
+        """Integrate log parabola analytically without units.
+
+        See `~gammapy.spectrum.models.SpectralModel.integral_numeric`.
+        """
+        pars = self.numeric_parameters()
+        if pars['beta'] > 0:
+            return self.evaluate_integral(emin, emax, **pars)
+        return super(LogParabola, self).integral_numeric(emin, emax, **kwargs)
+
     @property
     def e_peak(self):
         r"""Spectral energy distribution peak energy (`~astropy.utils.Quantity`).
@@ -1161,6 +1513,7 @@ class TableModel(SpectralModel):
 
         self.lo_threshold = energy[0]
         self.hi_threshold = energy[-1]
+        self._numeric_range = energy[[0, -1]].to('TeV').value
 
         loge = np.log10(self.energy.to('eV').value)
         try:
@@ -1182,6 +1535,7 @@ class TableModel(SpectralModel):
                                 fill_value=-np.Inf,
                                 bounds_error=False,
                                 kind='cubic')
+        self._values_cache = LRUCache(maxsize=_CACHE_SIZE)
 
     @classmethod
     def read_xspec_model(cls, filename, param):
@@ -1258,7 +1612,12 @@ class TableModel(SpectralModel):
         return cls(energy=energy, values=values, scale_logy=False, **kwargs)
 
     def evaluate(self, energy, scale):
-        """Evaluate the model (static function)."""
+        """Evaluate the model (static function).
+
+        The interpolated table values are cached per energy array, so that
+        repeated calls with the same energies, e.g. during a fit, only apply
+        the ``scale``.
+        """
         # What's with all this checking?
         # TODO: Try `np.asanyarray` and always return an array (even for scalar input)?
         is_array = True
@@ -1270,18 +1629,8 @@ class TableModel(SpectralModel):
         # Not working for astropy.units.quantity.Quantity
         # if isinstance(energy, (np.ndarray, np.generic)):
         if is_array:  # Test if array
-            # initialise array value to zero (dim energy)
-            values = np.zeros(len(energy), dtype=float)
-            # mask for energy range
-            mask = (energy >= self.lo_threshold) & (
-                energy <= self.hi_threshold)
-            # apply interpolation for masked values
-            values[mask] = self.interpy(np.log10(energy[mask].to('eV').value))
-            # Get rid of negative values (due to interpolation)
-            # Needed because of the rand.poisson used in SpectrumSimulation class
-            # Should be fixed in the class itself ?
-            if self.scale_logy is False:
-                values[values < 0] = 0.
+            values = self._values_cache.get(array_key(energy),
+                                            lambda: self._interp_array(energy))
         else:  # if not array
             # test if energy is in range
             if (energy >= self.lo_threshold or energy <= self.hi_threshold):
@@ -1289,9 +1638,54 @@ class TableModel(SpectralModel):
             else:
                 values = 0
 
+            if self.scale_logy:
+                values = np.power(10, values)
+        return scale * values * self.unit
+
+    def _interp_array(self, energy):
+        # initialise array value to zero (dim energy)
+        values = np.zeros(len(energy), dtype=float)
+        # mask for energy range
+        mask = (energy >= self.lo_threshold) & (
+            energy <= self.hi_threshold)
+        # apply interpolation for masked values
+        values[mask] = self.interpy(np.log10(energy[mask].to('eV').value))
+        # Get rid of negative values (due to interpolation)
+        # Needed because of the rand.poisson used in SpectrumSimulation class
+        # Should be fixed in the class itself ?
+        if self.scale_logy is False:
+            values[values < 0] = 0.
+
         if self.scale_logy:
             values = np.power(10, values)
-        return scale * values * self.unit
+        return values
+
+    def evaluate_numeric(self, energy):
+        """Evaluate model without units.
+
+        See `~gammapy.spectrum.models.SpectralModel.evaluate_numeric`.
+        """
+        energy = np.asarray(energy, dtype=float)
+        values = self._values_cache.get(('numeric',) + array_key(energy),
+                                        lambda: self._interp_numeric(energy))
+        scale = self.parameters['scale'].value * _numeric_scale(self.unit.to_string())
+        return scale * values
+
+    def _interp_numeric(self, energy):
+        lo, hi = self._numeric_range
+
+        values = np.zeros(energy.shape)
+        mask = (energy >= lo) & (energy <= hi)
+        # interpolation is done in log10(E / eV)
+        values[mask] = self.interpy(np.log10(energy[mask]) + 12)
+        if self.scale_logy:
+            values = np.power(10, values)
+        else:
+            values[values < 0] = 0.
+        return values
+
+    def integral_numeric(self, emin, emax, **kwargs):
+        return _integrate(self.evaluate_numeric, emin, emax, **kwargs)
 
     def plot(self, energy_range, ax=None, energy_unit='TeV',
              n_points=100, **kwargs):
@@ -1395,6 +1789,7 @@ class Absorption(object):
 
         self.data = NDDataArray(axes=axes, data=data)
         self.data.default_interp_kwargs['fill_value'] = None
+        self._energy_weights_cache = LRUCache(maxsize=_CACHE_SIZE)
 
     @classmethod
     def read(cls, filename):
@@ -1486,9 +1881,43 @@ class Absorption(object):
 
         return TableModel(energy=energy, values=values, scale_logy=False)
 
+    @lazyproperty
+    def _interp_nodes(self):
+        return [axis._interp_nodes() for axis in self.data.axes]
+
     def evaluate(self, energy, parameter):
-        """Evaluate model for energy and parameter value."""
-        return self.data.evaluate(energy=energy, parameter=parameter)
+        """Evaluate model for energy and parameter value.
+
+        Linear interpolation in parameter and log energy, as in
+        `~gammapy.utils.nddata.NDDataArray.evaluate`. The energy interpolation
+        indices and weights are cached per energy array, so that for repeated
+        calls with the same energies, e.g. when fitting an
+        `~gammapy.spectrum.models.AbsorbedSpectralModel`, only the parameter
+        weights are computed.
+        """
+        param_axis, energy_axis = self.data.axes
+        param_nodes, energy_nodes = self._interp_nodes
+
+        energy = u.Quantity(energy, copy=False)
+        energy_idx, energy_weight = self._energy_weights_cache.get(
+            array_key(energy),
+            lambda: _interp_weights(energy_nodes, energy_axis._interp_values(
+                energy.to(energy_axis.unit).value).ravel()),
+        )
+
+        parameter = np.atleast_1d(u.Quantity(parameter).to(param_axis.unit).value)
+        param_idx, param_weight = _interp_weights(
+            param_nodes, param_axis._interp_values(parameter).ravel(),
+        )
+        param_weight = param_weight[:, np.newaxis]
+
+        data = self.data.data.value
+        data = data[param_idx] * (1 - param_weight) + data[param_idx + 1] * param_weight
+        values = data[:, energy_idx] * (1 - energy_weight) + data[:, energy_idx + 1] * energy_weight
+
+        values = values.reshape(parameter.shape + energy.shape).squeeze()
+        np.clip(values, 0, None, out=values)
+        return values * self.data.data.unit
 
 
 class AbsorbedSpectralModel(SpectralModel):
@@ -1539,3 +1968,21 @@ class AbsorbedSpectralModel(SpectralModel):
         absorption = self.absorption.evaluate(energy=energy,
                                               parameter=parameter)
         return flux * absorption
+
+    def evaluate_numeric(self, energy):
+        """Evaluate model without units.
+
+        See `~gammapy.spectrum.models.SpectralModel.evaluate_numeric`.
+        """
+        if not self.spectral_model._numeric_evaluate:
+            return super(AbsorbedSpectralModel, self).evaluate_numeric(energy)
+
+        pars = self.numeric_parameters()
+        parameter = pars.pop(self.parameter_name)
+        flux = self.spectral_model.evaluate(energy=energy, **pars)
+        absorption = self.absorption.evaluate(energy=energy * u.TeV,
+                                              parameter=parameter)
+        return flux * u.Quantity(absorption, '').value
+
+    def integral_numeric(self, emin, emax, **kwargs):
+        return _integrate(self.evaluate_numeric, emin, emax, **kwargs)
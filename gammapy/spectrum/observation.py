@@ -9,8 +9,7 @@ from ..utils.scripts import make_path
 from ..utils.energy import EnergyBounds
 from ..utils.table import table_from_row_data
 from ..data import ObservationStats
-from ..irf import EffectiveAreaTable, EnergyDispersion
-from ..irf import IRFStacker
+from ..irf import EffectiveAreaTable, EnergyDispersion, IRFStacker
 from .core import CountsSpectrum, PHACountsSpectrum, PHACountsSpectrumList
 from .utils import CountsPredictor
 
@@ -739,6 +738,12 @@ class SpectrumObservationStacker(object):
     Please refer to the `~gammapy.irf.IRFStacker` for the description
     of how the IRFs are stacked.
 
+    The counts, backscal, livetimes, effective areas and energy dispersion
+    matrices are gathered into arrays with one row per observation, and the
+    sums above are computed with array reductions. The sums are kept, so
+    that more observations can be stacked onto an existing result with
+    `add`, without processing the already stacked observations again.
+
     Parameters
     ----------
     obs_list : `~gammapy.spectrum.SpectrumObservationList`
@@ -775,6 +780,7 @@ class SpectrumObservationStacker(object):
         self.stacked_bkscal_on = None
         self.stacked_bkscal_off = None
         self.stacked_obs = None
+        self._sums = None
 
     def __str__(self):
         ss = self.__class__.__name__
@@ -783,11 +789,41 @@ class SpectrumObservationStacker(object):
 
     def run(self):
         """Run all steps in the correct order."""
+        self._sums = _stacking_sums(self.obs_list)
+        self.stack_counts_vectors()
+        self.stack_aeff()
+        self.stack_edisp()
+        self.stack_obs()
+
+    def add(self, obs_list):
+        """Add observations to the stacked observation.
+
+        Only the new observations are processed, ``stacked_obs`` and the
+        other results are updated.
+
+        Parameters
+        ----------
+        obs_list : `~gammapy.spectrum.SpectrumObservationList`
+            Observations to add
+        """
+        obs_list = SpectrumObservationList(obs_list)
+        if self._sums is None:
+            self._sums = _stacking_sums(self.obs_list)
+
+        if len(obs_list) > 0:
+            self._sums = _add_stacking_sums(self._sums, _stacking_sums(obs_list))
+            self.obs_list.extend(obs_list)
+
         self.stack_counts_vectors()
         self.stack_aeff()
         self.stack_edisp()
         self.stack_obs()
 
+    def _get_sums(self):
+        if self._sums is None:
+            self._sums = _stacking_sums(self.obs_list)
+        return self._sums
+
     def stack_counts_vectors(self):
         """Stack on and off vectors."""
         self.stack_on_vector()
@@ -797,13 +833,17 @@ class SpectrumObservationStacker(object):
 
     def stack_on_vector(self):
         """Stack the on count vector."""
-        on_vector_list = [o.on_vector for o in self.obs_list]
-        self.stacked_on_vector = self.stack_counts_spectrum(on_vector_list)
+        sums = self._get_sums()
+        self.stacked_on_vector = _make_counts_spectrum(
+            sums['energy'], sums['n_on'], sums['quality_on'],
+        )
 
     def stack_off_vector(self):
         """Stack the off count vector."""
-        off_vector_list = [o.off_vector for o in self.obs_list]
-        self.stacked_off_vector = self.stack_counts_spectrum(off_vector_list)
+        sums = self._get_sums()
+        self.stacked_off_vector = _make_counts_spectrum(
+            sums['energy'], sums['n_off'], sums['quality_off'],
+        )
 
     @staticmethod
     def stack_counts_spectrum(counts_spectrum_list):
@@ -815,56 +855,35 @@ class SpectrumObservationStacker(object):
           such that the low (high) threshold of the stacked obs is the minimum
           low (maximum high) threshold of the observation list to be stacked.
         """
-        template = counts_spectrum_list[0].copy()
-        energy = template.energy
-        stacked_data = np.zeros(energy.nbins)
-        stacked_quality = np.ones(energy.nbins)
-        for spec in counts_spectrum_list:
-            stacked_data += spec.counts_in_safe_range.value
-            temp = np.logical_and(stacked_quality,
-                                  spec.quality)
-            stacked_quality = np.array(temp, dtype=int)
-
-        return PHACountsSpectrum(
-            data=stacked_data,
-            energy_lo=energy.lo,
-            energy_hi=energy.hi,
-            quality=stacked_quality,
+        data, quality = _gather_counts(counts_spectrum_list)
+        return _make_counts_spectrum(
+            counts_spectrum_list[0].energy,
+            data.sum(axis=0),
+            np.all(quality, axis=0),
         )
 
     def stack_backscal(self):
         """Stack ``backscal`` for on and off vector."""
-        nbins = self.obs_list[0].e_reco.nbins
-        bkscal_on = np.ones(nbins)
-        bkscal_off = np.zeros(nbins)
+        sums = self._get_sums()
+        n_off = sums['n_off']
+        bkscal_on = np.ones(len(n_off))
 
-        alpha_sum = 0.0
-
-        for obs in self.obs_list:
-            bkscal_on_data = obs.on_vector._backscal_array.copy()
-            bkscal_off_data = obs.off_vector._backscal_array.copy()
-            bkscal_off += (bkscal_on_data / bkscal_off_data) * obs.off_vector.counts_in_safe_range.value
-            alpha_sum += (obs.alpha * obs.off_vector.counts_in_safe_range).sum()
-
-        stacked_bkscal_off = self.stacked_off_vector.data.data.value / bkscal_off
-        alpha_average = alpha_sum / self.stacked_off_vector.counts_in_safe_range.sum()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            bkscal_off = n_off / sums['alpha_n_off']
 
         # there should be no nan values in backscal_on or backscal_off
         # this leads to problems when fitting the data
-        # use 1 for backscale of on_vector and 1 / alpha_average for backscale of off_vector
-        alpha_correction = 1
-        idx = np.where(self.stacked_off_vector.data.data == 0)[0]
-        bkscal_on[idx] = alpha_correction
-        # For the bins where the stacked OFF counts equal 0, the alpha value is performed by weighting on the total
-        # OFF counts of each run
-        stacked_bkscal_off[idx] = alpha_correction / alpha_average
+        # For the bins where the stacked OFF counts equal 0, the alpha value is
+        # obtained by weighting on the total OFF counts of each run
+        alpha_average = sums['alpha_n_off'].sum() / n_off.sum()
+        bkscal_off[n_off == 0] = 1 / alpha_average
 
         self.stacked_bkscal_on = bkscal_on
-        self.stacked_bkscal_off = stacked_bkscal_off
+        self.stacked_bkscal_off = bkscal_off
 
     def setup_counts_vectors(self):
         """Add correct attributes to stacked counts vectors."""
-        total_livetime = self.obs_list.total_livetime
+        total_livetime = Quantity(self._get_sums()['livetime'], 's')
         self.stacked_on_vector.livetime = total_livetime
         self.stacked_off_vector.livetime = total_livetime
         self.stacked_on_vector.backscal = self.stacked_bkscal_on
@@ -875,29 +894,33 @@ class SpectrumObservationStacker(object):
     def stack_aeff(self):
         """Stack effective areas (weighted by livetime).
 
-        Calls `gammapy.irf.IRFStacker.stack_aeff`.
+        See `gammapy.irf.IRFStacker.stack_aeff`.
         """
-        irf_stacker = IRFStacker(
-            list_aeff=[obs.aeff for obs in self.obs_list],
-            list_livetime=[obs.livetime for obs in self.obs_list],
+        sums = self._get_sums()
+        energy = sums['e_true']
+        self.stacked_aeff = EffectiveAreaTable(
+            energy_lo=energy.lo,
+            energy_hi=energy.hi,
+            data=Quantity(sums['aeff_livetime'] / sums['livetime'], 'cm2'),
         )
-        irf_stacker.stack_aeff()
-        self.stacked_aeff = irf_stacker.stacked_aeff
 
     def stack_edisp(self):
         """Stack energy dispersion (weighted by exposure).
 
-        Calls `~gammapy.irf.IRFStacker.stack_edisp`
+        See `~gammapy.irf.IRFStacker.stack_edisp`
         """
-        irf_stacker = IRFStacker(
-            list_aeff=[obs.aeff for obs in self.obs_list],
-            list_livetime=[obs.livetime for obs in self.obs_list],
-            list_edisp=[obs.edisp for obs in self.obs_list],
-            list_low_threshold=[obs.lo_threshold for obs in self.obs_list],
-            list_high_threshold=[obs.hi_threshold for obs in self.obs_list],
+        sums = self._get_sums()
+        aeff_livetime = sums['aeff_livetime'][:, np.newaxis]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            data = np.nan_to_num(sums['aeff_livetime_edisp'] / aeff_livetime)
+
+        self.stacked_edisp = EnergyDispersion(
+            e_true_lo=sums['e_true'].lo,
+            e_true_hi=sums['e_true'].hi,
+            e_reco_lo=sums['e_reco'].lo,
+            e_reco_hi=sums['e_reco'].hi,
+            data=data,
         )
-        irf_stacker.stack_edisp()
-        self.stacked_edisp = irf_stacker.stacked_edisp
 
     def stack_obs(self):
         """Create stacked `~gammapy.spectrum.SpectrumObservation`"""
@@ -907,3 +930,62 @@ class SpectrumObservationStacker(object):
             aeff=self.stacked_aeff,
             edisp=self.stacked_edisp,
         )
+
+
+def _gather_counts(counts_spectrum_list):
+    """Counts in safe range and quality as arrays of shape (n_obs, n_bins)."""
+    data = np.array([spec.data.data.value for spec in counts_spectrum_list], dtype=float)
+    quality = np.array([spec.quality for spec in counts_spectrum_list], dtype=bool)
+    data[quality] = 0
+    return data, quality
+
+
+def _make_counts_spectrum(energy, data, quality):
+    return PHACountsSpectrum(
+        data=data,
+        energy_lo=energy.lo,
+        energy_hi=energy.hi,
+        quality=np.array(quality, dtype=int),
+    )
+
+
+def _stacking_sums(obs_list):
+    """Sums over observations needed for the stacked observation."""
+    n_on, quality_on = _gather_counts([obs.on_vector for obs in obs_list])
+    n_off, quality_off = _gather_counts([obs.off_vector for obs in obs_list])
+
+    backscal_on = np.array([obs.on_vector._backscal_array for obs in obs_list])
+    backscal_off = np.array([obs.off_vector._backscal_array for obs in obs_list])
+
+    irf_sums = IRFStacker(
+        list_aeff=[obs.aeff for obs in obs_list],
+        list_livetime=[obs.livetime for obs in obs_list],
+        list_edisp=[obs.edisp for obs in obs_list],
+        list_low_threshold=[obs.lo_threshold for obs in obs_list],
+        list_high_threshold=[obs.hi_threshold for obs in obs_list],
+    )._stacking_sums()
+
+    return dict(
+        energy=obs_list[0].on_vector.energy,
+        e_true=obs_list[0].aeff.energy,
+        e_reco=obs_list[0].edisp.e_reco,
+        n_on=n_on.sum(axis=0),
+        n_off=n_off.sum(axis=0),
+        quality_on=np.all(quality_on, axis=0),
+        quality_off=np.all(quality_off, axis=0),
+        alpha_n_off=np.sum(backscal_on / backscal_off * n_off, axis=0),
+        livetime=irf_sums['livetime'],
+        aeff_livetime=irf_sums['aeff_livetime'],
+        aeff_livetime_edisp=irf_sums['aeff_livetime_edisp'],
+    )
+
+
+def _add_stacking_sums(sums, other):
+    """Combine the sums of two sets of observations."""
+    result = dict(sums)
+    for key in ['quality_on', 'quality_off']:
+        result[key] = sums[key] & other[key]
+    for key in ['n_on', 'n_off', 'alpha_n_off', 'livetime',
+                'aeff_livetime', 'aeff_livetime_edisp']:
+        result[key] = sums[key] + other[key]
+    return result
@@ -114,6 +114,43 @@ class SpectrumSimulation(object):
             self.simulate_obs(seed=current_seed, obs_id=current_seed)
             self.result.append(self.obs)
 
+    def simulate_counts(self, n_obs, random_state='random-seed'):
+        """Simulate on and off counts for many observations at once.
+
+        The counts of all realisations are drawn with one call per component
+        from the same random state, without creating a
+        `~gammapy.spectrum.SpectrumObservation` for each of them. This is
+        meant for large Monte Carlo studies, the counts can be fitted e.g.
+        with `~gammapy.spectrum.PowerLawBatchFit`.
+
+        Parameters
+        ----------
+        n_obs : int
+            Number of realisations
+        random_state : {int, 'random-seed', 'global-rng', `~numpy.random.RandomState`}
+            see :func:~`gammapy.utils.random.get_random_state`
+
+        Returns
+        -------
+        on_counts : `~numpy.ndarray`
+            On counts with shape ``(n_obs, n_bins)``
+        off_counts : `~numpy.ndarray`
+            Off counts with shape ``(n_obs, n_bins)``, ``None`` if no
+            background model is set
+        """
+        random_state = get_random_state(random_state)
+        npred_source = self.npred_source.data.data.value
+        size = (n_obs, len(npred_source))
+
+        on_counts = random_state.poisson(npred_source, size=size)
+        off_counts = None
+        if self.background_model is not None:
+            npred_background = self.npred_background.data.data.value
+            on_counts += random_state.poisson(npred_background, size=size)
+            off_counts = random_state.poisson(npred_background / self.alpha, size=size)
+
+        return on_counts, off_counts
+
     def reset(self):
         """Clear all results."""
         self.result = SpectrumObservationList()
@@ -1,12 +1,22 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import copy
+import logging
 import pytest
 import numpy as np
 from numpy.testing import assert_allclose
 import astropy.units as u
+from astropy.coordinates import SkyCoord
+from astropy.table import Table
+from astropy.utils.exceptions import AstropyDeprecationWarning
+from regions import CircleSkyRegion
 from ...utils.testing import assert_quantity_allclose
 from ...utils.testing import requires_dependency, requires_data
+from ...data import EventList, HDULocation
+from ...irf import EffectiveAreaTable2D, EnergyDispersion2D
+from ...irf.tests.test_psf_analytical import make_test_psf
 from ...spectrum import SpectrumExtraction, SpectrumObservation
+from ...spectrum.extract import _containment_correction, _table_containment
 from ...background.tests.test_reflected import bkg_estimator, obs_list
 
 
@@ -112,3 +122,225 @@ class TestSpectrumExtraction:
         extraction.compute_energy_threshold(method_lo="area_max", area_percent_lo=10)
         actual = extraction.observations[0].lo_threshold
         assert_quantity_allclose(actual, 0.6812920690579611 * u.TeV, rtol=1e-3)
+
+
+class _Observation(object):
+    """Observation with IRFs loaded on access, like `~gammapy.data.DataStoreObservation`."""
+
+    def __init__(self, obs_id, pointing_radec, irfs):
+        self.obs_id = obs_id
+        self.pointing_radec = pointing_radec
+        self.observation_live_time_duration = 1800 * u.s
+        self._irfs = irfs
+
+    def __str__(self):
+        return 'Observation {}'.format(self.obs_id)
+
+    @property
+    def aeff(self):
+        return copy.deepcopy(self._irfs['aeff'])
+
+    @property
+    def edisp(self):
+        return copy.deepcopy(self._irfs['edisp'])
+
+    @property
+    def psf(self):
+        return copy.deepcopy(self._irfs['psf'])
+
+
+class _HDULocation(HDULocation):
+    """HDU location that loads an IRF given in memory."""
+
+    def __init__(self, obs_id, hdu_type, file_name, irf):
+        super(_HDULocation, self).__init__(obs_id, hdu_type, hdu_type, '.', '.',
+                                           file_name, hdu_type)
+        self.irf = irf
+
+    def load(self):
+        return copy.deepcopy(self.irf)
+
+
+class _DataStoreObservation(_Observation):
+    """Observation with IRFs stored in a file, like `~gammapy.data.DataStoreObservation`."""
+
+    def __init__(self, obs_id, pointing_radec, irfs, file_name):
+        super(_DataStoreObservation, self).__init__(obs_id, pointing_radec, irfs)
+        self.file_name = file_name
+
+    def location(self, hdu_type):
+        return _HDULocation(self.obs_id, hdu_type, self.file_name, self._irfs[hdu_type])
+
+    @property
+    def aeff(self):
+        raise AssertionError('IRFs should be loaded from their location')
+
+    edisp = psf = aeff
+
+
+class _BackgroundEstimate(object):
+    def __init__(self, on_region, on_events, off_events, a_off):
+        self.on_region = on_region
+        self.on_events = on_events
+        self.off_events = off_events
+        self.a_on = 1
+        self.a_off = a_off
+
+
+def _make_irfs(aeff_scale=1):
+    energy = np.logspace(-1, 2, 31) * u.TeV
+    offset = np.linspace(0, 2.5, 6) * u.deg
+    data = np.outer(np.ones(30), np.linspace(1, 0.5, 5)) * aeff_scale * 1e5 * u.m ** 2
+    aeff = EffectiveAreaTable2D(energy_lo=energy[:-1], energy_hi=energy[1:],
+                                offset_lo=offset[:-1], offset_hi=offset[1:],
+                                data=data, meta=dict(LO_THRES=0.3, HI_THRES=50))
+    migra = np.linspace(0.2, 5, 100)
+    edisp = EnergyDispersion2D.from_gauss(e_true=energy, migra=migra, bias=0,
+                                          sigma=0.2, offset=offset)
+    return dict(aeff=aeff, edisp=edisp, psf=make_test_psf())
+
+
+def _make_onoff_obs(offsets, aeff_scales=None, file_names=None):
+    """Observations at the given offsets from the on region, with their background estimates.
+
+    With ``file_names``, the observations have IRF locations like observations from a data store.
+    """
+    rng = np.random.RandomState(0)
+    center = SkyCoord(83.63, 22.01, unit='deg')
+    on_region = CircleSkyRegion(center=center, radius=0.11 * u.deg)
+    aeff_scales = aeff_scales or [1] * len(offsets)
+    irfs = dict((scale, _make_irfs(scale)) for scale in set(aeff_scales))
+
+    obs_list, bkg_estimate = [], []
+    for idx, (offset, scale) in enumerate(zip(offsets, aeff_scales)):
+        pointing = SkyCoord(center.ra, center.dec + offset * u.deg)
+        if file_names is None:
+            obs = _Observation(idx, pointing, irfs[scale])
+        else:
+            obs = _DataStoreObservation(idx, pointing, irfs[scale], file_names[idx])
+        obs_list.append(obs)
+        on_events, off_events = [EventList(Table(dict(ENERGY=rng.uniform(0.1, 50, n) * u.TeV)))
+                                 for n in [200, 600]]
+        bkg_estimate.append(_BackgroundEstimate(on_region, on_events, off_events, a_off=3))
+    return obs_list, bkg_estimate
+
+
+def assert_observations_equal(actual, desired):
+    assert len(actual) == len(desired)
+    for obs_actual, obs_desired in zip(actual, desired):
+        assert_allclose(obs_actual.on_vector.data.data, obs_desired.on_vector.data.data)
+        assert_allclose(obs_actual.off_vector.data.data, obs_desired.off_vector.data.data)
+        assert_quantity_allclose(obs_actual.on_vector.offset, obs_desired.on_vector.offset)
+        assert_quantity_allclose(obs_actual.aeff.data.data, obs_desired.aeff.data.data)
+        assert_allclose(obs_actual.edisp.data.data, obs_desired.edisp.data.data)
+        assert_quantity_allclose(obs_actual.lo_threshold, obs_desired.lo_threshold)
+        assert_quantity_allclose(obs_actual.hi_threshold, obs_desired.hi_threshold)
+
+
+@requires_dependency('scipy')
+@pytest.mark.parametrize('containment_correction', [False, True])
+def test_extraction_n_jobs(containment_correction, caplog):
+    caplog.set_level(logging.INFO)
+    obs_list, bkg_estimate = _make_onoff_obs([0.5, 0.5, 1.2, 0.5])
+    e_true = np.logspace(-1, 1.9, 30) * u.TeV
+    e_reco = np.logspace(-1, 1.5, 20) * u.TeV
+    kwargs = dict(e_true=e_true, e_reco=e_reco, containment_correction=containment_correction)
+
+    extraction = SpectrumExtraction(obs_list, bkg_estimate, **kwargs)
+    serial = [extraction.process(obs, bkg) for obs, bkg in zip(obs_list, bkg_estimate)]
+    extraction.run()
+    assert 'Reducing IRFs for 4 observations in 2 groups' in caplog.text
+    assert_observations_equal(extraction.observations, serial)
+
+    extraction_parallel = SpectrumExtraction(obs_list, bkg_estimate, n_jobs=2, **kwargs)
+    extraction_parallel.run()
+    assert_observations_equal(extraction_parallel.observations, serial)
+
+    # Observations of a group get their own copy of the IRFs
+    aeff = extraction.observations[0].aeff
+    assert aeff is not extraction.observations[1].aeff
+    assert_allclose(aeff.data.data, extraction.observations[1].aeff.data.data)
+
+
+@requires_dependency('scipy')
+def test_extraction_groups(caplog):
+    caplog.set_level(logging.INFO)
+    offsets = [0.51, 0.52, 0.51, 0.8]
+    obs_list, bkg_estimate = _make_onoff_obs(offsets, aeff_scales=[1, 1, 2, 1])
+    e_true = np.logspace(-1, 1.9, 30) * u.TeV
+
+    # The IRFs are grouped on content and exact offset
+    extraction = SpectrumExtraction(obs_list, bkg_estimate, e_true=e_true)
+    extraction.run()
+    assert 'Reducing IRFs for 4 observations in 4 groups' in caplog.text
+
+    # and on the offset bin, the IRFs are reduced at the bin center
+    extraction = SpectrumExtraction(obs_list, bkg_estimate, e_true=e_true,
+                                    offset_binsize=0.1 * u.deg)
+    serial = [extraction.process(obs, bkg) for obs, bkg in zip(obs_list, bkg_estimate)]
+    extraction.run()
+    assert 'Reducing IRFs for 4 observations in 3 groups' in caplog.text
+    assert_observations_equal(extraction.observations, serial)
+
+    aeff = [obs.aeff.data.data.to('m2').value for obs in extraction.observations]
+    desired = obs_list[0].aeff.to_effective_area_table(0.5 * u.deg, energy=e_true)
+    assert_allclose(aeff[0], desired.data.data.to('m2').value)
+    assert_allclose(aeff[1], aeff[0])
+    assert_allclose(aeff[2], 2 * aeff[0])
+    assert_allclose(extraction.observations[1].on_vector.offset.to('deg').value, 0.52)
+
+
+@requires_dependency('scipy')
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_extraction_locations(n_jobs, caplog):
+    caplog.set_level(logging.INFO)
+    offsets = [0.5, 0.5, 0.5, 1.2, 0.5]
+    aeff_scales = [1, 1, 2, 1, 1]
+    # Same IRFs in different files are not grouped
+    file_names = ['a.fits', 'a.fits', 'b.fits', 'a.fits', 'c.fits']
+    obs_list, bkg_estimate = _make_onoff_obs(offsets, aeff_scales, file_names)
+    e_true = np.logspace(-1, 1.9, 30) * u.TeV
+    kwargs = dict(e_true=e_true, containment_correction=True)
+
+    # The IRFs are only loaded in `_reduce_irfs`, `_DataStoreObservation` raises otherwise
+    extraction = SpectrumExtraction(obs_list, bkg_estimate, n_jobs=n_jobs, **kwargs)
+    extraction.run()
+    assert 'Reducing IRFs for 5 observations in 4 groups' in caplog.text
+
+    desired_obs_list, _ = _make_onoff_obs(offsets, aeff_scales)
+    desired = [extraction.process(obs, bkg) for obs, bkg in zip(desired_obs_list, bkg_estimate)]
+    assert_observations_equal(extraction.observations, desired)
+    aeff = [obs.aeff.data.data.to('m2').value for obs in extraction.observations]
+    assert_allclose(aeff[2], 2 * aeff[0])
+
+
+@requires_dependency('scipy')
+def test_containment_correction():
+    psf = make_test_psf()
+    energy = np.logspace(-1, 1.9, 30) * u.TeV
+    offset, radius = 0.5 * u.deg, 0.11 * u.deg
+
+    # The analytic containment agrees with the table PSF, up to its interpolation
+    actual = _containment_correction(psf, offset, radius, energy)
+    assert_allclose(actual, psf.containment(energy, offset, radius))
+    desired = _table_containment(psf, offset, radius, energy)
+    assert_allclose(actual, desired, rtol=2e-2)
+
+
+@requires_dependency('scipy')
+def test_extraction_deprecated_methods():
+    obs_list, bkg_estimate = _make_onoff_obs([0.5])
+    obs, bkg = obs_list[0], bkg_estimate[0]
+    extraction = SpectrumExtraction(obs_list, bkg_estimate, containment_correction=True)
+    desired = extraction.process(obs, bkg)
+
+    with pytest.warns(AstropyDeprecationWarning):
+        extraction.make_empty_vectors(obs, bkg)
+        extraction.extract_counts(bkg)
+        extraction.extract_irfs(obs)
+        extraction.apply_containment_correction(obs, bkg)
+
+    assert_allclose(extraction._on_vector.data.data, desired.on_vector.data.data)
+    assert_allclose(extraction._off_vector.data.data, desired.off_vector.data.data)
+    assert_quantity_allclose(extraction._aeff.data.data, desired.aeff.data.data)
+    assert_allclose(extraction._edisp.data.data, desired.edisp.data.data)
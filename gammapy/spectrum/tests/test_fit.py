@@ -170,6 +170,31 @@ class TestFit:
         actual = scan_idx[argmin]
         assert_allclose(actual, true_idx, rtol=0.01)
 
+    @requires_dependency('iminuit')
+    def test_likelihood_profile_grid(self):
+        obs = SpectrumObservation(on_vector=self.src)
+        fit = SpectrumFit(obs_list=obs, stat='cash', model=self.source_model,
+                          forward_folded=False, method='iminuit')
+        fit.fit()
+        pars = fit._model.parameters
+        true_idx = pars['index'].value
+        true_amp = pars['amplitude'].value
+        values = {
+            'index': np.linspace(0.95, 1.05, 11) * true_idx,
+            'amplitude': np.linspace(0.9, 1.1, 5) * true_amp,
+        }
+        profile = fit.likelihood_profile(values)
+        assert profile['stat'].shape == (11, 5)
+        idx = np.unravel_index(np.argmin(profile['stat']), (11, 5))
+        assert idx == (5, 2)
+        assert_allclose(pars['index'].value, true_idx)
+
+        profile_pool = fit.likelihood_profile(values, n_jobs=2)
+        assert_allclose(profile_pool['stat'], profile['stat'])
+
+        profile = fit.likelihood_profile({'index': values['index']}, reoptimize=True)
+        assert_allclose(profile['stat'].min(), fit.total_stat(pars), rtol=1e-4)
+
     @requires_dependency('matplotlib')
     def test_plot(self):
         obs = SpectrumObservation(on_vector=self.src)
@@ -363,3 +388,150 @@ class TestSpectralFit:
         sau.fit()
         assert_allclose(model.pars[0].val, 2.0881699260935838)
         assert_allclose(model.pars[2].val, 1.6234222129479836)
+
+
+@requires_dependency('scipy')
+def test_compiled_response():
+    from ...irf import EnergyDispersion
+    from ...spectrum import SpectrumSimulation
+
+    e_true = np.logspace(-2, 2.5, 109) * u.TeV
+    e_reco = np.logspace(-2, 2, 73) * u.TeV
+    aeff = EffectiveAreaTable.from_parametrization(energy=e_true)
+    edisp = EnergyDispersion.from_gauss(e_true=e_true, e_reco=e_reco, sigma=0.2, bias=0)
+    model = models.PowerLaw(index=2.3 * u.Unit(''),
+                            amplitude=2.5e-12 * u.Unit('cm-2 s-1 TeV-1'),
+                            reference=1 * u.TeV)
+    bkg_model = models.PowerLaw(index=2.5 * u.Unit(''),
+                                amplitude=1e-11 * u.Unit('cm-2 s-1 TeV-1'),
+                                reference=1 * u.TeV)
+
+    sim = SpectrumSimulation(aeff=aeff, edisp=edisp, source_model=model,
+                             livetime=1 * u.h, background_model=bkg_model, alpha=0.2)
+    sim.run(seed=[0, 1, 2])
+    obs_list = sim.result
+    obs_list[1].on_vector.livetime = 2 * u.h
+    obs_list[2].on_vector.areascal = np.linspace(0.5, 1, 72)
+
+    fits = [SpectrumFit(obs_list, model, fit_range=[0.5, 50] * u.TeV,
+                        compiled_response=compiled) for compiled in [False, True]]
+    stats = [fit.total_stat(model.parameters) for fit in fits]
+    assert_allclose(stats[1], stats[0])
+
+    for desired, actual in zip(*[fit.predicted_counts for fit in fits]):
+        assert_allclose(actual[0], desired[0])
+        assert_allclose(actual[1], desired[1])
+
+
+def make_observations_unequal_bins():
+    """Observations without IRFs and with different numbers of bins."""
+    random_state = get_random_state(0)
+    obs_list = []
+    for nbins, alpha in zip([30, 20], [0.1, 0.25]):
+        binning = np.logspace(-1, 1, nbins + 1) * u.TeV
+        on_vector = PHACountsSpectrum(energy_lo=binning[:-1], energy_hi=binning[1:],
+                                      data=random_state.poisson(50, nbins), backscal=1)
+        on_vector.livetime = 1 * u.s
+        off_vector = PHACountsSpectrum(energy_lo=binning[:-1], energy_hi=binning[1:],
+                                       data=random_state.poisson(20, nbins),
+                                       backscal=1. / alpha, is_bkg=True)
+        obs_list.append(SpectrumObservation(on_vector=on_vector, off_vector=off_vector))
+    return SpectrumObservationList(obs_list)
+
+
+@pytest.mark.parametrize('stat', ['cash', 'wstat'])
+def test_stat_kernels(stat):
+    from ... import stats
+    obs_list = make_observations_unequal_bins()
+    model = models.PowerLaw(index=2 * u.Unit(''), amplitude=1e2 / u.TeV,
+                            reference=1 * u.TeV)
+    bkg_model = models.PowerLaw(index=2.5 * u.Unit(''), amplitude=20 / u.TeV,
+                                reference=1 * u.TeV)
+    background_model = bkg_model if stat == 'cash' else None
+    fit = SpectrumFit(obs_list, model, stat=stat, forward_folded=False,
+                      fit_range=[0.2, 5] * u.TeV, background_model=background_model)
+    total = fit.total_stat(model.parameters)
+
+    desired_total = 0
+    for obs, mask, (mu_sig, mu_bkg), (on_stat, off_stat) in zip(
+            obs_list, fit.bins_in_fit_range, fit.predicted_counts, fit.statval):
+        n_on = obs.on_vector.data.data.value
+        n_off = obs.off_vector.data.data.value
+        if stat == 'cash':
+            desired_on = stats.cash(n_on=n_on, mu_on=mu_sig + mu_bkg)
+            desired_off = stats.cash(n_on=n_off, mu_on=mu_bkg / obs.alpha)
+        else:
+            desired_on = stats.wstat(n_on=n_on, n_off=n_off, alpha=obs.alpha, mu_sig=mu_sig)
+            desired_off = np.zeros_like(desired_on)
+            mu_bkg_desired = stats.get_wstat_mu_bkg(n_on=n_on, n_off=n_off,
+                                                    alpha=obs.alpha, mu_sig=mu_sig)
+            assert_allclose(mu_bkg, mu_bkg_desired * obs.alpha)
+
+        assert len(on_stat) == len(n_on)
+        assert_allclose(on_stat, np.where(mask, desired_on, 0))
+        assert_allclose(off_stat, np.where(mask, desired_off, 0))
+        desired_total += np.sum(on_stat) + np.sum(off_stat)
+
+    assert_allclose(total, desired_total)
+
+    # The kernels are re-used for every evaluation
+    kernels = fit._stat_kernels
+    fit.total_stat(model.parameters)
+    assert fit._stat_kernels is kernels
+
+    # and set up again for a new likelihood computation, or a new statistic
+    obs_list[1].on_vector.data.data *= 2
+    total_changed = fit.likelihood_1d(model, 'index', [2])[0]
+    assert fit._stat_kernels is not kernels
+    assert total_changed != total
+
+    fit.stat = 'cstat'
+    assert fit._stat_kernels is None
+
+
+@requires_dependency('scipy')
+def test_powerlaw_batch_fit():
+    from ...irf import EnergyDispersion
+    from ...spectrum import SpectrumSimulation, PowerLawBatchFit
+
+    e_true = np.logspace(-2, 2.5, 109) * u.TeV
+    e_reco = np.logspace(-2, 2, 73) * u.TeV
+    aeff = EffectiveAreaTable.from_parametrization(energy=e_true)
+    edisp = EnergyDispersion.from_gauss(e_true=e_true, e_reco=e_reco, sigma=0.2, bias=0)
+    model = models.PowerLaw(index=2.3 * u.Unit(''),
+                            amplitude=2.5e-12 * u.Unit('cm-2 s-1 TeV-1'),
+                            reference=1 * u.TeV)
+    bkg_model = models.PowerLaw(index=3 * u.Unit(''),
+                                amplitude=3e-12 * u.Unit('cm-2 s-1 TeV-1'),
+                                reference=1 * u.TeV)
+    livetime = 4 * u.h
+
+    sim = SpectrumSimulation(aeff=aeff, edisp=edisp, source_model=model,
+                             livetime=livetime, background_model=bkg_model, alpha=0.2)
+    on_counts, off_counts = sim.simulate_counts(n_obs=20, random_state=0)
+
+    fitter = PowerLawBatchFit(livetime, aeff, edisp, alpha=0.2)
+    result = fitter.run(on_counts, off_counts)
+    assert result['converged'].all()
+    assert_allclose(result['index'][0], 2.461256, rtol=1e-5)
+    assert_allclose(result['amplitude'][0], 2.081166e-12, rtol=1e-5)
+    assert_allclose(result['index_err'][0], 0.13788, rtol=1e-4)
+
+    # Compare to the fit statistic of SpectrumFit at the best-fit position
+    on_vector = PHACountsSpectrum(energy_lo=e_reco[:-1], energy_hi=e_reco[1:],
+                                  data=on_counts[0], backscal=1)
+    on_vector.livetime = livetime
+    off_vector = PHACountsSpectrum(energy_lo=e_reco[:-1], energy_hi=e_reco[1:],
+                                   data=off_counts[0], backscal=5, is_bkg=True)
+    obs = SpectrumObservation(on_vector=on_vector, off_vector=off_vector,
+                              aeff=aeff, edisp=edisp)
+    fit = SpectrumFit(obs, model)
+
+    model.parameters['index'].value = result['index'][0]
+    model.parameters['amplitude'].value = result['amplitude'][0]
+    best = fit.total_stat(model.parameters)
+    assert_allclose(best, result['statval'][0], rtol=1e-8)
+
+    for factor in [0.99, 1.01]:
+        model.parameters['index'].value = factor * result['index'][0]
+        assert fit.total_stat(model.parameters) > best
@@ -279,6 +279,64 @@ class FluxPointTester:
         result.plot(energy_range=[1, 10] * u.TeV)
 
 
+@requires_dependency('scipy')
+def test_flux_point_estimator_template():
+    from ...irf import EffectiveAreaTable, EnergyDispersion
+    from ..simulation import SpectrumSimulation
+
+    e_true = np.logspace(-2, 2.5, 109) * u.TeV
+    e_reco = np.logspace(-2, 2, 73) * u.TeV
+    aeff = EffectiveAreaTable.from_parametrization(energy=e_true)
+    edisp = EnergyDispersion.from_gauss(e_true=e_true, e_reco=e_reco, sigma=0.2, bias=0)
+    model = PowerLaw(index=2.3 * u.Unit(''),
+                     amplitude=2.5e-12 * u.Unit('cm-2 s-1 TeV-1'),
+                     reference=1 * u.TeV)
+    bkg_model = PowerLaw(index=3 * u.Unit(''),
+                         amplitude=3e-12 * u.Unit('cm-2 s-1 TeV-1'),
+                         reference=1 * u.TeV)
+
+    sim = SpectrumSimulation(aeff=aeff, edisp=edisp, source_model=model, livetime=4 * u.h,
+                             background_model=bkg_model, alpha=0.2)
+    sim.run(seed=[0, 1])
+    obs_list = sim.result
+
+    seg = SpectrumEnergyGroupMaker(obs=obs_list.stack())
+    seg.compute_groups_fixed(np.logspace(-0.5, 1.5, 5) * u.TeV)
+
+    fpe = FluxPointEstimator(obs_list, seg.groups, model, method='template')
+    fpe.compute_points()
+    table = fpe.flux_points.table
+    assert len(table) == 4
+
+    assert_allclose(table['dnde'][1], 6.928478e-13, rtol=1e-5)
+    assert_allclose(table['dnde_err'][1], 1.267957e-13, rtol=1e-5)
+    assert_allclose(table['dnde_ul'][1], 9.606298e-13, rtol=1e-5)
+    assert_allclose(table['sqrt_ts'][1], 6.486103, rtol=1e-5)
+
+    fpe_compiled = FluxPointEstimator(obs_list, seg.groups, model, method='template',
+                                      compiled_response=True)
+    fpe_compiled.compute_points()
+    for name in ['dnde', 'dnde_err', 'dnde_ul', 'sqrt_ts']:
+        assert_allclose(fpe_compiled.flux_points.table[name], table[name], rtol=1e-6)
+
+    fpe_parallel = FluxPointEstimator(obs_list, seg.groups, model, method='template', n_jobs=2)
+    fpe_parallel.compute_points()
+    for name in table.colnames:
+        assert_allclose(fpe_parallel.flux_points.table[name], table[name], rtol=1e-12)
+
+    # The flux point is the minimum of the SpectrumFit statistic
+    approx_model = fpe.compute_approx_model(model, seg.groups[1])
+    approx_model.parameters['reference'].quantity = table['e_ref'].quantity[1]
+    fit = SpectrumFit(obs_list, approx_model)
+    fit.fit_range = table['e_min'].quantity[1], table['e_max'].quantity[1]
+
+    stat = []
+    for factor in [0.99, 1, 1.01]:
+        approx_model.parameters['amplitude'].value = factor * table['dnde'][1]
+        stat.append(fit.total_stat(approx_model.parameters))
+    assert stat[1] < stat[0] and stat[1] < stat[2]
+
+
 @requires_data('gammapy-extra')
 class TestFluxPointProfiles:
     def setup(self):
@@ -1,14 +1,18 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import pytest
+import numpy as np
+from numpy.testing import assert_allclose
 import astropy.units as u
 from ...utils.energy import EnergyBounds
+from ...utils.cache import array_key
 from ...utils.testing import assert_quantity_allclose
 from ...utils.testing import requires_dependency, requires_data
 from ...scripts import CTAPerf
 from ..models import (PowerLaw, PowerLaw2, ExponentialCutoffPowerLaw,
-                      ExponentialCutoffPowerLaw3FGL, LogParabola,
-                      TableModel, AbsorbedSpectralModel, Absorption)
+                      ExponentialCutoffPowerLaw3FGL, PLSuperExpCutoff3FGL,
+                      LogParabola, TableModel, AbsorbedSpectralModel,
+                      Absorption)
 from ...spectrum import SpectrumObservationList, SpectrumFit
 
 
@@ -73,7 +77,7 @@ TEST_MODELS = [
         ),
 
         val_at_2TeV=u.Quantity(1.080321705479446, 'cm-2 s-1 TeV-1'),
-        integral_1_10TeV=u.Quantity(3.765838739678921, 'cm-2 s-1'),
+        integral_1_10TeV=u.Quantity(3.7658833775247307, 'cm-2 s-1'),
         eflux_1_10TeV=u.Quantity(9.901735870666526, 'TeV cm-2 s-1'),
         e_peak=4 * u.TeV
     ),
@@ -102,7 +106,7 @@ TEST_MODELS = [
         ),
 
         val_at_2TeV=u.Quantity(0.6387956571420305, 'cm-2 s-1 TeV-1'),
-        integral_1_10TeV=u.Quantity(2.255689748270628, 'cm-2 s-1'),
+        integral_1_10TeV=u.Quantity(2.2557914335300366, 'cm-2 s-1'),
         eflux_1_10TeV=u.Quantity(3.9586515834989267, 'TeV cm-2 s-1'),
         e_peak=0.74082 * u.TeV
     ),
@@ -116,7 +120,7 @@ TEST_MODELS = [
         ),
 
         val_at_2TeV=u.Quantity(0.6387956571420305, 'cm-2 s-1 TeV-1'),
-        integral_1_10TeV=u.Quantity(2.255689748270628, 'cm-2 s-1'),
+        integral_1_10TeV=u.Quantity(2.2557914335300366, 'cm-2 s-1'),
         eflux_1_10TeV=u.Quantity(3.9586515834989267, 'TeV cm-2 s-1'),
         e_peak=0.74082 * u.TeV
     ),
@@ -210,6 +214,48 @@ def test_models(spectrum):
     assert_quantity_allclose(val[0], spectrum['val_at_2TeV'])
 
 
+@pytest.mark.parametrize(
+    "spectrum", TEST_MODELS, ids=[_['name'] for _ in TEST_MODELS]
+)
+def test_models_numeric(spectrum):
+    model = spectrum['model']
+    energy = [2, 10, 20] * u.TeV
+    desired = model(energy).to('cm-2 s-1 TeV-1').value
+    actual = model.evaluate_numeric(energy.value)
+    assert_allclose(actual, desired)
+    assert_allclose(actual[0], spectrum['val_at_2TeV'].to('cm-2 s-1 TeV-1').value)
+
+    actual = model.integral_numeric(1, 10)
+    desired = spectrum['integral_1_10TeV'].to('cm-2 s-1').value
+    assert_allclose(actual, desired)
+
+
+@requires_dependency('scipy')
+@pytest.mark.parametrize('model', [
+    ExponentialCutoffPowerLaw(index=2.3, lambda_='0.2 TeV-1'),
+    ExponentialCutoffPowerLaw(index=2, lambda_='1e-4 GeV-1', reference='300 GeV'),
+    ExponentialCutoffPowerLaw(index=0.5),
+    LogParabola(alpha=1.1, beta=0.01, reference='1000 GeV'),
+    LogParabola(alpha=2.3, beta=0.5, reference='1 TeV'),
+    PLSuperExpCutoff3FGL(index_1=2, index_2=0.67, ecut='3 TeV'),
+], ids=['ecpl', 'ecpl_index_2', 'ecpl_hard', 'logpar_flat', 'logpar', 'secpl'])
+def test_integral_analytic(model):
+    from scipy.integrate import quad
+
+    def f(energy):
+        return model(energy * u.TeV).to('cm-2 s-1 TeV-1').value
+
+    e_edges = np.logspace(-1.3, 2, 6)
+    emin, emax = e_edges[:-1], e_edges[1:]
+    desired = [quad(f, lo, hi, epsrel=1e-12)[0] for lo, hi in zip(emin, emax)]
+
+    actual = model.integral(emin * u.TeV, emax * u.TeV, intervals=True)
+    assert_allclose(actual.to('cm-2 s-1').value, desired, rtol=1e-10)
+
+    actual = model.integral_numeric(emin, emax, intervals=True)
+    assert_allclose(actual, desired, rtol=1e-10)
+
+
 @requires_dependency('matplotlib')
 @requires_dependency('sherpa')
 @pytest.mark.parametrize(
@@ -275,6 +321,49 @@ def test_absorption():
     assert_quantity_allclose(actual, desired)
 
 
+@requires_dependency('scipy')
+def test_absorption_interpolation():
+    energy = np.logspace(-3, 2, 51) * u.TeV
+    param = np.linspace(0, 2, 21)
+    param_center = 0.5 * (param[1:] + param[:-1])
+    energy_center = np.sqrt(energy[1:] * energy[:-1]).value
+    data = np.exp(-np.outer(param_center, energy_center ** 0.7))
+    absorption = Absorption(energy_lo=energy[:-1], energy_hi=energy[1:],
+                            param_lo=param[:-1], param_hi=param[1:], data=data)
+
+    energy = np.logspace(-3.5, 2.5, 30).reshape(3, 10) * u.TeV
+    for redshift in [0.05, 0.117, 0.117, 2.3]:
+        actual = absorption.evaluate(energy=energy, parameter=redshift)
+        desired = absorption.data.evaluate(energy=energy, parameter=redshift)
+        assert actual.shape == (3, 10)
+        assert_quantity_allclose(actual, desired, rtol=1e-12)
+
+    actual = absorption.evaluate(energy=1 * u.TeV, parameter=[0.1, 0.2])
+    desired = absorption.data.evaluate(energy=1 * u.TeV, parameter=[0.1, 0.2])
+    assert_quantity_allclose(actual, desired, rtol=1e-12)
+
+
+@requires_dependency('scipy')
+def test_table_model_cache():
+    model = table_model()
+    energies = [np.logspace(-0.5, 1, 10 + _) * u.TeV for _ in range(17)]
+
+    first = model(energies[0])
+    assert len(model._values_cache) == 1
+    assert_quantity_allclose(model(energies[0].copy()), first)
+    assert len(model._values_cache) == 1
+
+    # The least recently used energy array is evicted first
+    for energy in energies[1:]:
+        model(energy)
+    assert len(model._values_cache) == 16
+    assert array_key(energies[0]) not in model._values_cache
+    assert array_key(energies[1]) in model._values_cache
+
+    model.parameters['scale'].value = 2
+    assert_quantity_allclose(model(energies[1]), 2 * model.evaluate(energies[1], scale=1))
+
+
 @requires_dependency('uncertainties')
 def test_pwl_index_2_error():
     pars, errs = {}, {}
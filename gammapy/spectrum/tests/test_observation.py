@@ -240,6 +240,27 @@ class TestSpectrumObservationStacker:
         assert_allclose(obs_stacker.stacked_obs.alpha[1], 2.5 / 8.)
 
 
+@requires_dependency('scipy')
+def test_spectrum_observation_stacker_add():
+    obs_list = make_observation_list()
+    obs_stacker = SpectrumObservationStacker(obs_list)
+    obs_stacker.run()
+    stacked = obs_stacker.stacked_obs
+
+    obs_stacker = SpectrumObservationStacker(obs_list[:1])
+    obs_stacker.run()
+    obs_stacker.add(obs_list[1:])
+    actual = obs_stacker.stacked_obs
+
+    assert len(obs_stacker.obs_list) == 2
+    assert_allclose(actual.on_vector.data.data, stacked.on_vector.data.data)
+    assert_allclose(actual.off_vector.data.data, stacked.off_vector.data.data)
+    assert_allclose(actual.alpha, [1.25 / 4., 2.5 / 8., 1.25 / 4.])
+    assert_allclose(actual.aeff.data.data, stacked.aeff.data.data)
+    assert_allclose(actual.edisp.pdf_matrix, stacked.edisp.pdf_matrix)
+    assert_quantity_allclose(actual.livetime, 4 * u.h)
+
+
 @requires_dependency('scipy')
 @requires_data('gammapy-extra')
 class TestSpectrumObservationList:
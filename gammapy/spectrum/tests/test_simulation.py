@@ -61,6 +61,15 @@ class TestSpectrumSimulation:
         assert self.sim.result[3].on_vector.total_counts == 168
         assert self.sim.result[4].on_vector.total_counts == 186
 
+    def test_simulate_counts(self):
+        self.sim.background_model = self.background_model
+        self.sim.alpha = self.alpha
+        on_counts, off_counts = self.sim.simulate_counts(n_obs=100, random_state=23)
+        assert on_counts.shape == (100, 72)
+        assert off_counts.shape == (100, 72)
+        assert_allclose(on_counts.sum(axis=1).mean(), 530, rtol=0.05)
+        assert_allclose(off_counts.sum(axis=1).mean(), 1110, rtol=0.05)
+
     def test_without_edisp(self):
         sim = SpectrumSimulation(aeff=self.sim.aeff,
                                  source_model=self.sim.source_model,
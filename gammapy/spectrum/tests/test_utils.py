@@ -8,7 +8,7 @@ import astropy.units as u
 from ...utils.testing import assert_quantity_allclose
 from ...utils.testing import requires_dependency
 from ...irf import EffectiveAreaTable, EnergyDispersion
-from ...spectrum import LogEnergyAxis, integrate_spectrum, CountsPredictor
+from ...spectrum import LogEnergyAxis, integrate_spectrum, CountsPredictor, GaussLegendreIntegrator
 from ..powerlaw import power_law_energy_flux, power_law_evaluate, power_law_flux
 from ..models import ExponentialCutoffPowerLaw, PowerLaw, TableModel
 
@@ -92,6 +92,24 @@ def test_integrate_spectrum_ecpl():
     assert_allclose(unumpy.std_devs(val), 9.278302514378108e-14)
 
 
+def test_gauss_legendre_integrator():
+    e_edges = np.logspace(-1, 2, 4) * u.TeV
+    integrator = GaussLegendreIntegrator(e_edges[:-1], e_edges[1:], order=3)
+    assert integrator.nodes.shape == (3, 3)
+
+    # exact for polynomials of degree 5 in log energy
+    def func(energy):
+        return np.log(energy.value) ** 5 / energy
+
+    actual = integrator(func)
+    log_edges = np.log(e_edges.value)
+    desired = np.diff(log_edges ** 6) / 6 * u.Unit("")
+    assert_quantity_allclose(actual, desired)
+
+    integrator_cached = GaussLegendreIntegrator.cached(e_edges[:-1], e_edges[1:], order=3)
+    assert GaussLegendreIntegrator.cached(e_edges[:-1], e_edges[1:], order=3) is integrator_cached
+
+
 def get_test_cases():
     e_true = Quantity(np.logspace(-1, 2, 120), 'TeV')
     e_reco = Quantity(np.logspace(-1, 2, 100), 'TeV')
@@ -130,7 +148,7 @@ def get_test_cases():
                  npred=1437.4542016322125),
             dict(model=TableModel(energy=[0.1, 0.2, 0.3, 0.4] * u.TeV,
                                   values=[4., 3., 1., 0.1] * u.Unit('TeV-1')),
-                 npred=0.5545130625383198,
+                 npred=0.5667243085918126,
                  e_true=[0.1, 0.2, 0.3, 0.4] * u.TeV)
         ]
 
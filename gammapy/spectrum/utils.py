@@ -1,11 +1,15 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+from collections import OrderedDict
 import numpy as np
 from astropy.units import Quantity
+from ..utils.cache import LRUCache, array_key
 
 __all__ = [
     'LogEnergyAxis',
     'CountsPredictor',
+    'CompiledCountsPredictor',
+    'GaussLegendreIntegrator',
     'integrate_spectrum',
 ]
 
@@ -197,6 +201,189 @@ class CountsPredictor(object):
                                     energy_hi=self.e_reco[1:])
 
 
+class CompiledCountsPredictor(object):
+    """Predict counts for many observations with precompiled response matrices.
+
+    For each observation the livetime, effective area, energy dispersion and
+    AREASCAL are combined into a single unitless response matrix
+    ``R = livetime * aeff * edisp * areascal`` once at setup. The predicted
+    counts are then ``model.integral(e_true) @ R``.
+
+    Observations sharing the same true and reconstructed energy binning are
+    grouped, so that the model is integrated once per group and the counts
+    of all observations of a group are computed with one batched matrix
+    product. True energy bins that don't contribute to any reconstructed
+    energy bin of a group are not integrated. For models predicting an
+    integral flux, the unit-free
+    `~gammapy.spectrum.models.SpectralModel.integral_numeric` is used.
+
+    The results are the same as for `~gammapy.spectrum.CountsPredictor`
+    with ``aeff``, ``edisp`` and ``livetime`` of each observation, and the
+    AREASCAL of the on vector applied.
+
+    Parameters
+    ----------
+    obs_list : `~gammapy.spectrum.SpectrumObservationList`
+        Observations, need to have an effective area.
+    model : `~gammapy.spectrum.models.SpectralModel`
+        Spectral model, used to determine the true energy and flux units.
+    """
+
+    def __init__(self, obs_list, model):
+        self.obs_list = obs_list
+        self._groups = []
+        self._compile(model)
+
+    def _compile(self, model):
+        groups = OrderedDict()
+        for idx, obs in enumerate(self.obs_list):
+            predictor = CountsPredictor(model=model, aeff=obs.aeff)
+            predictor.integrate_model()
+            e_true = predictor.e_true
+            flux_unit = predictor.true_flux.unit
+
+            aeff = obs.aeff.data.data
+            unit = flux_unit * aeff.unit
+            if unit.is_equivalent('s-1'):
+                unit *= obs.livetime.unit
+                scale = obs.livetime.value
+            else:
+                scale = 1
+            scale *= Quantity(1, unit).to('').value
+
+            if obs.edisp is not None:
+                matrix = obs.edisp.pdf_matrix * aeff.value[:, np.newaxis]
+            else:
+                matrix = np.diag(aeff.value)
+
+            try:
+                matrix = matrix * obs.on_vector.areascal
+            except AttributeError:
+                pass
+
+            key = (tuple(e_true.value), e_true.unit.to_string(), matrix.shape)
+            group = groups.setdefault(key, dict(e_true=e_true, flux_unit=flux_unit,
+                                                idx=[], matrix=[]))
+            group['idx'].append(idx)
+            group['matrix'].append(scale * matrix)
+
+        for group in groups.values():
+            matrix = np.array(group['matrix'])
+
+            # restrict to contiguous range of true energy bins with non-zero response
+            rows = np.nonzero(np.any(matrix != 0, axis=(0, 2)))[0]
+            if len(rows) == 0:
+                rows = np.array([0])
+
+            true_slice = slice(rows[0], rows[-1] + 1)
+            group['matrix'] = matrix[:, true_slice]
+            group['emin'] = group['e_true'][:-1][true_slice]
+            group['emax'] = group['e_true'][1:][true_slice]
+
+            # convert units once, for the unit-free model integration
+            if group['flux_unit'].is_equivalent('cm-2 s-1'):
+                group['matrix'] *= Quantity(1, 'cm-2 s-1').to(group['flux_unit']).value
+                group['emin'] = group['emin'].to('TeV').value
+                group['emax'] = group['emax'].to('TeV').value
+                group['numeric'] = True
+            else:
+                group['numeric'] = False
+
+        self._groups = list(groups.values())
+
+    def predict(self, model):
+        """Predict counts for all observations.
+
+        Parameters
+        ----------
+        model : `~gammapy.spectrum.models.SpectralModel`
+            Spectral model.
+
+        Returns
+        -------
+        npred : list of `~numpy.ndarray`
+            Predicted counts in reconstructed energy for each observation.
+        """
+        npred = [None] * len(self.obs_list)
+        for group in self._groups:
+            if group['numeric']:
+                flux = model.integral_numeric(group['emin'], group['emax'], intervals=True)
+            else:
+                flux = model.integral(emin=group['emin'], emax=group['emax'], intervals=True)
+                flux = flux.to(group['flux_unit']).value
+            counts = np.einsum('i,oij->oj', flux, group['matrix'])
+            for idx, counts_obs in zip(group['idx'], counts):
+                npred[idx] = counts_obs
+        return npred
+
+
+class GaussLegendreIntegrator(object):
+    r"""Fixed-grid Gauss-Legendre integration of a spectrum over energy bins.
+
+    In each bin the integral is computed in log energy,
+    :math:`\int f(E) dE = \int E f(E) d\ln E`, using ``order`` Gauss-Legendre
+    nodes. The nodes and weights only depend on the bin edges, so they are
+    computed once and can be re-used for every integration, e.g. during a fit.
+    This is exact for polynomials of degree ``2 * order - 1`` in log energy and
+    thus much more accurate on coarse bins than the log-log trapezoidal rule.
+
+    Parameters
+    ----------
+    emin, emax : `~astropy.units.Quantity` or `~numpy.ndarray`
+        Lower and upper bin edges
+    order : int
+        Number of nodes per bin
+    """
+    _cache = LRUCache(maxsize=32)
+
+    def __init__(self, emin, emax, order=5):
+        unit = None
+        if isinstance(emin, Quantity):
+            unit = emin.unit
+            emin = emin.value
+            emax = emax.to(unit).value
+
+        log_emin = np.log(np.atleast_1d(emin).astype(float))
+        log_emax = np.log(np.atleast_1d(emax).astype(float))
+        x, w = np.polynomial.legendre.leggauss(order)
+
+        center = 0.5 * (log_emax + log_emin)[:, np.newaxis]
+        half_width = 0.5 * (log_emax - log_emin)[:, np.newaxis]
+        nodes = np.exp(center + half_width * x)
+        weights = half_width * w * nodes
+
+        if unit is not None:
+            nodes = Quantity(nodes, unit, copy=False)
+            weights = Quantity(weights, unit, copy=False)
+
+        self.order = order
+        self.nodes = nodes
+        self.weights = weights
+
+    @classmethod
+    def cached(cls, emin, emax, order=5):
+        """Create integrator, re-using previously computed nodes for the same bins."""
+        key = array_key(emin), array_key(emax), order
+        return cls._cache.get(key, lambda: cls(emin, emax, order=order))
+
+    def __call__(self, func):
+        """Integrate function over the energy bins.
+
+        Parameters
+        ----------
+        func : callable
+            Function to integrate, called once with all nodes as 1-dim array.
+
+        Returns
+        -------
+        integral : `~numpy.ndarray` or `~astropy.units.Quantity`
+            Integral for each energy bin.
+        """
+        values = func(self.nodes.ravel())
+        values = values.reshape(self.nodes.shape)
+        return np.sum(values * self.weights, axis=-1)
+
+
 def integrate_spectrum(func, xmin, xmax, ndecade=100, intervals=False):
     """
     Integrate 1d function using the log-log trapezoidal rule. If scalar values
@@ -1,10 +1,15 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 """Feldman Cousins algorithm to compute parameter confidence limits."""
 from __future__ import absolute_import, division, print_function, unicode_literals
+import hashlib
 import logging
+import os
+import tempfile
 import numpy as np
 from ..extern.six.moves import range
 from ..extern.six import iteritems
+from ..utils.scripts import make_path
+from ..utils.cache import replace_file
 
 __all__ = [
     'fc_find_acceptance_interval_gauss',
@@ -15,6 +20,7 @@ __all__ = [
     'fc_find_limit',
     'fc_find_average_upper_limit',
     'fc_construct_acceptance_intervals',
+    'fc_construct_acceptance_intervals_poisson',
 ]
 
 log = logging.getLogger(__name__)
@@ -180,6 +186,11 @@ def fc_construct_acceptance_intervals_pdfs(matrix, alpha):
 
     For more information see :ref:`documentation <feldman_cousins>`.
 
+    The bins of all PDFs are ranked at once: for each mu, the bins where mu
+    has the greatest likelihood come first, followed by the other bins in
+    order of decreasing likelihood ratio. Bins are then added to the
+    acceptance interval in this order, until the probability reaches alpha.
+
     Parameters
     ----------
     matrix : array-like
@@ -192,16 +203,13 @@ def fc_construct_acceptance_intervals_pdfs(matrix, alpha):
     distributions_scaled : ndarray
         Acceptance intervals (1 means inside, 0 means outside)
     """
-    number_mus = len(matrix)
-
-    distributions_scaled = np.asarray(matrix)
-    distributions_re_scaled = np.asarray(matrix)
-    summed_propability = np.zeros(number_mus)
+    distributions = np.array(matrix, dtype=float)
+    rows = np.arange(len(distributions))[:, np.newaxis]
 
     # Step 1:
     # For each x, find the greatest likelihood in the mu direction.
     # greatest_likelihood is an array of length number_x_bins.
-    greatest_likelihood = np.amax(distributions_scaled, axis=0)
+    greatest_likelihood = np.amax(distributions, axis=0)
 
     # Set to some value if none of the bins has an entry to avoid
     # division by zero
@@ -209,45 +217,26 @@ def fc_construct_acceptance_intervals_pdfs(matrix, alpha):
 
     # Step 2:
     # Scale all entries by this value
-    distributions_re_scaled /= greatest_likelihood
+    distributions_re_scaled = distributions / greatest_likelihood
 
     # Step 3 (Feldman Cousins Ordering principle):
-    # For each mu, get the largest entry
-    largest_entry = np.argmax(distributions_re_scaled, axis=1)
-    # Set the rank to 1 and add probability
-    for i in range(number_mus):
-        distributions_re_scaled[i][largest_entry[i]] = 1
-        summed_propability[i] += np.sum(np.where(distributions_re_scaled[i] == 1, distributions_scaled[i], 0))
-        distributions_scaled[i] = np.where(distributions_re_scaled[i] == 1, 1, distributions_scaled[i])
-
-    # Identify next largest entry not yet ranked. While there are entries
-    # smaller than 1, some bins don't have a rank yet.
-    while np.amin(distributions_re_scaled) < 1:
-        # For each mu, this is the largest rank attributed so far.
-        largest_rank = np.amax(distributions_re_scaled, axis=1)
-        # For each mu, this is the largest entry that is not yet a rank.
-        largest_entry = np.where(distributions_re_scaled < 1, distributions_re_scaled, -1)
-        # For each mu, this is the position of the largest entry that is not yet a rank.
-        largest_entry_position = np.argmax(largest_entry, axis=1)
-        # Invalidate indices where there is no maximum (every entry is already a rank)
-        largest_entry_position = [
-            largest_entry_position[i]
-            if largest_entry[i][largest_entry_position[i]] != -1 else -1
-            for i in range(len(largest_entry_position))
-        ]
-        # Replace the largest entry with the highest rank so far plus one
-        # Add the probability
-        for i in range(number_mus):
-            if largest_entry_position[i] == -1:
-                continue
-            distributions_re_scaled[i][largest_entry_position[i]] = largest_rank[i] + 1
-            if summed_propability[i] < alpha:
-                summed_propability[i] += distributions_scaled[i][largest_entry_position[i]]
-                distributions_scaled[i][largest_entry_position[i]] = 1
-            else:
-                distributions_scaled[i][largest_entry_position[i]] = 0
+    # For each mu, the largest entry and the entries of greatest likelihood
+    # get the first rank, the other entries are ranked by decreasing value,
+    # equal values by increasing x.
+    first_rank = distributions_re_scaled == 1
+    first_rank[rows[:, 0], np.argmax(distributions_re_scaled, axis=1)] = True
+    sort_key = np.where(first_rank, -np.inf, -distributions_re_scaled)
+    order = np.argsort(sort_key, axis=1, kind='mergesort')
+
+    # Add entries in rank order, while the summed probability is below alpha
+    summed_probability = np.sum(np.where(first_rank, distributions, 0), axis=1)
+    probability = np.where(first_rank, 0, distributions)[rows, order]
+    summed_before = np.cumsum(np.hstack([summed_probability[:, np.newaxis], probability[:, :-1]]), axis=1)
+
+    accepted = np.empty_like(first_rank)
+    accepted[rows, order] = summed_before < alpha
 
-    return distributions_scaled
+    return np.where(accepted | first_rank, 1., 0.)
 
 
 def fc_get_limits(mu_bins, x_bins, acceptance_intervals):
@@ -273,31 +262,19 @@ def fc_get_limits(mu_bins, x_bins, acceptance_intervals):
     x_values : array-like
         All the points that are inside the acceptance intervals
     """
-    upper_limit = []
-    lower_limit = []
-    x_values = []
-
-    number_mu = len(mu_bins)
-    number_bins_x = len(x_bins)
-
-    for mu in range(number_mu):
-        upper_limit.append(-1)
-        lower_limit.append(-1)
-        x_values.append([])
-        acceptance_interval = acceptance_intervals[mu]
-        for x in range(number_bins_x):
-            # This point lies in the acceptance interval
-            if acceptance_interval[x] == 1:
-                x_value = x_bins[x]
-                x_values[-1].append(x_value)
-                # Upper limit is first point where this condition is true
-                if upper_limit[-1] == -1:
-                    upper_limit[-1] = x_value
-                # Lower limit is first point after this condition is not true
-                if x == number_bins_x - 1:
-                    lower_limit[-1] = x_value
-                else:
-                    lower_limit[-1] = x_bins[x + 1]
+    x_bins = np.asarray(x_bins)
+    inside = np.asarray(acceptance_intervals) == 1
+    has_inside = np.any(inside, axis=1)
+
+    # Upper limit is first point where this condition is true
+    index_first = np.argmax(inside, axis=1)
+    # Lower limit is first point after this condition is not true
+    index_last = inside.shape[1] - 1 - np.argmax(inside[:, ::-1], axis=1)
+    index_after = np.minimum(index_last + 1, inside.shape[1] - 1)
+
+    upper_limit = list(np.where(has_inside, x_bins[index_first], -1))
+    lower_limit = list(np.where(has_inside, x_bins[index_after], -1))
+    x_values = [list(x_bins[row]) for row in inside]
 
     return lower_limit, upper_limit, x_values
 
@@ -444,3 +421,70 @@ def fc_construct_acceptance_intervals(distribution_dict, bins, alpha):
     acceptance_intervals = fc_construct_acceptance_intervals_pdfs(distributions_scaled, alpha)
 
     return acceptance_intervals
+
+
+def fc_construct_acceptance_intervals_poisson(mu_bins, x_bins, background, alpha,
+                                              cache_dir=None):
+    r"""Confidence belt for a Poisson signal with known background.
+
+    The belt only depends on ``mu_bins``, ``x_bins``, ``background`` and
+    ``alpha``. If ``cache_dir`` is given, the result is stored there as a
+    ``.npz`` file keyed on these inputs and read back on later calls, so
+    that limits for many sources with the same background can reuse it with
+    `fc_get_limits` and `fc_find_average_upper_limit`.
+
+    For more information see :ref:`documentation <feldman_cousins>`.
+
+    Parameters
+    ----------
+    mu_bins : array-like
+        The bins used in mue direction
+    x_bins : array-like
+        Bins in x
+    background : float
+        Mean background
+    alpha : float
+        Desired confidence level
+    cache_dir : str or `~pathlib.Path`, optional
+        Directory of the belt cache
+
+    Returns
+    -------
+    matrix : ndarray
+        Poisson PDFs in x for each value of mue
+    acceptance_intervals : ndarray
+        Acceptance intervals (1 means inside, 0 means outside)
+    """
+    from scipy import stats
+
+    mu_bins = np.asarray(mu_bins, dtype=float)
+    x_bins = np.asarray(x_bins, dtype=float)
+
+    if cache_dir is not None:
+        key = hashlib.sha1(mu_bins.tobytes())
+        key.update(x_bins.tobytes())
+        key.update(np.array([background, alpha], dtype=float).tobytes())
+        filename = make_path(cache_dir) / 'fc_poisson_{}.npz'.format(key.hexdigest())
+
+        if filename.exists():
+            log.debug('Reading confidence belt from {}'.format(filename))
+            with np.load(str(filename)) as data:
+                return data['matrix'], data['acceptance_intervals']
+
+    matrix = stats.poisson(mu_bins[:, np.newaxis] + background).pmf(x_bins)
+    acceptance_intervals = fc_construct_acceptance_intervals_pdfs(matrix, alpha)
+
+    if cache_dir is not None:
+        if not filename.parent.exists():
+            filename.parent.mkdir(parents=True)
+        log.debug('Writing confidence belt to {}'.format(filename))
+        fd, tmp_name = tempfile.mkstemp(dir=str(filename.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                np.savez(fh, matrix=matrix, acceptance_intervals=acceptance_intervals)
+            replace_file(tmp_name, str(filename))
+        except BaseException:
+            os.remove(tmp_name)
+            raise
+
+    return matrix, acceptance_intervals
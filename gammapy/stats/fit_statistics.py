@@ -12,6 +12,7 @@ __all__ = [
     'lstat', 'pgstat',
     'chi2', 'chi2constvar', 'chi2datavar',
     'chi2gehrels', 'chi2modvar', 'chi2xspecvar',
+    'CashKernel', 'CStatKernel', 'WStatKernel',
 ]
 
 N_ON_MIN = 1e-25
@@ -208,7 +209,7 @@ def get_wstat_gof_terms(n_on, n_off):
 
     see :ref:`wstat`.
     """
-    term = np.zeros(len(n_on))
+    term = np.zeros(np.shape(n_on))
 
     # suppress zero division warnings, they are corrected below
     with np.warnings.catch_warnings():
@@ -222,6 +223,220 @@ def get_wstat_gof_terms(n_on, n_off):
     return 2 * term
 
 
+class _FitStatisticKernel(object):
+    """Base class for fit statistics of fixed counts.
+
+    Sets up the output and work buffers and applies the mask of bins
+    included in the fit.
+    """
+
+    def __init__(self, shape, mask=None):
+        self.stat = np.zeros(shape)
+        self._buffer = np.empty(shape)
+        self._invalid = np.empty(shape, dtype=bool)
+        if mask is None:
+            self._outside = None
+        else:
+            self._outside = np.logical_not(np.broadcast_to(mask, shape))
+
+    def _apply_mask(self, invalid=False):
+        if invalid:
+            np.copyto(self.stat, 0, where=self._invalid)
+        if self._outside is not None:
+            np.copyto(self.stat, 0, where=self._outside)
+        return self.stat
+
+    def total(self, *args):
+        """Statistic summed over all bins, see ``evaluate``."""
+        return np.sum(self.evaluate(*args))
+
+
+class CashKernel(_FitStatisticKernel):
+    """Cash statistic for fixed counts, see `cash`.
+
+    The result is written into the preallocated array ``stat``, which is
+    overwritten by the next evaluation. The counts can have any shape, e.g.
+    the stacked ``(n_obs, n_bins)`` counts of several observations.
+
+    Parameters
+    ----------
+    n_on : array_like
+        Observed counts
+    mask : array_like, optional
+        Bins included in the statistic, ``stat`` is 0 for the other bins
+    """
+
+    def __init__(self, n_on, mask=None):
+        self.n_on = np.array(n_on, dtype=np.float64)
+        super(CashKernel, self).__init__(self.n_on.shape, mask)
+
+    def evaluate(self, mu_on):
+        """Statistic per bin.
+
+        Parameters
+        ----------
+        mu_on : array_like
+            Expected counts
+
+        Returns
+        -------
+        stat : ndarray
+            Statistic per bin
+        """
+        stat = self.stat
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.log(mu_on, out=stat)
+            np.multiply(self.n_on, stat, out=stat)
+        np.subtract(mu_on, stat, out=stat)
+        stat *= 2
+
+        np.greater(mu_on, 0, out=self._invalid)
+        np.logical_not(self._invalid, out=self._invalid)
+        return self._apply_mask(invalid=True)
+
+
+class CStatKernel(_FitStatisticKernel):
+    """C statistic for fixed counts, see `cstat`.
+
+    The result is written into the preallocated array ``stat``, which is
+    overwritten by the next evaluation. ``log(n_on)`` is computed once.
+
+    Parameters
+    ----------
+    n_on : array_like
+        Observed counts
+    n_on_min : array_like
+        ``n_on`` = ``n_on_min`` where ``n_on`` <= ``n_on_min.``
+    mask : array_like, optional
+        Bins included in the statistic, ``stat`` is 0 for the other bins
+    """
+
+    def __init__(self, n_on, n_on_min=N_ON_MIN, mask=None):
+        n_on = np.asanyarray(n_on, dtype=np.float64)
+        n_on_min = np.asanyarray(n_on_min, dtype=np.float64)
+        self.n_on = np.where(n_on <= n_on_min, n_on_min, n_on)
+        self._log_n_on = np.log(self.n_on)
+        super(CStatKernel, self).__init__(self.n_on.shape, mask)
+
+    def evaluate(self, mu_on):
+        """Statistic per bin.
+
+        Parameters
+        ----------
+        mu_on : array_like
+            Expected counts
+
+        Returns
+        -------
+        stat : ndarray
+            Statistic per bin
+        """
+        stat, buffer = self.stat, self._buffer
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.log(mu_on, out=stat)
+            np.subtract(self._log_n_on, stat, out=stat)
+            np.multiply(self.n_on, stat, out=stat)
+        np.subtract(mu_on, self.n_on, out=buffer)
+        np.add(buffer, stat, out=stat)
+        stat *= 2
+
+        np.greater(mu_on, 0, out=self._invalid)
+        np.logical_not(self._invalid, out=self._invalid)
+        return self._apply_mask(invalid=True)
+
+
+class WStatKernel(_FitStatisticKernel):
+    """W statistic for fixed counts, see `wstat`.
+
+    The result is written into the preallocated array ``stat`` and the
+    profile likelihood background into ``mu_bkg``. Both are overwritten by
+    the next evaluation. All terms that only depend on the counts and
+    ``alpha``, including the goodness-of-fit terms, are computed once.
+
+    Parameters
+    ----------
+    n_on : array_like
+        Total observed counts
+    n_off : array_like
+        Total observed background counts
+    alpha : array_like
+        Exposure ratio between on and off region
+    mask : array_like, optional
+        Bins included in the statistic, ``stat`` is 0 for the other bins
+    extra_terms : bool, optional
+        Add model independent terms to convert stat into goodness-of-fit
+        parameter, default: True
+    """
+
+    def __init__(self, n_on, n_off, alpha, mask=None, extra_terms=True):
+        n_on, n_off, alpha = np.broadcast_arrays(
+            np.asanyarray(n_on, dtype=np.float64),
+            np.asanyarray(n_off, dtype=np.float64),
+            np.asanyarray(alpha, dtype=np.float64),
+        )
+        super(WStatKernel, self).__init__(n_on.shape, mask)
+        self.mu_bkg = np.zeros(n_on.shape)
+
+        self._alpha = np.array(alpha)
+        self._alpha_1 = 1 + alpha
+        self._alpha_n = alpha * (n_on + n_off)
+        self._alpha_n_off = 4 * alpha * (alpha + 1) * n_off
+        self._norm = 2 * alpha * (alpha + 1)
+        self._neg_n_on = - n_on
+        self._neg_n_off = - n_off
+        self._n_on_zero = (n_on == 0)
+        self._n_off_zero = (n_off == 0)
+        self._gof_terms = get_wstat_gof_terms(n_on, n_off) if extra_terms else None
+
+    def evaluate(self, mu_sig):
+        """Statistic per bin.
+
+        Parameters
+        ----------
+        mu_sig : array_like
+            Signal expected counts
+
+        Returns
+        -------
+        stat : ndarray
+            Statistic per bin
+        """
+        stat, buffer, mu_bkg = self.stat, self._buffer, self.mu_bkg
+
+        # mu_bkg, see `get_wstat_mu_bkg`
+        np.multiply(self._alpha_1, mu_sig, out=mu_bkg)
+        np.subtract(self._alpha_n, mu_bkg, out=mu_bkg)
+        np.multiply(self._alpha_n_off, mu_sig, out=buffer)
+        np.multiply(mu_bkg, mu_bkg, out=stat)
+        np.add(stat, buffer, out=buffer)
+        np.sqrt(buffer, out=buffer)
+        np.add(mu_bkg, buffer, out=mu_bkg)
+        np.divide(mu_bkg, self._norm, out=mu_bkg)
+
+        np.multiply(self._alpha_1, mu_bkg, out=stat)
+        np.add(mu_sig, stat, out=stat)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.multiply(self._alpha, mu_bkg, out=buffer)
+            np.add(mu_sig, buffer, out=buffer)
+            np.log(buffer, out=buffer)
+            np.multiply(self._neg_n_on, buffer, out=buffer)
+            np.copyto(buffer, 0, where=self._n_on_zero)
+            stat += buffer
+
+            np.log(mu_bkg, out=buffer)
+            np.multiply(self._neg_n_off, buffer, out=buffer)
+            np.copyto(buffer, 0, where=self._n_off_zero)
+            stat += buffer
+
+        stat *= 2
+
+        if self._gof_terms is not None:
+            stat += self._gof_terms
+
+        return self._apply_mask()
+
+
 def lstat():
     r"""L statistic, for Poisson data with Poisson background (Bayesian).
 
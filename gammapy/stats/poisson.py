@@ -442,7 +442,7 @@ def excess_ul_helene(excess, excess_error, significance):
     if excess_error <= 0:
         raise ValueError('Non-positive excess_error: {}'.format(excess_error))
 
-    from math import sqrt
+    from math import ceil, sqrt
     from scipy.special import erf
 
     if excess >= 0.:
@@ -469,13 +469,25 @@ def excess_ul_helene(excess, excess_error, significance):
         value_old = value_new
         value_new = value_new + 0.01
         integral = (1. + erf(value_new)) / 2.
-    value_new = value_old + 0.0000001
-    integral = (1. + erf(value_new)) / 2.
 
-    while integral < integral2:
-        value_new = value_new + 0.0000001
-        integral = (1. + erf(value_new)) / 2.
-    value_new = value_new * sqrt(2.)
+    # The 2nd step is the first value on the 1e-7 grid above value_old
+    # with integral >= integral2, found by bisection on the number of steps
+    step = 0.0000001
+
+    def below(n_steps):
+        return (1. + erf(value_old + n_steps * step)) / 2. < integral2
+
+    n_min, n_max = 0, max(1, int(ceil((value_new - value_old) / step)))
+    while below(n_max):
+        n_min, n_max = n_max, 2 * n_max
+    while n_max - n_min > 1:
+        n_steps = (n_min + n_max) // 2
+        if below(n_steps):
+            n_min = n_steps
+        else:
+            n_max = n_steps
+    n_steps = n_max
+    value_new = (value_old + n_steps * step) * sqrt(2.)
 
     if excess >= 0.:
         conf_limit = (value_new + zeta) * excess_error
@@ -511,9 +523,9 @@ def excess_matching_significance(mu_bkg, significance, method='lima'):
     Examples
     --------
     >>> excess_matching_significance(mu_bkg=0.2, significance=5, method='lima')
-    TODO
+    5.170386755239416
     >>> excess_matching_significance(mu_bkg=0.2, significance=5, method='simple')
-    TODO
+    2.23606797749979
     """
     mu_bkg = np.asanyarray(mu_bkg, dtype=np.float64)
     significance = np.asanyarray(significance, dtype=np.float64)
@@ -527,11 +539,17 @@ def excess_matching_significance(mu_bkg, significance, method='lima'):
 
 
 def _excess_matching_significance_simple(mu_bkg, significance):
-    raise NotImplementedError
+    return significance * np.sqrt(mu_bkg)
 
 
 def _excess_matching_significance_lima(mu_bkg, significance):
-    raise NotImplementedError
+    def derivatives(n_on, mu_bkg):
+        return np.log(n_on / mu_bkg), 1 / n_on
+
+    n_on_guess = mu_bkg + _excess_matching_significance_simple(mu_bkg, significance)
+    n_on = _n_on_matching_significance(significance, n_on_guess, _significance_lima,
+                                       derivatives, mu_bkg)
+    return n_on - mu_bkg
 
 
 def excess_matching_significance_on_off(n_off, alpha, significance, method='lima'):
@@ -566,7 +584,7 @@ def excess_matching_significance_on_off(n_off, alpha, significance, method='lima
     >>> excess_matching_significance_on_off(n_off=20,alpha=0.1,significance=5,method='simple')
     27.034
     >>> excess_matching_significance_on_off(n_off=20,alpha=0.1,significance=0,method='lima')
-    2.307301461e-09
+    0.0
     >>> excess_matching_significance_on_off(n_off=20,alpha=0.1,significance=0,method='simple')
     0.0
     >>> excess_matching_significance_on_off(n_off=20,alpha=0.1,significance=-10,method='lima')
@@ -596,28 +614,79 @@ def _excess_matching_significance_on_off_simple(n_off, alpha, significance):
 
 
 def _excess_matching_significance_on_off_lima(n_off, alpha, significance):
-    from scipy.optimize import fsolve
-
-    # Significance not well-defined for n_on < 0
-    # Return Nan if given significance can't be reached
-    s0 = _significance_lima_on_off(n_on=1e-5, n_off=n_off, alpha=alpha)
-    if s0 >= significance:
-        return np.nan
-
-    def target_significance(n_on):
-        if n_on >= 0:
-            return _significance_lima_on_off(n_on, n_off, alpha) - significance
-        else:
-            # This high value is to tell the optimiser to stay n_on >= 0
-            return 1e10
+    def derivatives(n_on, n_off, alpha):
+        n_tot = n_on + n_off
+        return np.log(n_on * (1 + alpha) / (alpha * n_tot)), n_off / (n_on * n_tot)
 
     excess_guess = _excess_matching_significance_on_off_simple(n_off, alpha, significance)
     n_on_guess = excess_guess + background(n_off, alpha)
-
-    # solver options to control robustness / accuracy / speed
-    opts = dict(factor=0.1)
-    n_on = fsolve(target_significance, n_on_guess, **opts)
+    n_on = _n_on_matching_significance(significance, n_on_guess, _significance_lima_on_off,
+                                       derivatives, n_off, alpha)
     return n_on - background(n_off, alpha)
 
 
-_excess_matching_significance_on_off_lima = np.vectorize(_excess_matching_significance_on_off_lima)
+_N_ON_MIN = 1e-5
+_MAX_ITER = 100
+_TOLERANCE = 1e-12
+
+
+def _n_on_matching_significance(significance, n_on_guess, func, derivatives, *args):
+    r"""Solve ``func(n_on, *args) = significance`` for ``n_on``.
+
+    ``func`` is a Li & Ma significance :math:`S = \pm \sqrt{2 T}` and
+    ``derivatives(n_on, *args)`` returns the first and second derivative of
+    :math:`T` with respect to ``n_on``. All elements are solved together with
+    Newton steps on :math:`S`, falling back to bisection whenever a step leaves
+    the bracket of the root.
+
+    The significance is not well-defined for ``n_on < 0``, so NaN is returned where
+    the given significance can't be reached.
+    """
+    shape = np.broadcast(significance, n_on_guess, *args).shape
+    significance, n_on_guess = [np.broadcast_to(arg, shape).ravel() for arg in (significance, n_on_guess)]
+    args = [np.broadcast_to(arg, shape).ravel() for arg in args]
+    n_on = np.full_like(significance, np.nan)
+
+    # Bracket the root between n_on_min and n_on_max
+    n_on_min = np.full_like(significance, _N_ON_MIN)
+    with np.errstate(all='ignore'):
+        idx = np.flatnonzero(func(n_on_min, *args) < significance)
+        n_on_max = np.maximum(n_on_guess, 1)
+        todo = idx
+        for _ in range(_MAX_ITER):
+            reached = func(n_on_max[todo], *[arg[todo] for arg in args]) >= significance[todo]
+            todo = todo[~reached]
+            if len(todo) == 0:
+                break
+            n_on_max[todo] *= 2
+
+        idx = np.setdiff1d(idx, todo)
+        lo, hi = n_on_min[idx], n_on_max[idx]
+        x = np.clip(n_on_guess[idx], lo, hi)
+        x = np.where(np.isfinite(x), x, (lo + hi) / 2)
+
+        for _ in range(_MAX_ITER):
+            args_idx = [arg[idx] for arg in args]
+            s = func(x, *args_idx)
+            f = s - significance[idx]
+            lo = np.where(f < 0, x, lo)
+            hi = np.where(f < 0, hi, x)
+
+            # dS / dn_on = T' / S, which is sqrt(T'') where S = 0
+            t1, t2 = derivatives(x, *args_idx)
+            slope = np.where(s == 0, np.sqrt(t2), t1 / s)
+            x_new = x - f / slope
+
+            bisect = ~((x_new > lo) & (x_new < hi))
+            x_new[bisect] = (lo[bisect] + hi[bisect]) / 2
+
+            x_new[f == 0] = x[f == 0]
+            done = (np.abs(x_new - x) <= _TOLERANCE * x_new)
+            n_on[idx[done]] = x_new[done]
+
+            keep = ~done
+            idx, x, lo, hi = idx[keep], x_new[keep], lo[keep], hi[keep]
+            if len(idx) == 0:
+                break
+
+    return n_on.reshape(shape)
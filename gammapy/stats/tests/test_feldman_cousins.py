@@ -13,6 +13,7 @@ from ...stats import (
     fc_find_limit,
     fc_find_average_upper_limit,
     fc_construct_acceptance_intervals,
+    fc_construct_acceptance_intervals_poisson,
 )
 
 
@@ -114,6 +115,43 @@ def test_numerical_confidence_interval_pdfs():
     assert_allclose(average_upper_limit, 4.42, atol=0.1)
 
 
+@requires_dependency('scipy')
+def test_acceptance_intervals_poisson_cache(tmpdir):
+    x_bins = np.arange(0, 50)
+    mu_bins = np.linspace(0, 15, 3001)
+
+    matrix, acceptance_intervals = fc_construct_acceptance_intervals_poisson(
+        mu_bins, x_bins, 3.0, 0.9, cache_dir=str(tmpdir / 'fc'))
+    assert len(tmpdir.join('fc').listdir()) == 1
+
+    cached = fc_construct_acceptance_intervals_poisson(
+        mu_bins, x_bins, 3.0, 0.9, cache_dir=str(tmpdir / 'fc'))
+    assert_allclose(cached[0], matrix)
+    assert_allclose(cached[1], acceptance_intervals)
+
+    lower_limit_num, upper_limit_num, _ = fc_get_limits(mu_bins, x_bins, acceptance_intervals)
+    assert_allclose(fc_find_limit(6, upper_limit_num, mu_bins), 8.47, atol=0.01)
+    assert_allclose(fc_find_limit(6, lower_limit_num, mu_bins), 0.15, atol=0.01)
+
+    # A different background is a different belt
+    fc_construct_acceptance_intervals_poisson(
+        mu_bins, x_bins, 0.5, 0.9, cache_dir=str(tmpdir / 'fc'))
+    assert len(tmpdir.join('fc').listdir()) == 2
+
+
+@requires_dependency('scipy')
+def test_acceptance_intervals_poisson_cache_failed_write(tmpdir, monkeypatch):
+    def savez(*args, **kwargs):
+        raise IOError('Disk full')
+
+    # A failed write leaves neither a partial belt nor a temporary file
+    monkeypatch.setattr(np, 'savez', savez)
+    with pytest.raises(IOError):
+        fc_construct_acceptance_intervals_poisson(
+            np.linspace(0, 5, 51), np.arange(0, 20), 1.0, 0.9, cache_dir=str(tmpdir))
+    assert tmpdir.listdir() == []
+
+
 @requires_dependency('scipy')
 def test_numerical_confidence_interval_values():
     from scipy import stats
@@ -127,3 +127,38 @@ def test_wstat_corner_cases():
     actual = stats.get_wstat_mu_bkg(n_on=n_on, mu_sig=mu_sig, n_off=n_off, alpha=alpha)
     desired = 0
     assert_allclose(actual, desired)
+
+
+def test_fit_statistic_kernels(test_data):
+    n_on, n_off, alpha = test_data['n_on'], test_data['n_off'], test_data['alpha']
+    mu_sig = test_data['mu_sig'].copy()
+    mu_sig[[1, 4]] = [0, -1]
+    mask = np.ones(10, dtype=bool)
+    mask[-1] = False
+
+    kernel = stats.CashKernel(n_on, mask=mask)
+    desired = np.where(mask, stats.cash(n_on, mu_sig), 0)
+    assert_allclose(kernel.evaluate(mu_sig), desired)
+    assert_allclose(kernel.total(mu_sig), np.sum(desired))
+
+    kernel = stats.CStatKernel(n_on, mask=mask)
+    desired = np.where(mask, stats.cstat(n_on, mu_sig), 0)
+    assert_allclose(kernel.evaluate(mu_sig), desired)
+
+    mu_sig = np.abs(mu_sig)
+    kernel = stats.WStatKernel(n_on, n_off, alpha)
+    assert_allclose(kernel.evaluate(mu_sig), stats.wstat(n_on, n_off, alpha, mu_sig))
+    assert_allclose(kernel.mu_bkg, stats.get_wstat_mu_bkg(n_on, n_off, alpha, mu_sig))
+
+
+def test_fit_statistic_kernels_stacked(test_data, reference_values):
+    # Stacked (n_obs, n_bins) counts give the same result for each observation
+    args = [np.array([test_data[_], test_data[_][::-1]]) for _ in ['n_on', 'n_off', 'alpha']]
+    mu_sig = np.array([test_data['mu_sig'], test_data['mu_sig'][::-1]])
+
+    kernel = stats.WStatKernel(*args)
+    stat = kernel.evaluate(mu_sig)
+    assert stat.shape == (2, 10)
+    assert_allclose(stat[0], reference_values['wstat'])
+    assert_allclose(stat[1], reference_values['wstat'][::-1])
+    assert_allclose(kernel.total(mu_sig), 2 * np.sum(reference_values['wstat']))
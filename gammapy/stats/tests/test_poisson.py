@@ -77,9 +77,19 @@ def test_significance_on_off(p):
     assert_allclose(s, p['s'], atol=1e-5)
 
 
-@pytest.mark.xfail()
 def test_excess_matching_significance():
-    raise NotImplementedError
+    excess = excess_matching_significance(mu_bkg=0.2, significance=5)
+    assert_allclose(excess, 5.170387, atol=1e-3)
+    excess = excess_matching_significance(mu_bkg=0.2, significance=5, method='simple')
+    assert_allclose(excess, 2.236068, atol=1e-3)
+
+    # Arrays should work, and cases that can't be achieved with n_on >= 0 should return NaN
+    excess = excess_matching_significance(mu_bkg=[10, 10, 2], significance=[-1, 5, -3])
+    assert_allclose(excess, [-2.9908, 19.58009, np.nan], atol=1e-3)
+
+    mu_bkg = np.array([0.01, 1, 100, 1e4])
+    excess = excess_matching_significance(mu_bkg, significance=5)
+    assert_allclose(significance(excess + mu_bkg, mu_bkg), 5)
 
 
 def test_excess_matching_significance_on_off():
@@ -105,6 +115,12 @@ def test_excess_matching_significance_on_off():
     excess = excess_matching_significance_on_off(n_off=[[10, 20], [10, 20]], alpha=0.1, significance=5)
     assert_allclose(excess, [[9.82966, 12.038423], [9.82966, 12.038423]], atol=1e-3)
 
+    # Extreme inputs where the default solver options of scipy.optimize.fsolve
+    # don't converge
+    n_off, alpha, s = np.array([1.642906, 6.232669]), np.array([3.142116, 1.844753]), [-1.670597, -2.939431]
+    excess = excess_matching_significance_on_off(n_off, alpha, s)
+    assert_allclose(significance_on_off(excess + alpha * n_off, n_off, alpha), s, atol=1e-6)
+
 
 @pytest.mark.parametrize('p', TEST_CASES)
 def test_excess_matching_significance_on_off_roundtrip(p):
@@ -1,10 +1,14 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import contextlib
 from collections import OrderedDict
+from functools import partial
+from multiprocessing import Pool
 import numpy as np
 import astropy.units as u
 from astropy.table import Table
 from astropy.time import Time
+from astropy.utils import lazyproperty
 from ..spectrum.utils import CountsPredictor
 from ..stats.poisson import excess_error, excess_ul_helene
 from ..utils.scripts import make_path
@@ -15,6 +19,8 @@ __all__ = [
     'LightCurveEstimator',
 ]
 
+_FLUX_UNIT = u.Unit('1 / (s cm2)')
+
 
 class LightCurve(object):
     """Lightcurve container.
@@ -367,6 +373,29 @@ class LightCurveEstimator(object):
         self.obs_spec = spec_extract.observations
         self.off_evt_list = self._get_off_evt_list(spec_extract)
         self.on_evt_list = self._get_on_evt_list(spec_extract)
+        self._energy_bands = dict()
+
+    @lazyproperty
+    def _event_index(self):
+        # Time-sorted on and off event index of each observation, on and off
+        # use the same time reference, so intervals are converted only once
+        event_index = []
+        for on, off in zip(self.on_evt_list, self.off_evt_list):
+            on_index = _EventTimeIndex(on)
+            off_index = _EventTimeIndex(off, time_ref=on_index.time_ref)
+            event_index.append((on_index, off_index))
+        return event_index
+
+    @lazyproperty
+    def _obs_info(self):
+        # Start, stop and dead time fraction, loading the events only once
+        info = []
+        for obs in self.obs_list:
+            events = obs.events
+            info.append((events.observation_time_start,
+                         events.observation_time_end,
+                         obs.observation_dead_time_fraction))
+        return info
 
     @staticmethod
     def _get_off_evt_list(spec_extract):
@@ -459,16 +488,12 @@ class LightCurveEstimator(object):
         # get ON and OFF evt list
         off = self.off_evt_list[t_index]
         on = self.on_evt_list[t_index]
-        # introduce the e_reco binning here
         e_reco = spec.e_reco
         if energy_range is not None:
-            emin = e_reco[e_reco.searchsorted(max(spec.lo_threshold, energy_range[0]))]
-            emax = e_reco[e_reco.searchsorted(min(spec.hi_threshold, energy_range[1])) - 1]
             # filter the event list with energy
-            on = on.select_energy([emin, emax])
-            on = on.select_energy(energy_range)
-            off = off.select_energy([emin, emax])
-            off = off.select_energy(energy_range)
+            energy_band = self._energy_band(t_index, energy_range)
+            on = on.select_energy(energy_band)
+            off = off.select_energy(energy_band)
         if interval is not None:
             # filter the event list with time
             tmin = interval[0]
@@ -479,58 +504,22 @@ class LightCurveEstimator(object):
             return on, off, spec, e_reco
         return on, off
 
-    @staticmethod
-    def _alpha(time_holder, obs_properties, n, istart, i):
-        """ Helper function for make_time_intervals_min_significance
+    def _energy_band(self, t_index, energy_range):
+        """Energy band ``[emin, emax)`` of the events to use for an observation.
 
-        Parameters
-        ----------
-        time_holder : `list` of float and flag
-            Contains a list of a time and a flag in 2-element arrays
-        obs_properties : `~astropy.table.Table`
-            Contains the dead time fraction and ratio of the on/off region
-        n : int
-            First observation to use
-        istart : int
-            index of the first event of the interval
-        i : int
-            index of the last event of the interval
+        The user energy range, restricted to the observation energy thresholds
+        and rounded to the e_reco binning.
         """
-
-        def in_list(item, L):
-            o, j = np.where(L == item)
-            for index in o:
-                yield index
-
-        alpha = 0
-        tmp = 0
-        time = 0
-        xm1 = istart
-        # loop over observations
-        for x in in_list('end', time_holder[istart:i + 1]):
-            if tmp == 0:
-                alpha += (1 - obs_properties['deadtime'][n]) * (
-                         float(time_holder[x][0]) - (float(time_holder[xm1][0]) + float(time_holder[xm1 - 1][0])) / 2) * \
-                         obs_properties['A_off'][n + tmp]
-                time += (1 - obs_properties['deadtime'][n]) * (
-                        float(time_holder[x][0]) - (float(time_holder[xm1][0]) + float(time_holder[xm1 - 1][0])) / 2)
-                xm1 = x + 1
-                tmp += 1
-            else:
-                alpha += (1 - obs_properties['deadtime'][n + tmp]) * (
-                        float(time_holder[x][0]) - float(time_holder[xm1][0])) * \
-                         obs_properties['A_off'][n + tmp]
-                time += (1 - obs_properties['deadtime'][n + tmp]) * (
-                            float(time_holder[x][0]) - float(time_holder[xm1][0]))
-                xm1 = x + 1
-                tmp += 1
-        alpha += (1 - obs_properties['deadtime'][n + tmp]) * (
-                    (float(time_holder[i][0]) + float(time_holder[i][0])) / 2 - float(time_holder[xm1][0])) * \
-                 obs_properties['A_off'][n + tmp]
-        time += (1 - obs_properties['deadtime'][n + tmp]) * (
-                    (float(time_holder[i][0]) + float(time_holder[i][0])) / 2 - float(time_holder[xm1][0]))
-        alpha = time / alpha
-        return alpha
+        energy_range = u.Quantity(energy_range)
+        key = (t_index, tuple(energy_range.value), str(energy_range.unit))
+        if key not in self._energy_bands:
+            spec = self.obs_spec[t_index]
+            e_reco = spec.e_reco
+            emin = e_reco[e_reco.searchsorted(max(spec.lo_threshold, energy_range[0]))]
+            emax = e_reco[e_reco.searchsorted(min(spec.hi_threshold, energy_range[1])) - 1]
+            self._energy_bands[key] = u.Quantity([max(emin, energy_range[0]),
+                                                  min(emax, energy_range[1])])
+        return self._energy_bands[key]
 
     def make_time_intervals_min_significance(self, significance, significance_method, energy_range,
                                              spectrum_extraction, separators=None):
@@ -566,83 +555,45 @@ class LightCurveEstimator(object):
 
         """
 
-        # The function create a list of time associated with identifiers called time_holder.
-        # The identifiers can be 'on' for the on events, 'off' for the off events, 'start' for the start of an
-        # observation, 'end for the end of an observation and 'break' for a separator.
-        # The function then loop other all the elements of this list
-
-        time_holder = []
-        obs_properties = []
-        n_obs = 0
+        # All times are collected in one array, with a flag array identifying them as on events, off events,
+        # the start or end of an observation or a separator, and sorted by time.
+        times, flags = [], []
 
         # extract the separators
         if separators is not None:
             for time in separators:
-                time_holder.append([time.tt.mjd, 'break'])
+                times.append([time.tt.mjd])
+                flags.append([_BREAK])
 
         # recovers the starting and ending time of each observations and useful properties
-        for obs in spectrum_extraction.obs_list:
-            time_holder.append([obs.events.observation_time_start.tt.mjd, 'start'])
-            time_holder.append([obs.events.observation_time_end.tt.mjd, 'end'])
-            obs_properties.append(dict(deadtime=obs.observation_dead_time_fraction,
-                                       A_off=spectrum_extraction.bkg_estimate[n_obs].a_off))
-            n_obs += 1
-        obs_properties = Table(rows=obs_properties)
+        dead_time, a_off = [], []
+        for n_obs, obs in enumerate(spectrum_extraction.obs_list):
+            times.append([obs.events.observation_time_start.tt.mjd, obs.events.observation_time_end.tt.mjd])
+            flags.append([_START, _END])
+            dead_time.append(obs.observation_dead_time_fraction)
+            a_off.append(spectrum_extraction.bkg_estimate[n_obs].a_off)
 
         # prepare the on and off photon list as in the flux point computation -> should be updated accordingly
         for t_index, obs in enumerate(self.obs_list):
             on, off = self._create_and_filter_onofflists(t_index=t_index, energy_range=energy_range)
-
-            for time in on.time.tt.mjd:
-                time_holder.append([time, 'on'])
-            for time in off.time.tt.mjd:
-                time_holder.append([time, 'off'])
-
-        # sort all elements in the table by time
-        time_holder = sorted(time_holder, key=lambda item: item[0])
-        time_holder = np.asarray(time_holder)
-
-        rows = []
-        istart = 1
-        i = 1
-        n = 0
-        while time_holder[i][0] < time_holder[-1][0]:
-            i += 1
-            if time_holder[i][1] == 'break':
-                while time_holder[i + 1][1] != 'on' and time_holder[i + 1][1] != 'off':
-                    i += 1
-                n += np.sum(time_holder[istart:i] == 'end')
-                istart = i
-                continue
-            if time_holder[i][1] != 'on' and time_holder[i][1] != 'off':
-                continue
-
-            # compute alpha
-            alpha = self._alpha(time_holder, obs_properties, n, istart, i)
-
-            non = np.sum(time_holder[istart:i + 1] == 'on')
-            noff = np.sum(time_holder[istart:i + 1] == 'off')
-
-            # check the significance
-            signif = significance_on_off(non, noff, alpha, method=significance_method)
-            if signif > significance:
-                rows.append(dict(
-                    t_start=(float(time_holder[istart - 1][0]) + float(time_holder[istart][0])) / 2,
-                    t_stop=(float(time_holder[i][0]) + float(time_holder[i + 1][0])) / 2,
-                    n_on=non, n_off=noff, alpha=alpha, significance=signif))
-                # start the next interval
-                while time_holder[i + 1][0] < time_holder[-1][0] and time_holder[i + 1][1] != 'on' and \
-                        time_holder[i + 1][1] != 'off':
-                    i += 1
-                n += np.sum(time_holder[istart:i + 1] == 'end')
-                istart = i + 1
-                i = istart
+            times += [on.time.tt.mjd, off.time.tt.mjd]
+            flags += [np.full(len(on.table), _ON), np.full(len(off.table), _OFF)]
+
+        # sort all elements by time, keeping the insertion order for equal times
+        times = np.hstack(times).astype(float)
+        flags = np.hstack(flags).astype(int)
+        order = np.argsort(times, kind='mergesort')
+
+        rows = _min_significance_intervals(
+            times[order], flags[order], np.array(dead_time, dtype=float), np.array(a_off, dtype=float),
+            significance, significance_method,
+        )
         table = Table(rows=rows)
         table['t_start'] = Time(table['t_start'], format='mjd', scale='tt')
         table['t_stop'] = Time(table['t_stop'], format='mjd', scale='tt')
         return table
 
-    def light_curve(self, time_intervals, spectral_model, energy_range, ul_significance=3):
+    def light_curve(self, time_intervals, spectral_model, energy_range, ul_significance=3, n_jobs=1):
         """Compute light curve.
 
         Implementation follows what is done in:
@@ -651,6 +602,11 @@ class LightCurveEstimator(object):
         To be discussed: assumption that threshold energy in the
         same in reco and true energy.
 
+        The events of all time intervals are counted at once in the main
+        process, the flux points are then computed from the per-observation
+        counts and predicted excess of each time interval, optionally in
+        parallel.
+
         Parameters
         ----------
         time_intervals : `list` of `~astropy.time.Time`
@@ -661,17 +617,32 @@ class LightCurveEstimator(object):
             True energy range to evaluate integrated flux (true energy)
         ul_significance : float
             Upper limit confidence level significance
+        n_jobs : int
+            Number of processes used to compute the flux points
 
         Returns
         -------
         lc : `~gammapy.time.LightCurve`
             Light curve
         """
+        counts = self._interval_counts(time_intervals, spectral_model, energy_range)
+
+        compute = partial(
+            _flux_point_measurements,
+            int_flux=spectral_model.integral(energy_range[0], energy_range[1]),
+            ul_significance=ul_significance,
+        )
+
+        if n_jobs > 1:
+            with contextlib.closing(Pool(processes=n_jobs)) as pool:
+                measurements = pool.map(compute, counts)
+        else:
+            measurements = [compute(_) for _ in counts]
+
         rows = []
-        for time_interval in time_intervals:
-            useinterval, row = self.compute_flux_point(time_interval, spectral_model, energy_range, ul_significance)
+        for time_interval, (useinterval, measurement) in zip(time_intervals, measurements):
             if useinterval:
-                rows.append(row)
+                rows.append(self._flux_point_row(time_interval, measurement))
 
         return self._make_lc_from_row_data(rows)
 
@@ -716,123 +687,401 @@ class LightCurveEstimator(object):
         measurements : dict
             Dictionary with flux point measurement in the time interval
         """
-        tmin, tmax = time_interval[0], time_interval[1]
-        livetime = 0
-        alpha_mean = 0.
-        alpha_mean_backup = 0.
-        measured_excess = 0
-        predicted_excess = 0
-        n_on = 0
-        n_off = 0
-        useinterval = False
+        counts = self._interval_counts([time_interval], spectral_model, energy_range)[0]
+        int_flux = spectral_model.integral(energy_range[0], energy_range[1])
+        useinterval, measurement = _flux_point_measurements(counts, int_flux, ul_significance)
+        return useinterval, self._flux_point_row(time_interval, measurement)
+
+    @staticmethod
+    def _flux_point_row(time_interval, measurement):
+        row = OrderedDict([
+            ('time_min', Time(time_interval[0], format='mjd')),
+            ('time_max', Time(time_interval[1], format='mjd')),
+        ])
+        row.update(measurement)
+        return row
+
+    def _predicted_rate(self, t_index, spectral_model, energy_range):
+        """Predicted excess per second of livetime for an observation.
+
+        Summed over the reco energy bins within the user energy range and
+        the observation energy thresholds.
+        """
+        spec = self.obs_spec[t_index]
+        e_reco = spec.e_reco
+        e_idx = np.where(np.logical_and.reduce(
+            (e_reco >= spec.lo_threshold,  # threshold
+             e_reco <= spec.hi_threshold,  # threshold
+             e_reco >= energy_range[0],  # user
+             e_reco <= energy_range[-1])  # user
+        ))[0]
+        counts_predictor = CountsPredictor(
+            livetime=1 * u.s,
+            aeff=spec.aeff,
+            edisp=spec.edisp,
+            model=spectral_model
+        )
+        counts_predictor.run()
+        counts_predicted_excess = counts_predictor.npred.data.data[e_idx[:-1]]
+        return np.sum(counts_predicted_excess).value
+
+    def _interval_counts(self, time_intervals, spectral_model, energy_range):
+        """Per-observation counts of each time interval for `_flux_point_measurements`.
+
+        The intervals are converted to MET once per observation, and the
+        events of all intervals are counted with one `~numpy.searchsorted`.
+
+        Parameters
+        ----------
+        time_intervals : `list` of `~astropy.time.Time`
+            List of time intervals
+        spectral_model : `~gammapy.spectrum.models.SpectralModel`
+            Spectral model
+        energy_range : `~astropy.units.Quantity`
+            True energy range to evaluate integrated flux (true energy)
+
+        Returns
+        -------
+        counts : list of dict
+            Arrays ``n_on``, ``n_off``, ``livetime`` (s), ``alpha`` and
+            ``predicted_excess`` of the observations overlapping each interval
+        """
+        tmin = Time([time_interval[0] for time_interval in time_intervals])
+        tmax = Time([time_interval[1] for time_interval in time_intervals])
+
+        names = ['n_on', 'n_off', 'livetime', 'alpha', 'predicted_excess']
+        obs_counts = []
 
         # Loop on observations
-        for t_index, obs in enumerate(self.obs_list):
+        for t_index, (obs_start, obs_stop, dead_time_fraction) in enumerate(self._obs_info):
+            # interval bounds in seconds since the observation start
+            start = (tmin - obs_start).to('s').value
+            stop = (tmax - obs_start).to('s').value
+            duration = (obs_stop - obs_start).to('s').value
 
             # discard observations not matching the time interval
-            obs_start = obs.events.observation_time_start
-            obs_stop = obs.events.observation_time_end
-            if (tmin < obs_start and tmax < obs_start) or (tmin > obs_stop):
-                continue
-            useinterval = True
-            # get ON and OFF evt list
-            on, off, spec, e_reco = self._create_and_filter_onofflists(t_index=t_index, energy_range=energy_range,
-                                                                       interval=[tmin, tmax], extra=True)
-            n_on_obs = len(on.table)
-            n_off_obs = len(off.table)
-
-            # compute effective livetime (for the interval)
-            if tmin >= obs_start and tmax <= obs_stop:
-                # interval included in obs
-                livetime_to_add = (tmax - tmin).to('s')
-            elif tmin >= obs_start and tmax >= obs_stop:
-                # interval min above tstart from obs
-                livetime_to_add = (obs_stop - tmin).to('s')
-            elif tmin <= obs_start and tmax <= obs_stop:
-                # interval min below tstart from obs
-                livetime_to_add = (tmax - obs_start).to('s')
-            elif tmin <= obs_start and tmax >= obs_stop:
-                # obs included in interval
-                livetime_to_add = (obs_stop - obs_start).to('s')
-            else:
-                livetime_to_add = 0 * u.s
-
-            # Take into account dead time
-            livetime_to_add *= (1. - obs.observation_dead_time_fraction)
-
-            # Compute excess
-            obs_measured_excess = n_on_obs - spec.alpha * n_off_obs
+            overlap = ~(((start < 0) & (stop < 0)) | (start > duration))
+
+            # count ON and OFF events
+            on_index, off_index = self._event_index[t_index]
+            met_interval = on_index.to_met([tmin, tmax])
+            energy_band = self._energy_band(t_index, energy_range)
+            n_on = on_index.count(energy_band, met_interval)
+            n_off = off_index.count(energy_band, met_interval)
+
+            # compute effective livetime (for the interval) and take into
+            # account dead time
+            livetime = np.minimum(stop, duration) - np.maximum(start, 0)
+            livetime = livetime * (1. - dead_time_fraction)
 
             # Compute the expected excess in the range given by the user
             # but must respect the energy threshold of the observation
             # (to match the energy range of the measured excess)
             # We use the effective livetime and the right energy threshold
-            e_idx = np.where(np.logical_and.reduce(
-                (e_reco >= spec.lo_threshold,  # threshold
-                 e_reco <= spec.hi_threshold,  # threshold
-                 e_reco >= energy_range[0],  # user
-                 e_reco <= energy_range[-1])  # user
-            ))[0]
-            counts_predictor = CountsPredictor(
-                livetime=livetime_to_add,
-                aeff=spec.aeff,
-                edisp=spec.edisp,
-                model=spectral_model
-            )
-            counts_predictor.run()
-            counts_predicted_excess = counts_predictor.npred.data.data[e_idx[:-1]]
-
-            obs_predicted_excess = np.sum(counts_predicted_excess)
-
-            # compute effective normalisation between ON/OFF (for the interval)
-            livetime += livetime_to_add
-            alpha_mean += spec.alpha * n_off_obs
-            alpha_mean_backup += spec.alpha * livetime_to_add
-            measured_excess += obs_measured_excess
-            predicted_excess += obs_predicted_excess
-            n_on += n_on_obs
-            n_off += n_off_obs
-
-        # Fill time interval information
-        if useinterval:
-            int_flux = spectral_model.integral(energy_range[0], energy_range[1])
-
-            if n_off > 0.:
-                alpha_mean /= n_off
-            if livetime > 0.:
-                alpha_mean_backup /= livetime
-            if alpha_mean == 0.:  # use backup if necessary
-                alpha_mean = alpha_mean_backup
-
-            flux = measured_excess / predicted_excess.value
-            flux *= int_flux
-
-            # Gaussian errors, TODO: should be improved
-            flux_err = int_flux / predicted_excess.value
-            delta_excess = excess_error(n_on=n_on, n_off=n_off, alpha=alpha_mean)
-            flux_err *= delta_excess
-
-            sigma = significance_on_off(n_on=n_on, n_off=n_off, alpha=alpha_mean, method='lima')
-            is_ul = sigma <= 3
-            flux_ul = excess_ul_helene(n_on - alpha_mean * n_off, delta_excess, ul_significance)
-            flux_ul *= int_flux / predicted_excess.value
+            rate = self._predicted_rate(t_index, spectral_model, energy_range)
+            alpha = [self.obs_spec[t_index].alpha] * len(time_intervals)
+
+            obs_counts.append((overlap, [n_on, n_off, livetime, alpha, rate * livetime]))
+
+        counts = []
+        for idx in range(len(time_intervals)):
+            values = [[] for _ in names]
+            for overlap, obs_values in obs_counts:
+                if overlap[idx]:
+                    for value, obs_value in zip(values, obs_values):
+                        value.append(obs_value[idx])
+            counts.append(OrderedDict((name, np.array(value)) for name, value in zip(names, values)))
+
+        return counts
+
+
+def _flux_point_measurements(counts, int_flux, ul_significance):
+    """Flux point measurements for one time interval.
+
+    Helper function for `LightCurveEstimator.compute_flux_point`, only
+    using the compact per-observation counts.
+
+    Parameters
+    ----------
+    counts : dict
+        Per-observation counts, see ``LightCurveEstimator._interval_counts``
+    int_flux : `~astropy.units.Quantity`
+        Integral flux of the spectral model in the energy range
+    ul_significance : float
+        Upper limit confidence level significance
+
+    Returns
+    -------
+    useinterval : bool
+        Is True if the time interval overlaps any observation
+    measurements : dict
+        Flux point measurements, without the time interval
+    """
+    livetime = 0
+    alpha_mean = 0.
+    alpha_mean_backup = 0.
+    measured_excess = 0
+    predicted_excess = 0
+    n_on = 0
+    n_off = 0
+
+    values = [counts[name] for name in
+              ['n_on', 'n_off', 'livetime', 'alpha', 'predicted_excess']]
+    useinterval = len(values[0]) > 0
+
+    for n_on_obs, n_off_obs, livetime_to_add, alpha, obs_predicted_excess in zip(*values):
+        # Compute excess
+        obs_measured_excess = n_on_obs - alpha * n_off_obs
+
+        # compute effective normalisation between ON/OFF (for the interval)
+        livetime += livetime_to_add
+        alpha_mean += alpha * n_off_obs
+        alpha_mean_backup += alpha * livetime_to_add
+        measured_excess += obs_measured_excess
+        predicted_excess += obs_predicted_excess
+        n_on += n_on_obs
+        n_off += n_off_obs
+
+    # Fill time interval information
+    if useinterval:
+        if n_off > 0.:
+            alpha_mean /= n_off
+        if livetime > 0.:
+            alpha_mean_backup /= livetime
+        if alpha_mean == 0.:  # use backup if necessary
+            alpha_mean = alpha_mean_backup
+
+        flux = measured_excess / predicted_excess
+        flux *= int_flux
+
+        # Gaussian errors, TODO: should be improved
+        flux_err = int_flux / predicted_excess
+        delta_excess = excess_error(n_on=n_on, n_off=n_off, alpha=alpha_mean)
+        flux_err *= delta_excess
+
+        sigma = significance_on_off(n_on=n_on, n_off=n_off, alpha=alpha_mean, method='lima')
+        is_ul = sigma <= 3
+        flux_ul = excess_ul_helene(n_on - alpha_mean * n_off, delta_excess, ul_significance)
+        flux_ul *= int_flux / predicted_excess
+        predicted_excess = u.Quantity(predicted_excess, '')
+    else:
+        flux = 0
+        flux_err = 0
+        flux_ul = -1
+        is_ul = False
+
+    # Store measurements in a dict and return that
+    return useinterval, OrderedDict([
+        ('flux', flux * _FLUX_UNIT),
+        ('flux_err', flux_err * _FLUX_UNIT),
+        ('flux_ul', flux_ul * _FLUX_UNIT),
+        ('is_ul', is_ul),
+        ('livetime', livetime * u.s),
+        ('alpha', alpha_mean),
+        ('n_on', n_on),
+        ('n_off', n_off),
+        ('measured_excess', measured_excess),
+        ('expected_excess', predicted_excess),
+    ])
+
+
+class _EventTimeIndex(object):
+    """Time-sorted index of an event list.
+
+    Stores the event times as sorted MET seconds, with the event energies in
+    the same order. The number of events in a time interval and energy band
+    is then given by a `~numpy.searchsorted` on the times of the events in
+    the band, which are computed once per energy band.
+
+    Parameters
+    ----------
+    events : `~gammapy.data.EventList`
+        Event list
+    time_ref : `~astropy.time.Time`, optional
+        Time reference of the MET, default is the event list time reference
+    """
+
+    def __init__(self, events, time_ref=None):
+        met = np.asarray(events.table['TIME'], dtype='float64')
+        if time_ref is None:
+            time_ref = events.time_ref
         else:
-            flux = 0
-            flux_err = 0
-            flux_ul = -1
-
-        # Store measurements in a dict and return that
-        return useinterval, OrderedDict([
-            ('time_min', Time(tmin, format='mjd')),
-            ('time_max', Time(tmax, format='mjd')),
-            ('flux', flux * u.Unit('1 / (s cm2)')),
-            ('flux_err', flux_err * u.Unit('1 / (s cm2)')),
-            ('flux_ul', flux_ul * u.Unit('1 / (s cm2)')),
-            ('is_ul', is_ul),
-            ('livetime', livetime * u.s),
-            ('alpha', alpha_mean),
-            ('n_on', n_on),
-            ('n_off', n_off),
-            ('measured_excess', measured_excess),
-            ('expected_excess', predicted_excess),
-        ])
+            met = met + (events.time_ref - time_ref).to('s').value
+
+        order = np.argsort(met, kind='mergesort')
+        self.time_ref = time_ref
+        self.met = met[order]
+        self.energy = events.energy.to('TeV').value[order]
+        self._band_met = dict()
+
+    def to_met(self, times):
+        """Convert times (`~astropy.time.Time` or sequence of them) to MET seconds."""
+        return [(time - self.time_ref).to('s').value for time in times]
+
+    def band_met(self, energy_band=None):
+        """Sorted MET of the events in energy band ``[emin, emax)``."""
+        if energy_band is None:
+            return self.met
+
+        emin, emax = u.Quantity(energy_band).to('TeV').value
+        key = (emin, emax)
+        if key not in self._band_met:
+            mask = (emin <= self.energy) & (self.energy < emax)
+            self._band_met[key] = self.met[mask]
+        return self._band_met[key]
+
+    def count(self, energy_band=None, met_interval=None):
+        """Number of events in energy band ``[emin, emax)`` and time interval ``[tmin, tmax)``.
+
+        Parameters
+        ----------
+        energy_band : `~astropy.units.Quantity`, optional
+            Energy band
+        met_interval : tuple of float or `~numpy.ndarray`, optional
+            Time interval in MET seconds, see `to_met`. With arrays of interval
+            bounds, an array with the number of events per interval is returned.
+        """
+        met = self.band_met(energy_band)
+        if met_interval is None:
+            return len(met)
+
+        met_min, met_max = met_interval
+        count = np.searchsorted(met, met_max) - np.searchsorted(met, met_min)
+        return count if np.ndim(count) else int(count)
+
+
+# Flags of the elements of the time array in `_min_significance_intervals`
+_ON, _OFF, _START, _END, _BREAK = range(5)
+
+
+def _min_significance_intervals(times, flags, dead_time, a_off, significance, method):
+    """Greedy time intervals reaching a minimum significance.
+
+    Helper function for `LightCurveEstimator.make_time_intervals_min_significance`.
+    An interval starts at an event and is extended event by event until the
+    on-off significance exceeds ``significance``, or until a separator,
+    where it is dropped. The on and off counts of an interval are differences
+    of running counts and alpha is the ratio of the live time to the
+    ``a_off`` weighted live time of the observations it overlaps.
+
+    Parameters
+    ----------
+    times : `~numpy.ndarray`
+        Sorted times (MJD) of events, observation starts and ends, and separators
+    flags : `~numpy.ndarray`
+        Type of each time: ``_ON``, ``_OFF``, ``_START``, ``_END`` or ``_BREAK``
+    dead_time : `~numpy.ndarray`
+        Dead time fraction per observation
+    a_off : `~numpy.ndarray`
+        Off region acceptance per observation
+    significance : float
+        Target significance
+    method : {'lima', 'simple'}
+        Significance method (see `~gammapy.stats.significance_on_off`)
+
+    Returns
+    -------
+    rows : list of dict
+        Interval start and stop time, ``n_on``, ``n_off``, ``alpha`` and ``significance``
+    """
+    is_event = flags <= _OFF
+    n_on = np.cumsum(flags == _ON)
+    n_off = np.cumsum(flags == _OFF)
+    n_end = np.cumsum(flags == _END)
+    ends = np.flatnonzero(flags == _END)
+    breaks = np.flatnonzero(flags == _BREAK)
+    live = 1 - dead_time
+
+    # Elements at or after the last time only end the scan
+    last = np.searchsorted(times, times[-1])
+
+    rows = []
+    istart, n = 1, 0
+    while istart < last:
+        # the interval can grow up to the next separator
+        idx = np.searchsorted(breaks, istart, side='right')
+        stop = min(breaks[idx], last + 1) if idx < len(breaks) else last + 1
+
+        i = _first_significant(times, is_event, n_on, n_off, n_end, ends, live, a_off,
+                               n, istart, stop, significance, method)
+
+        if i is None:
+            if stop > last:
+                break
+            # restart after the separator
+            i = stop
+            while i + 1 < len(flags) and not is_event[i + 1]:
+                i += 1
+            n += n_end[i - 1] - n_end[istart - 1]
+            istart = i
+            continue
+
+        non = n_on[i] - n_on[istart - 1]
+        noff = n_off[i] - n_off[istart - 1]
+        alpha = _interval_alpha(times, n_end, ends, live, a_off, n, istart, np.array([i]))[0]
+        signif = significance_on_off(non, noff, alpha, method=method)
+        rows.append(dict(
+            t_start=(times[istart - 1] + times[istart]) / 2,
+            t_stop=(times[i] + times[i + 1]) / 2,
+            n_on=non, n_off=noff, alpha=alpha, significance=signif))
+
+        # start the next interval
+        while times[i + 1] < times[-1] and not is_event[i + 1]:
+            i += 1
+        n += n_end[i] - n_end[istart - 1]
+        istart = i + 1
+
+    return rows
+
+
+def _first_significant(times, is_event, n_on, n_off, n_end, ends, live, a_off,
+                       n, istart, stop, significance, method):
+    """First event index in ``(istart, stop)`` closing a significant interval, or None.
+
+    The candidate ends are evaluated in chunks of doubling size, so that the
+    work is proportional to the length of the interval.
+    """
+    size = 64
+    lo = istart + 1
+    while lo < stop:
+        hi = min(lo + size, stop)
+        idx = lo + np.flatnonzero(is_event[lo:hi])
+        if len(idx) > 0:
+            non = n_on[idx] - n_on[istart - 1]
+            noff = n_off[idx] - n_off[istart - 1]
+            alpha = _interval_alpha(times, n_end, ends, live, a_off, n, istart, idx)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                signif = significance_on_off(non, noff, alpha, method=method)
+                hit = np.flatnonzero(signif > significance)
+            if len(hit) > 0:
+                return idx[hit[0]]
+        lo = hi
+        size *= 2
+    return None
+
+
+def _interval_alpha(times, n_end, ends, live, a_off, n, istart, idx):
+    """Exposure-weighted alpha of the intervals from ``istart`` to the indices ``idx``.
+
+    The intervals start in observation ``n``; each observation end they
+    contain closes an observation, whose live time is added with its
+    ``a_off`` weight.
+    """
+    k_max = n_end[idx[-1]] - n_end[istart - 1]
+    idx_end = ends[np.searchsorted(ends, istart):][:k_max]
+
+    # live time and a_off weighted live time of the completed observations
+    time_sum, alpha_sum = [0.], [0.]
+    seg_start = [istart]
+    tmin = (times[istart] + times[istart - 1]) / 2
+    for k, x in enumerate(idx_end):
+        duration = live[n + k] * (times[x] - tmin)
+        alpha_sum.append(alpha_sum[-1] + duration * a_off[n + k])
+        time_sum.append(time_sum[-1] + duration)
+        seg_start.append(x + 1)
+        tmin = times[x + 1]
+
+    k = n_end[idx] - n_end[istart - 1]
+    duration = live[n + k] * (times[idx] - times[np.array(seg_start)[k]])
+    alpha = np.array(time_sum)[k] + duration
+    return alpha / (np.array(alpha_sum)[k] + duration * a_off[n + k])
@@ -1,6 +1,9 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import contextlib
 from collections import OrderedDict
+from functools import partial
+from multiprocessing import Pool
 import numpy as np
 
 __all__ = [
@@ -8,7 +11,8 @@ __all__ = [
 ]
 
 
-def robust_periodogram(time, flux, flux_err=np.array([None]), periods=np.array([None]), loss='linear', scale=1):
+def robust_periodogram(time, flux, flux_err=np.array([None]), periods=np.array([None]), loss='linear', scale=1,
+                       n_jobs=1):
     """
     Compute a light curve's period.
 
@@ -17,7 +21,9 @@ def robust_periodogram(time, flux, flux_err=np.array([None]), periods=np.array([
     The maximum power indicates the period of the light curve, assuming an underlying periodic process.
 
     The fitting can be done by ordinary least square regression (Lomb-Scargle periodogram) or robust regression.
-    For robust regression, the scipy object `~scipy.optimize.least_squares` is called.
+    The loss functions and cost are the ones of `~scipy.optimize.least_squares`.
+    The regression is done for all periods at once, by solving the normal equations
+    for ordinary least squares and by iteratively reweighted least squares for robust regression.
     For an introduction to robust regression techniques and loss functions, see [1]_ and [2]_.
 
     The significance of a periodogram peak can be evaluated in terms of a false alarm probability.
@@ -52,6 +58,8 @@ def robust_periodogram(time, flux, flux_err=np.array([None]), periods=np.array([
     scale : `float` (optional, default=1)
         Loss scale parameter to define margin between inlier and outlier residuals.
         If not given, will be set to 1.
+    n_jobs : `int` (optional, default=1)
+        Number of processes, over which the period grid is split.
 
     Returns
     -------
@@ -74,7 +82,7 @@ def robust_periodogram(time, flux, flux_err=np.array([None]), periods=np.array([
         periods = _period_grid(time)
 
     # compute periodogram
-    psd_data = _robust_regression(time, flux, flux_err, periods, loss, scale)
+    psd_data = _robust_regression(time, flux, flux_err, periods, loss, scale, n_jobs)
 
     # find period of highest periodogram peak
     best_period = periods[np.argmax(psd_data)]
@@ -102,41 +110,158 @@ def _period_grid(time):
     return periods
 
 
-def _model(beta0, x, period, t, y, dy):
+def _robust_regression(time, flux, flux_err, periods, loss, scale, n_jobs=1):
     """
-    Computes the residuals of the periodic model
+    Computes the periodogram peaks for a given loss function and scale
     """
-    x[:, 1] = np.cos(2 * np.pi * t / period)
-    x[:, 2] = np.sin(2 * np.pi * t / period)
+    # the noise-only model doesn't depend on the period
+    chi_noise = _regression_cost([np.ones_like(time)], np.array([[np.median(flux)]]),
+                                 flux, flux_err, loss, scale)[0]
 
-    return (y - np.dot(x, beta0.T)) / dy
+    # split the period grid, to limit the size of the design matrices
+    n_chunks = max(n_jobs, int(np.ceil(len(periods) * len(time) / _CHUNK_SIZE)))
+    chunks = np.array_split(periods, min(n_chunks, len(periods)))
 
+    compute = partial(_harmonic_cost, time=time, flux=flux, flux_err=flux_err,
+                      loss=loss, scale=scale)
 
-def _noise(mu, t, y, dy):
-    """
-    Computes the residuals of the noise-only model
-    """
+    if n_jobs > 1:
+        with contextlib.closing(Pool(processes=n_jobs)) as pool:
+            chi_model = pool.map(compute, chunks)
+    else:
+        chi_model = [compute(chunk) for chunk in chunks]
 
-    return (mu * np.ones(len(t)) - y) / dy
+    power = 1 - np.hstack(chi_model) / chi_noise
+
+    return power
 
 
-def _robust_regression(time, flux, flux_err, periods, loss, scale):
+# Maximum number of elements of the design matrix columns computed at once
+_CHUNK_SIZE = 1000000
+
+# Maximum number of iterations and relative cost tolerance of the robust regression
+_MAX_ITER = 1000
+_TOLERANCE = 1e-10
+
+
+def _harmonic_cost(periods, time, flux, flux_err, loss, scale):
     """
-    Computes the periodogram peaks for a given loss function and scale
+    Computes the cost of the single harmonic model for an array of periods
     """
-    from scipy.optimize import least_squares
+    phase = 2 * np.pi * time / periods[:, np.newaxis]
+    columns = [np.ones_like(time), np.cos(phase), np.sin(phase)]
+    beta0 = np.tile([0., 1., 0.], (len(periods), 1))
+    return _regression_cost(columns, beta0, flux, flux_err, loss, scale)
 
-    beta0 = np.array([0, 1, 0])
-    mu = np.median(flux)
-    x = np.ones([len(time), len(beta0)])
-    chi_model = np.empty([len(periods)])
-    chi_noise = np.empty([len(periods)])
 
-    for i in range(len(periods)):
-        chi_model[i] = least_squares(_model, beta0, loss=loss, f_scale=scale,
-                                     args=(x, periods[i], time, flux, flux_err)).cost
-        chi_noise[i] = least_squares(_noise, mu, loss=loss, f_scale=scale,
-                                     args=(time, flux, flux_err)).cost
-    power = 1 - chi_model / chi_noise
-
-    return power
+def _regression_cost(columns, beta, y, dy, loss, scale):
+    """
+    Minimum cost of linear models fitted with a loss function
+
+    The models are ``sum(beta[:, i, np.newaxis] * columns[i])``, one per row of ``beta``.
+    The cost is the one of `~scipy.optimize.least_squares` with ``f_scale=scale``.
+    For robust losses, the fit is iterated starting at ``beta``. In each iteration,
+    the step with the lower cost of a Newton step (with the loss curvature clipped
+    to positive values, as in `~scipy.optimize.least_squares`) and of an iteratively
+    reweighted least squares step, which always reduces the cost, is taken.
+    For the non-convex losses ``'cauchy'`` and ``'arctan'``, this can converge to
+    another local minimum than `~scipy.optimize.least_squares`.
+    """
+    def residuals(beta, columns):
+        model = sum(beta[:, idx, np.newaxis] * column for idx, column in enumerate(columns))
+        return (y - model) / dy
+
+    def cost(f):
+        rho = _loss_function((f / scale) ** 2, loss, derivatives=False)
+        return 0.5 * scale ** 2 * np.sum(rho, axis=-1)
+
+    if loss == 'linear':
+        beta = _solve_normal(columns, np.ones(len(beta))[:, np.newaxis] / dy ** 2, y / dy ** 2)
+        return cost(residuals(beta, columns))
+
+    f = residuals(beta, columns)
+    costs = cost(f)
+
+    # iterate only the models that didn't converge yet
+    active = np.arange(len(beta))
+    columns_active = columns
+    for _ in range(_MAX_ITER):
+        z = (f / scale) ** 2
+        drho, d2rho = _loss_function(z, loss)
+        rhs = drho * f / dy
+        curvature = np.maximum(drho + 2 * z * d2rho, np.finfo(float).eps)
+
+        cost_best, beta_best, f_best = costs[active], beta.copy(), f.copy()
+        for weight in [curvature, drho]:
+            beta_step = beta + _solve_normal(columns_active, weight / dy ** 2, rhs)
+            f_step = residuals(beta_step, columns_active)
+            cost_step = cost(f_step)
+
+            better = cost_step < cost_best
+            cost_best = np.where(better, cost_step, cost_best)
+            beta_best[better], f_best[better] = beta_step[better], f_step[better]
+
+        converged = costs[active] - cost_best <= _TOLERANCE * cost_best
+        costs[active] = cost_best
+        beta, f = beta_best, f_best
+        if np.any(converged):
+            keep = ~converged
+            active, beta, f = active[keep], beta[keep], f[keep]
+            columns_active = [column[keep] if column.ndim > 1 else column for column in columns_active]
+            if len(active) == 0:
+                break
+
+    return costs
+
+
+def _solve_normal(columns, weight, rhs):
+    """
+    Solves the normal equations ``sum(weight * x * x.T) * beta = sum(rhs * x)``, one per row of ``weight``
+    """
+    n_par = len(columns)
+    a = np.empty(weight.shape[:1] + (n_par, n_par))
+    b = np.empty(weight.shape[:1] + (n_par,))
+    for i in range(n_par):
+        b[:, i] = np.sum(rhs * columns[i], axis=-1)
+        weighted = weight * columns[i]
+        for j in range(i + 1):
+            a[:, i, j] = a[:, j, i] = np.sum(weighted * columns[j], axis=-1)
+
+    try:
+        return np.linalg.solve(a, b)
+    except np.linalg.LinAlgError:
+        # degenerate design matrix, e.g. for a period equal to the sampling interval
+        return np.einsum('pij,pj->pi', np.linalg.pinv(a), b)
+
+
+def _loss_function(z, loss, derivatives=True):
+    """
+    Loss function, or its first and second derivative, see `~scipy.optimize.least_squares`
+    """
+    if loss == 'linear':
+        if derivatives:
+            return np.ones_like(z), np.zeros_like(z)
+        return z
+    elif loss == 'soft_l1':
+        t = np.sqrt(1 + z)
+        if derivatives:
+            return 1 / t, -0.5 / t ** 3
+        return 2 * (t - 1)
+    elif loss == 'huber':
+        mask = z <= 1
+        t = np.sqrt(np.maximum(z, 1))
+        if derivatives:
+            return 1 / t, np.where(mask, 0, -0.5 / t ** 3)
+        return np.where(mask, z, 2 * t - 1)
+    elif loss == 'cauchy':
+        if derivatives:
+            t = 1 / (1 + z)
+            return t, -t ** 2
+        return np.log1p(z)
+    elif loss == 'arctan':
+        if derivatives:
+            t = 1 / (1 + z ** 2)
+            return t, -2 * z * t ** 2
+        return np.arctan(z)
+    else:
+        raise ValueError('Invalid loss: {}'.format(loss))
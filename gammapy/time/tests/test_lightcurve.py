@@ -12,12 +12,13 @@ from regions import CircleSkyRegion
 from ...utils.testing import requires_data, requires_dependency, mpl_savefig_check
 from ...utils.testing import assert_quantity_allclose
 from ...utils.energy import EnergyBounds
-from ...data import DataStore
-from ...spectrum import SpectrumExtraction
+from ...data import DataStore, EventList
+from ...spectrum import SpectrumExtraction, SpectrumObservation, SpectrumObservationList, PHACountsSpectrum
+from ...irf import EffectiveAreaTable, EnergyDispersion
 from ...spectrum.models import PowerLaw
 from ...background import ReflectedRegionsBackgroundEstimator
 from ...image import SkyImage
-from ..lightcurve import LightCurve, LightCurveEstimator
+from ..lightcurve import LightCurve, LightCurveEstimator, _EventTimeIndex
 
 
 # time time_min time_max flux flux_err flux_ul
@@ -148,6 +149,151 @@ def test_lightcurve_plot_time(lc, time_format, output):
     assert np.array_equal(terr, output[1])
 
 
+def test_event_time_index():
+    rng = np.random.RandomState(0)
+    table = Table()
+    table['TIME'] = rng.uniform(1e8, 1e8 + 1000, 500)
+    table['ENERGY'] = rng.uniform(0.1, 10, 500) * u.TeV
+    table.meta.update(MJDREFI=51910, MJDREFF=7.428703703703703e-4, TIMESYS='TT')
+    events = EventList(table)
+    index = _EventTimeIndex(events)
+
+    energy_band = [0.5, 5] * u.TeV
+    times = events.time_ref + [1e8 + 100, 1e8 + 350.5, 1e8 + 800] * u.s
+    for time_interval in [times[:2], times[1:], times[[0, 2]]]:
+        selected = events.select_energy(energy_band).select_time(time_interval)
+        actual = index.count(energy_band, index.to_met(time_interval))
+        assert actual == len(selected.table)
+
+    assert index.count() == 500
+    assert index.count(energy_band) == len(events.select_energy(energy_band).table)
+
+
+class _Container(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def _make_events(rng, tstart, tstop, n):
+    table = Table()
+    table['TIME'] = rng.uniform(tstart, tstop, n)
+    table['ENERGY'] = rng.uniform(0.1, 10, n) * u.TeV
+    table.meta.update(MJDREFI=51910, MJDREFF=7.428703703703703e-4, TIMESYS='TT',
+                      TSTART=tstart, TSTOP=tstop)
+    return EventList(table)
+
+
+def make_onoff_extraction(obs_params=((1e8, 3, 0.05), (1e8 + 5000, 4, 0.1)),
+                          n_events=(10, 300, 600), duration=1800):
+    """Synthetic on-off extraction for the light curve estimator.
+
+    Also used by ``dev/benchmarks/light_curve.py``.
+
+    Parameters
+    ----------
+    obs_params : list of tuple
+        Start time (MET seconds), ``a_off`` and dead time fraction per observation
+    n_events : tuple of int
+        Number of events, on events and off events per observation
+    duration : float
+        Observation duration in seconds
+
+    Returns
+    -------
+    extraction : object
+        The attributes of a `~gammapy.spectrum.SpectrumExtraction` used
+        by the light curve estimator
+    """
+    rng = np.random.RandomState(0)
+    n_obs_events, n_on_events, n_off_events = n_events
+    obs_list, bkg_estimate, observations = [], [], []
+    for tstart, a_off, dead_time in obs_params:
+        tstop = tstart + duration
+        obs_list.append(_Container(events=_make_events(rng, tstart, tstop, n_obs_events),
+                                   observation_dead_time_fraction=dead_time))
+        bkg_estimate.append(_Container(on_events=_make_events(rng, tstart, tstop, n_on_events),
+                                       off_events=_make_events(rng, tstart, tstop, n_off_events),
+                                       a_off=a_off))
+
+        e_reco = np.logspace(-1, 1, 11) * u.TeV
+        e_true = np.logspace(-1.5, 1.5, 31) * u.TeV
+        on_vector = PHACountsSpectrum(energy_lo=e_reco[:-1], energy_hi=e_reco[1:],
+                                      data=np.ones(10), backscal=1)
+        off_vector = PHACountsSpectrum(energy_lo=e_reco[:-1], energy_hi=e_reco[1:],
+                                       data=np.ones(10), backscal=a_off)
+        aeff = EffectiveAreaTable(energy_lo=e_true[:-1], energy_hi=e_true[1:],
+                                  data=np.ones(30) * 1e5 * u.m ** 2)
+        edisp = EnergyDispersion.from_gauss(e_true=e_true, e_reco=e_reco, sigma=0.2, bias=0)
+        obs = SpectrumObservation(on_vector=on_vector, off_vector=off_vector, aeff=aeff, edisp=edisp)
+        obs.lo_threshold = 0.3 * u.TeV
+        obs.hi_threshold = 8 * u.TeV
+        observations.append(obs)
+
+    return _Container(obs_list=obs_list, bkg_estimate=bkg_estimate,
+                      observations=SpectrumObservationList(observations))
+
+
+@requires_dependency('scipy')
+def test_lightcurve_adaptative_interval_maker_onoff():
+    extraction = make_onoff_extraction()
+    lc_estimator = LightCurveEstimator(extraction)
+    separators = [extraction.obs_list[0].events.time_ref + (1e8 + 3000) * u.s]
+    table = lc_estimator.make_time_intervals_min_significance(
+        significance=3, significance_method='lima', energy_range=[0.5, 20] * u.TeV,
+        spectrum_extraction=extraction, separators=separators,
+    )
+
+    # Reference values from the event by event implementation
+    assert_allclose(table['n_on'], [45, 68, 13, 9, 10, 6, 31, 49, 18, 21])
+    assert_allclose(table['n_off'], [75, 128, 11, 5, 9, 3, 62, 114, 26, 35])
+    assert_allclose(table['alpha'], [1 / 3] * 4 + [1 / 4] * 6)
+    assert_allclose(table['t_start'][0].value, 53067.408155964906, rtol=1e-12)
+    assert_allclose(table['t_stop'][0].value, 53067.4129105077, rtol=1e-12)
+    assert_allclose(table['significance'][0], 3.0238429540307785)
+    assert_allclose(table['t_start'][-1].value, 53067.47874118762, rtol=1e-12)
+    assert_allclose(table['t_stop'][-1].value, 53067.481128104475, rtol=1e-12)
+    assert_allclose(table['significance'][-1], 3.020158644927929)
+
+    # An interval over the end of the first observation uses the live time
+    # weighted alpha of both observations
+    table = lc_estimator.make_time_intervals_min_significance(
+        significance=3, significance_method='lima', energy_range=[0.5, 20] * u.TeV,
+        spectrum_extraction=extraction,
+    )
+    assert np.all((table['alpha'] > 0.25 - 1e-10) & (table['alpha'] < 1 / 3 + 1e-10))
+
+
+@requires_dependency('scipy')
+def test_lightcurve_estimator_onoff():
+    extraction = make_onoff_extraction()
+    lc_estimator = LightCurveEstimator(extraction)
+    time_ref = extraction.obs_list[0].events.time_ref
+    time_intervals = [time_ref + [tmin, tmax] * u.s for tmin, tmax in
+                      [(1e8, 1e8 + 900), (1e8 + 900, 1e8 + 1800),
+                       (1e8 + 2000, 1e8 + 4000), (1e8 + 5000, 1e8 + 6800)]]
+    model = PowerLaw(index=2, amplitude=1e-11 * u.Unit('cm-2 s-1 TeV-1'), reference=1 * u.TeV)
+
+    lc = lc_estimator.light_curve(time_intervals, model, [0.5, 20] * u.TeV)
+
+    # The interval between the observations is dropped
+    assert len(lc.table) == 3
+    assert_allclose(lc.table['livetime'], [900 * 0.95, 900 * 0.95, 1800 * 0.9])
+
+    # Same as the flux points computed one interval at a time
+    useinterval, point = lc_estimator.compute_flux_point(time_intervals[2], model, [0.5, 20] * u.TeV)
+    assert not useinterval
+
+    for row, time_interval in zip(lc.table, [time_intervals[0], time_intervals[1], time_intervals[3]]):
+        useinterval, point = lc_estimator.compute_flux_point(time_interval, model, [0.5, 20] * u.TeV)
+        assert useinterval
+        for name in ['flux', 'flux_err', 'flux_ul', 'livetime', 'n_on', 'n_off', 'alpha', 'expected_excess']:
+            assert_allclose(getattr(point[name], 'value', point[name]), row[name])
+
+    lc_parallel = lc_estimator.light_curve(time_intervals, model, [0.5, 20] * u.TeV, n_jobs=2)
+    for name in lc.table.colnames:
+        assert_allclose(lc_parallel.table[name], lc.table[name])
+
+
 # TODO: Reuse fixtures from spectrum tests
 @pytest.fixture(scope='session')
 def spec_extraction():
@@ -150,3 +150,44 @@ def test_period(pars):
     assert_allclose(fap['davies'], pars['fap']['davies'], rtol=1e-3)
     assert_allclose(fap['baluev'], pars['fap']['baluev'], rtol=1e-3)
     assert_allclose(fap['bootstrap'], pars['fap']['bootstrap'], rtol=1e-3)
+
+
+def test_period_linear_lomb_scargle():
+    test_data = simulate_test_data(
+        period=7, amplitude=2, t_length=100, n_data=1000, n_obs=500, n_outliers=0,
+    )
+    periods = np.linspace(0.5, 100, 300)
+
+    periodogram = robust_periodogram(
+        test_data['t'], test_data['y'], test_data['dy'], periods=periods,
+    )
+
+    ls = LombScargle(test_data['t'], test_data['y'], test_data['dy'], normalization='standard')
+    power = ls.power(1. / periods, method='cython')
+    assert_allclose(periodogram['power'], power, atol=1e-10)
+
+
+@requires_dependency('scipy')
+@pytest.mark.parametrize('loss', ['soft_l1', 'huber'])
+def test_period_robust_least_squares(loss):
+    from scipy.optimize import least_squares
+
+    test_data = simulate_test_data(
+        period=7, amplitude=2, t_length=100, n_data=1000, n_obs=500, n_outliers=50,
+    )
+    t, y, dy = test_data['t'], test_data['y'], test_data['dy']
+    periods = np.array([3.1, 7, 20, 50])
+
+    periodogram = robust_periodogram(t, y, dy, periods=periods, loss=loss, scale=2)
+
+    def residuals(beta, period):
+        model = beta[0] + beta[1] * np.cos(2 * np.pi * t / period) + beta[2] * np.sin(2 * np.pi * t / period)
+        return (y - model) / dy
+
+    chi_noise = least_squares(lambda mu: (mu - y) / dy, np.median(y), loss=loss, f_scale=2).cost
+    for period, power in zip(periods, periodogram['power']):
+        chi_model = least_squares(residuals, [0, 1, 0], loss=loss, f_scale=2, args=(period,)).cost
+        assert_allclose(power, 1 - chi_model / chi_noise, atol=1e-7)
+
+    periodogram_parallel = robust_periodogram(t, y, dy, periods=periods, loss=loss, scale=2, n_jobs=2)
+    assert_allclose(periodogram_parallel['power'], periodogram['power'])
@@ -0,0 +1,107 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Cache utility functions and classes."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import hashlib
+import os
+import sys
+from collections import OrderedDict
+import numpy as np
+from ..extern import six
+
+__all__ = [
+    'LRUCache',
+    'array_key',
+    'replace_file',
+]
+
+
+class LRUCache(object):
+    """Cache of computed values, with least recently used eviction.
+
+    Parameters
+    ----------
+    maxsize : int or None
+        Maximum number of entries, None for no limit.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from gammapy.utils.cache import LRUCache, array_key
+    >>> cache = LRUCache(maxsize=16)
+    >>> energy = np.logspace(-1, 2, 10)
+    >>> value = cache.get(array_key(energy), lambda: np.log(energy))
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, compute):
+        """Cached value for ``key``, call ``compute()`` to compute it if missing.
+
+        Parameters
+        ----------
+        key : hashable
+            Cache key, see `array_key` for arrays.
+        compute : callable
+            Function without arguments that computes the value.
+        """
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            value = compute()
+
+        self._data[key] = value
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Remove all entries."""
+        self._data.clear()
+
+
+def array_key(array):
+    """Hashable key for the shape, dtype, unit and values of an array or quantity.
+
+    Parameters
+    ----------
+    array : `~numpy.ndarray` or `~astropy.units.Quantity`
+        Array
+
+    Returns
+    -------
+    key : tuple
+        Key with the SHA-1 digest of the array values.
+    """
+    unit = getattr(array, 'unit', None)
+    array = np.ascontiguousarray(getattr(array, 'value', array))
+    digest = hashlib.sha1(array.tobytes()).hexdigest()
+    return array.shape, array.dtype.str, str(unit), digest
+
+
+def replace_file(src, dst):
+    """Move file ``src`` to ``dst``, replacing ``dst`` if it exists.
+
+    Cache files are written to a temporary file in the same directory and
+    moved into place with this function, so that a concurrent or interrupted
+    write never leaves a partial cache file.
+
+    Parameters
+    ----------
+    src, dst : str
+        Source and destination filename
+    """
+    if six.PY2:
+        # ``os.replace`` is Python 3 only, ``os.rename`` doesn't replace on Windows
+        if sys.platform == 'win32' and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+    else:
+        os.replace(src, dst)
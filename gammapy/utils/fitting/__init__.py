@@ -1,3 +1,4 @@
 """Fitting utility functions.
 """
 from .iminuit import *
+from .likelihood import *
@@ -0,0 +1,122 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Likelihood profile and contour scans.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import contextlib
+from collections import OrderedDict
+from functools import partial
+from multiprocessing import Pool
+import numpy as np
+from .iminuit import fit_iminuit
+
+__all__ = [
+    'likelihood_profile',
+]
+
+
+def likelihood_profile(function, parameters, values, reoptimize=False,
+                       n_jobs=1, opts_minuit=None):
+    """Likelihood profile on a 1D or 2D grid of parameter values.
+
+    The grid points are visited in snake order, so that with
+    ``reoptimize=True`` each fit of the other free parameters is started at
+    the result of the neighbouring grid point. With ``n_jobs > 1`` the grid
+    is split into contiguous chunks, which are computed in parallel, so
+    ``function`` must be picklable.
+
+    Parameters
+    ----------
+    function : callable
+        Likelihood function, called with the parameter list,
+        e.g. ``SpectrumFit.total_stat`` or ``MapFit.total_stat``
+    parameters : `~gammapy.utils.modeling.ParameterList`
+        Parameters with start values, are not modified
+    values : dict
+        Grid values for one or two parameters, keyed by parameter name
+    reoptimize : bool
+        Re-optimise the other free parameters at each grid point, using
+        `~gammapy.utils.fitting.fit_iminuit`
+    n_jobs : int
+        Number of processes
+    opts_minuit : dict (optional)
+        Options passed to `iminuit.Minuit` constructor
+
+    Returns
+    -------
+    result : `~collections.OrderedDict`
+        Statistic ``stat`` and values of all parameters, as arrays with
+        the grid shape
+    """
+    names = list(values.keys())
+    if len(names) not in [1, 2]:
+        raise ValueError('Need grid values for one or two parameters.')
+
+    grids = np.meshgrid(*[np.asarray(values[name], dtype=float) for name in names],
+                        indexing='ij')
+    shape = grids[0].shape
+
+    # Snake order: reverse every other row, so consecutive points are neighbours
+    index = np.arange(grids[0].size).reshape(shape)
+    if len(shape) == 2:
+        index[1::2] = index[1::2, ::-1]
+    index = index.ravel()
+
+    points = np.stack([grid.ravel()[index] for grid in grids], axis=-1)
+    chunks = np.array_split(points, max(min(n_jobs, len(points)), 1))
+
+    compute = partial(
+        _profile_points,
+        function=function,
+        parameters=parameters,
+        names=names,
+        reoptimize=reoptimize,
+        opts_minuit=opts_minuit,
+    )
+
+    if n_jobs > 1:
+        with contextlib.closing(Pool(processes=n_jobs)) as pool:
+            results = pool.map(compute, chunks)
+    else:
+        results = [compute(chunk) for chunk in chunks]
+        # The likelihood function may keep a reference to the parameters
+        # it was last called with, so reset it
+        function(parameters)
+
+    stat, values_fit = zip(*results)
+    stat = np.hstack(stat)
+    values_fit = np.vstack(values_fit)
+
+    result = OrderedDict()
+    for idx, par in enumerate(parameters.parameters):
+        result[par.name] = _unsnake(values_fit[:, idx], index, shape)
+    result['stat'] = _unsnake(stat, index, shape)
+    return result
+
+
+def _unsnake(data, index, shape):
+    out = np.empty(len(index))
+    out[index] = data
+    return out.reshape(shape)
+
+
+def _profile_points(points, function, parameters, names, reoptimize, opts_minuit):
+    """Compute the statistic at a sequence of grid points."""
+    parameters = parameters.copy()
+    for name in names:
+        parameters[name].frozen = True
+
+    fit_free = reoptimize and len(parameters.free) > 0
+
+    stat, values = [], []
+    for point in points:
+        for name, value in zip(names, point):
+            parameters[name].value = value
+
+        if fit_free:
+            opts = None if opts_minuit is None else dict(opts_minuit)
+            parameters, _ = fit_iminuit(parameters, function, opts_minuit=opts)
+
+        stat.append(function(parameters))
+        values.append([par.value for par in parameters.parameters])
+
+    return np.array(stat), np.array(values).reshape(len(points), -1)
@@ -0,0 +1,58 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from ...modeling import ParameterList, Parameter
+from ...testing import requires_dependency
+from .. import likelihood_profile
+
+
+def fcn(parameters):
+    x = parameters['x'].value
+    y = parameters['y'].value
+    z = parameters['z'].value
+    return (x - 2) ** 2 + (y - 3) ** 2 + (z - 4) ** 2 + (x - 2) * (z - 4)
+
+
+@pytest.fixture
+def pars():
+    return ParameterList(
+        [Parameter('x', 2.1), Parameter('y', 3.1), Parameter('z', 4.1)]
+    )
+
+
+def test_likelihood_profile_grid(pars):
+    x, y = np.linspace(1, 3, 5), np.linspace(2, 4, 4)
+    result = likelihood_profile(fcn, pars, {'x': x, 'y': y})
+
+    assert list(result.keys()) == ['x', 'y', 'z', 'stat']
+    assert result['stat'].shape == (5, 4)
+    assert_allclose(result['x'][:, 0], x)
+    assert_allclose(result['y'][0], y)
+    assert_allclose(result['z'], 4.1)
+
+    xx, yy = np.meshgrid(x, y, indexing='ij')
+    expected = (xx - 2) ** 2 + (yy - 3) ** 2 + 0.01 + (xx - 2) * 0.1
+    assert_allclose(result['stat'], expected)
+
+    # Input parameters are not modified
+    assert_allclose(pars['x'].value, 2.1)
+    assert not pars['x'].frozen
+
+    result_pool = likelihood_profile(fcn, pars, {'x': x, 'y': y}, n_jobs=2)
+    assert_allclose(result_pool['stat'], result['stat'])
+
+    with pytest.raises(ValueError):
+        likelihood_profile(fcn, pars, {'x': x, 'y': y, 'z': y})
+
+
+@requires_dependency('iminuit')
+def test_likelihood_profile_reoptimize(pars):
+    x = np.linspace(1, 3, 5)
+    result = likelihood_profile(fcn, pars, {'x': x}, reoptimize=True)
+
+    # Profile minimum over z is at z = 4 - (x - 2) / 2
+    assert_allclose(result['z'], 4 - (x - 2) / 2, atol=1e-3)
+    assert_allclose(result['y'], 3, atol=1e-3)
+    assert_allclose(result['stat'], 0.75 * (x - 2) ** 2, atol=1e-5)
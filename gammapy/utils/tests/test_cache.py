@@ -0,0 +1,49 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
+import astropy.units as u
+from ..cache import LRUCache, array_key, replace_file
+
+
+def test_lru_cache():
+    calls = []
+
+    def compute(value):
+        def func():
+            calls.append(value)
+            return value
+        return func
+
+    cache = LRUCache(maxsize=2)
+    assert cache.get('a', compute(1)) == 1
+    assert cache.get('a', compute(2)) == 1
+    assert calls == [1]
+
+    cache.get('b', compute(2))
+    cache.get('a', compute(1))
+    cache.get('c', compute(3))
+    assert len(cache) == 2
+    assert 'a' in cache
+    assert 'b' not in cache
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_array_key():
+    energy = np.logspace(-1, 2, 5)
+    assert array_key(energy) == array_key(energy.copy())
+    assert array_key(energy) != array_key(energy.astype('float32'))
+    assert array_key(energy) != array_key(energy.reshape(1, 5))
+    assert array_key(energy * u.TeV) != array_key(energy * u.GeV)
+    assert array_key(energy[::2]) == array_key(np.ascontiguousarray(energy[::2]))
+
+
+def test_replace_file(tmpdir):
+    src, dst = str(tmpdir / 'src'), str(tmpdir / 'dst')
+    for content in ['a', 'b']:
+        with open(src, 'w') as fh:
+            fh.write(content)
+        replace_file(src, dst)
+        assert tmpdir.listdir() == [tmpdir / 'dst']
+        assert (tmpdir / 'dst').read() == content